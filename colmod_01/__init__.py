@@ -2,7 +2,14 @@ import bpy
 from bpy.types import Scene, Panel
 from .mass_hull import MassHullModifierOperator
 from .individual_hull import IndividualHullModifierOperator
+from .cluster_hull import ClusterHullModifierOperator
+from .budget import BudgetedHullModifierOperator
 from .bounding_box import BoundingBoxModifierOperator
+from .kdop import KDopModifierOperator
+from .decomposition import ConvexDecompositionModifierOperator
+from .primitives import BoundingSphereModifierOperator, BoundingCapsuleModifierOperator
+from .refresh import RefreshStaleCollisionsOperator
+from . import budget, live, profiling
 
 bl_info = {
     "name": "COLMOD - Collision Mesh Generator",
@@ -10,7 +17,7 @@ bl_info = {
     "blender" : (5, 1, 0),
     "version" : (1, 1, 0),
     "location": "View3D > N-Panel > COLMOD",
-    "description": "Creates collision meshes (convex hulls, boxes) from selected objects or faces for game engines like Unreal",
+    "description": "Creates collision meshes (convex hulls, convex decompositions, boxes, k-DOPs, spheres, capsules) from selected objects or faces for game engines like Unreal",
     "warning": "",
     "wiki_url": "",
     "category": "Object",
@@ -26,19 +33,70 @@ class VIEW3D_PT_colmod_object_colmod(Panel):
         layout = self.layout
         scene = context.scene
         
-        # Decimation ratio slider
-        layout.prop(scene, "colmod_decimate_ratio", text="Decimation Ratio")
+        # Simplification: a fixed decimation ratio or error bounds per hull
+        layout.prop(scene, "colmod_decimate_mode", text="Simplify")
+        if scene.colmod_decimate_mode == 'AUTO':
+            layout.prop(scene, "colmod_max_deviation", text="Max Deviation")
+            layout.prop(scene, "colmod_min_volume_ratio", text="Min Volume")
+        else:
+            layout.prop(scene, "colmod_decimate_ratio", text="Decimation Ratio")
+        layout.prop(scene, "colmod_max_hull_vertices", text="Max Hull Vertices")
+        layout.prop(scene, "colmod_hull_backend", text="Hull Backend")
+        layout.prop(scene, "colmod_cluster_distance", text="Cluster Distance")
+        layout.prop(scene, "colmod_cluster_max_objects", text="Max Cluster Objects")
+        layout.prop(scene, "colmod_box_orientation", text="Box Orientation")
+        layout.prop(scene, "colmod_box_per_object", text="One Box Per Object")
+        layout.prop(scene, "colmod_kdop_type", text="k-DOP")
+        layout.prop(scene, "colmod_decompose_max_parts", text="Max Parts")
+        layout.prop(scene, "colmod_decompose_concavity", text="Max Concavity")
+        layout.prop(scene, "colmod_decompose_part_vertices", text="Part Vertices")
+        layout.prop(scene, "colmod_vertex_budget", text="Vertex Budget")
+        
+        # Hull cache settings
+        layout.prop(scene, "colmod_use_cache", text="Cache Hulls")
+        if scene.colmod_use_cache:
+            layout.prop(scene, "colmod_cache_dir", text="Cache Folder")
+            layout.prop(scene, "colmod_cache_size", text="Cache Size (MB)")
         layout.separator()
         
         # Collision creation buttons
         layout.operator(MassHullModifierOperator.bl_idname, text="Create Mass Hull")
         layout.operator(IndividualHullModifierOperator.bl_idname, text="Create Individual Hulls")
+        layout.operator(ClusterHullModifierOperator.bl_idname, text="Create Cluster Hulls")
+        layout.operator(BudgetedHullModifierOperator.bl_idname, text="Create Budgeted Hulls")
+        if budget.last_report:
+            box = layout.box()
+            for line in budget.last_report:
+                box.label(text=line)
         layout.operator(BoundingBoxModifierOperator.bl_idname, text="Create Box Collision")
+        layout.operator(KDopModifierOperator.bl_idname, text="Create k-DOP Collision")
+        layout.operator(ConvexDecompositionModifierOperator.bl_idname, text="Create Convex Decomposition")
+        layout.operator(BoundingSphereModifierOperator.bl_idname, text="Create Sphere Collision")
+        layout.operator(BoundingCapsuleModifierOperator.bl_idname, text="Create Capsule Collision")
+        layout.operator(RefreshStaleCollisionsOperator.bl_idname, text="Refresh Stale Collisions")
+        layout.prop(scene, "colmod_live_update", text="Live Preview")
+        layout.separator()
+        
+        # Per-stage timing of the last run
+        layout.prop(scene, "colmod_profile", text="Profile Stages")
+        if scene.colmod_profile:
+            layout.prop(scene, "colmod_profile_log", text="Log File")
+            if profiling.last_summary:
+                box = layout.box()
+                for line in profiling.last_summary:
+                    box.label(text=line)
 
 classes = (
     MassHullModifierOperator,
     IndividualHullModifierOperator,
+    ClusterHullModifierOperator,
+    BudgetedHullModifierOperator,
     BoundingBoxModifierOperator,
+    KDopModifierOperator,
+    ConvexDecompositionModifierOperator,
+    BoundingSphereModifierOperator,
+    BoundingCapsuleModifierOperator,
+    RefreshStaleCollisionsOperator,
     VIEW3D_PT_colmod_object_colmod,
 )
 
@@ -55,15 +113,201 @@ def register():
         max=1.0,
         description="Ratio for decimation modifier (lower = more simplified)"
     )
+    bpy.types.Scene.colmod_decimate_mode = bpy.props.EnumProperty(
+        name="Simplify",
+        items=[
+            ('FIXED', "Fixed Ratio", "Decimate every hull with the same ratio"),
+            ('AUTO', "Error Bounded", "Find the fewest vertices per hull that stay within the error bounds"),
+        ],
+        default='FIXED',
+        description="How hulls are simplified after they are computed"
+    )
+    bpy.types.Scene.colmod_max_deviation = bpy.props.FloatProperty(
+        name="Max Deviation",
+        default=0.02,
+        min=0.0,
+        max=0.5,
+        subtype='FACTOR',
+        description="Largest distance the full-resolution hull may lie outside the simplified one, "
+                    "as a fraction of the hull's size"
+    )
+    bpy.types.Scene.colmod_min_volume_ratio = bpy.props.FloatProperty(
+        name="Min Volume",
+        default=0.9,
+        min=0.0,
+        max=1.0,
+        subtype='FACTOR',
+        description="Smallest fraction of the full-resolution hull volume the simplified hull must keep"
+    )
+    bpy.types.Scene.colmod_max_hull_vertices = bpy.props.IntProperty(
+        name="Max Hull Vertices",
+        default=0,
+        min=0,
+        soft_max=255,
+        description="Simplify each convex hull to at most this many vertices while keeping it convex "
+                    "(0 = no limit). Unreal Engine accepts at most 256 vertices per UCX hull"
+    )
+    bpy.types.Scene.colmod_hull_backend = bpy.props.EnumProperty(
+        name="Hull Backend",
+        items=[
+            ('BMESH', "BMesh", "Compute hulls with bmesh.ops.convex_hull on the main thread"),
+            ('QUICKHULL', "NumPy Quickhull", "Compute hulls with the NumPy kernel on a worker pool, keeping the UI responsive"),
+        ],
+        default='BMESH',
+        description="Convex hull implementation used by the hull operators"
+    )
+    bpy.types.Scene.colmod_cluster_distance = bpy.props.FloatProperty(
+        name="Cluster Distance",
+        default=0.5,
+        min=0.0,
+        subtype='DISTANCE',
+        description="Objects whose bounds are closer than this share one hull in cluster mode"
+    )
+    bpy.types.Scene.colmod_cluster_max_objects = bpy.props.IntProperty(
+        name="Max Cluster Objects",
+        default=0,
+        min=0,
+        description="Split clusters with more objects than this (0 = no limit)"
+    )
+    bpy.types.Scene.colmod_box_orientation = bpy.props.EnumProperty(
+        name="Box Orientation",
+        items=[
+            ('AXIS', "World Axes", "Align boxes with the world axes"),
+            ('ORIENTED', "Oriented", "Rotate each box to fit its geometry as tightly as possible"),
+        ],
+        default='AXIS',
+        description="Orientation of box collisions"
+    )
+    bpy.types.Scene.colmod_box_per_object = bpy.props.BoolProperty(
+        name="One Box Per Object",
+        default=False,
+        description="Create a separate box around each selected object instead of one around the whole selection"
+    )
+    bpy.types.Scene.colmod_kdop_type = bpy.props.EnumProperty(
+        name="k-DOP",
+        items=[
+            ('18', "18-DOP", "Bound the axes and the 6 edge diagonals (at most 32 vertices)"),
+            ('26', "26-DOP", "Also bound the 4 corner diagonals (at most 48 vertices)"),
+        ],
+        default='18',
+        description="Number of slab planes of k-DOP collisions"
+    )
+    bpy.types.Scene.colmod_decompose_max_parts = bpy.props.IntProperty(
+        name="Max Parts",
+        default=8,
+        min=1,
+        soft_max=32,
+        description="Largest number of convex parts per object in a convex decomposition"
+    )
+    bpy.types.Scene.colmod_decompose_concavity = bpy.props.FloatProperty(
+        name="Max Concavity",
+        default=0.05,
+        min=0.0,
+        max=1.0,
+        subtype='FACTOR',
+        description="Parts are split until no surface lies deeper than this inside their hull, "
+                    "as a fraction of the object's size"
+    )
+    bpy.types.Scene.colmod_decompose_part_vertices = bpy.props.IntProperty(
+        name="Part Vertices",
+        default=32,
+        min=0,
+        soft_max=255,
+        description="Simplify each part of a convex decomposition to at most this many vertices (0 = no limit)"
+    )
+    bpy.types.Scene.colmod_vertex_budget = bpy.props.IntProperty(
+        name="Vertex Budget",
+        default=20000,
+        min=0,
+        description="Total collision vertices Create Budgeted Hulls may spend on the selection, every instance counted"
+    )
+    bpy.types.Scene.colmod_use_cache = bpy.props.BoolProperty(
+        name="Cache Hulls",
+        default=False,
+        description="Reuse hulls stored on disk when the source geometry and settings are unchanged"
+    )
+    bpy.types.Scene.colmod_cache_dir = bpy.props.StringProperty(
+        name="Cache Folder",
+        default="",
+        subtype='DIR_PATH',
+        description="Folder for cached hulls (empty = system temporary folder)"
+    )
+    bpy.types.Scene.colmod_cache_size = bpy.props.IntProperty(
+        name="Cache Size",
+        default=512,
+        min=1,
+        description="Maximum size of the hull cache in megabytes; least recently used hulls are evicted first"
+    )
+    bpy.types.Scene.colmod_live_update = bpy.props.BoolProperty(
+        name="Live Preview",
+        default=False,
+        update=live.update_live_preview,
+        description="Regenerate the collisions of edited objects, and all of them when a setting changes, once edits pause"
+    )
+    bpy.types.Scene.colmod_profile = bpy.props.BoolProperty(
+        name="Profile Stages",
+        default=False,
+        description="Record the time and vertex counts of every stage and show a summary after each run"
+    )
+    bpy.types.Scene.colmod_profile_log = bpy.props.StringProperty(
+        name="Profile Log",
+        default="",
+        subtype='FILE_PATH',
+        description="Append one JSON line per profiled run to this file (empty = no log)"
+    )
+    
+    live.register()
 
 
 def unregister():
+    live.unregister()
+    
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     
     # Clean up scene properties
     if hasattr(bpy.types.Scene, 'colmod_decimate_ratio'):
         del bpy.types.Scene.colmod_decimate_ratio
+    if hasattr(bpy.types.Scene, 'colmod_decimate_mode'):
+        del bpy.types.Scene.colmod_decimate_mode
+    if hasattr(bpy.types.Scene, 'colmod_max_deviation'):
+        del bpy.types.Scene.colmod_max_deviation
+    if hasattr(bpy.types.Scene, 'colmod_min_volume_ratio'):
+        del bpy.types.Scene.colmod_min_volume_ratio
+    if hasattr(bpy.types.Scene, 'colmod_max_hull_vertices'):
+        del bpy.types.Scene.colmod_max_hull_vertices
+    if hasattr(bpy.types.Scene, 'colmod_hull_backend'):
+        del bpy.types.Scene.colmod_hull_backend
+    if hasattr(bpy.types.Scene, 'colmod_cluster_distance'):
+        del bpy.types.Scene.colmod_cluster_distance
+    if hasattr(bpy.types.Scene, 'colmod_cluster_max_objects'):
+        del bpy.types.Scene.colmod_cluster_max_objects
+    if hasattr(bpy.types.Scene, 'colmod_box_orientation'):
+        del bpy.types.Scene.colmod_box_orientation
+    if hasattr(bpy.types.Scene, 'colmod_box_per_object'):
+        del bpy.types.Scene.colmod_box_per_object
+    if hasattr(bpy.types.Scene, 'colmod_kdop_type'):
+        del bpy.types.Scene.colmod_kdop_type
+    if hasattr(bpy.types.Scene, 'colmod_decompose_max_parts'):
+        del bpy.types.Scene.colmod_decompose_max_parts
+    if hasattr(bpy.types.Scene, 'colmod_decompose_concavity'):
+        del bpy.types.Scene.colmod_decompose_concavity
+    if hasattr(bpy.types.Scene, 'colmod_decompose_part_vertices'):
+        del bpy.types.Scene.colmod_decompose_part_vertices
+    if hasattr(bpy.types.Scene, 'colmod_vertex_budget'):
+        del bpy.types.Scene.colmod_vertex_budget
+    if hasattr(bpy.types.Scene, 'colmod_use_cache'):
+        del bpy.types.Scene.colmod_use_cache
+    if hasattr(bpy.types.Scene, 'colmod_cache_dir'):
+        del bpy.types.Scene.colmod_cache_dir
+    if hasattr(bpy.types.Scene, 'colmod_cache_size'):
+        del bpy.types.Scene.colmod_cache_size
+    if hasattr(bpy.types.Scene, 'colmod_live_update'):
+        del bpy.types.Scene.colmod_live_update
+    if hasattr(bpy.types.Scene, 'colmod_profile'):
+        del bpy.types.Scene.colmod_profile
+    if hasattr(bpy.types.Scene, 'colmod_profile_log'):
+        del bpy.types.Scene.colmod_profile_log
 
 if __name__ == "__main__":
     register()
@@ -0,0 +1,215 @@
+"""
+Headless Batch Processing.
+Generates collisions for .blend files from the command line, inside a background Blender.
+
+Usage:
+    blender --background --python-expr "from colmod_01 import batch; batch.main()" -- \
+        --colmod --mode individual --collection Props --report report.json a.blend b.blend
+"""
+import argparse
+import fnmatch
+import json
+import sys
+import time
+import traceback
+
+import bpy
+
+from .utils import is_collision_object
+
+
+# Generator modes mapped to the operators that implement them
+MODE_OPERATORS = {
+    'mass': "create_mass_hull",
+    'individual': "create_individual_hull",
+    'cluster': "create_cluster_hulls",
+    'budget': "create_budgeted_hulls",
+    'box': "create_bounding_box",
+    'kdop': "create_kdop",
+    'decompose': "create_convex_decomposition",
+    'sphere': "create_bounding_sphere",
+    'capsule': "create_bounding_capsule",
+}
+
+
+def parse_args(argv=None):
+    """Parse the arguments that follow Blender's '--' separator."""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    
+    parser = argparse.ArgumentParser(
+        prog="colmod batch",
+        description="Generate COLMOD collisions for .blend files in a background Blender.",
+    )
+    parser.add_argument("--colmod", action="store_true", help="Marker separating COLMOD arguments")
+    parser.add_argument(
+        "--mode", action="append", choices=sorted(MODE_OPERATORS),
+        help="Generator to run; repeat to run several (default: individual)",
+    )
+    parser.add_argument("--collection", help="Only process mesh objects in this collection")
+    parser.add_argument("--pattern", default="*", help="Only process objects whose name matches this glob")
+    parser.add_argument("--decimate-ratio", type=float, help="Override the scene decimation ratio")
+    parser.add_argument(
+        "--max-deviation", type=float,
+        help="Simplify each hull to the fewest vertices within this deviation (fraction of hull size)",
+    )
+    parser.add_argument("--max-hull-vertices", type=int, help="Override the scene hull vertex budget")
+    parser.add_argument("--backend", choices=('BMESH', 'QUICKHULL'), help="Override the scene hull backend")
+    parser.add_argument("--cluster-distance", type=float, help="Override the scene cluster distance")
+    parser.add_argument("--box-orientation", choices=('AXIS', 'ORIENTED'), help="Override the scene box orientation")
+    parser.add_argument("--box-per-object", action="store_true", help="Box mode creates one UBX per object")
+    parser.add_argument("--kdop", choices=('18', '26'), help="Override the scene k-DOP type")
+    parser.add_argument("--max-parts", type=int, help="Override the scene convex decomposition part limit")
+    parser.add_argument("--vertex-budget", type=int, help="Override the scene vertex budget of budget mode")
+    parser.add_argument(
+        "--refresh-stale", action="store_true",
+        help="Instead of generating, rebuild only the collisions whose sources or settings changed",
+    )
+    parser.add_argument("--report", help="Write per-file results as JSON to this path")
+    parser.add_argument("--no-save", action="store_true", help="Do not save the processed files")
+    parser.add_argument("files", nargs="*", help=".blend files to process")
+    
+    args = parser.parse_args(argv)
+    args.mode = args.mode or ['individual']
+    return args
+
+
+def ensure_registered():
+    """Register the addon when it was imported without being enabled."""
+    if "colmod_decimate_ratio" not in bpy.types.Scene.bl_rna.properties:
+        from . import register
+        register()
+
+
+def get_target_objects(collection_name, pattern):
+    """
+    Find the mesh objects to generate collisions for.
+    
+    Existing collision objects are skipped so repeated runs do not hull collisions.
+    
+    Raises:
+        KeyError: If the named collection does not exist
+    """
+    if collection_name:
+        collection = bpy.data.collections.get(collection_name)
+        if collection is None:
+            raise KeyError(f"Collection not found: {collection_name}")
+        candidates = collection.all_objects
+    else:
+        candidates = bpy.context.scene.objects
+    
+    return [
+        obj for obj in candidates
+        if obj.type == 'MESH'
+        and not is_collision_object(obj)
+        and fnmatch.fnmatchcase(obj.name, pattern)
+        and obj.name in bpy.context.view_layer.objects
+    ]
+
+
+def run_mode(mode, objects):
+    """Select the target objects and run one generator operator on them."""
+    view_layer = bpy.context.view_layer
+    for obj in view_layer.objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    view_layer.objects.active = objects[0]
+    
+    operator = getattr(bpy.ops.colmod_01, MODE_OPERATORS[mode])
+    return operator()
+
+
+def process_file(filepath, args):
+    """
+    Open one .blend file, run the requested generators and save it.
+    
+    Returns:
+        A JSON-serialisable result dictionary
+    """
+    result = {"file": filepath, "status": "ok", "timings": {}, "collisions": 0}
+    start = time.perf_counter()
+    
+    try:
+        bpy.ops.wm.open_mainfile(filepath=filepath)
+        scene = bpy.context.scene
+        if args.decimate_ratio is not None:
+            scene.colmod_decimate_ratio = args.decimate_ratio
+        if args.max_deviation is not None:
+            scene.colmod_decimate_mode = 'AUTO'
+            scene.colmod_max_deviation = args.max_deviation
+        if args.max_hull_vertices is not None:
+            scene.colmod_max_hull_vertices = args.max_hull_vertices
+        if args.backend is not None:
+            scene.colmod_hull_backend = args.backend
+        if args.cluster_distance is not None:
+            scene.colmod_cluster_distance = args.cluster_distance
+        if args.box_orientation is not None:
+            scene.colmod_box_orientation = args.box_orientation
+        if args.box_per_object:
+            scene.colmod_box_per_object = True
+        if args.kdop is not None:
+            scene.colmod_kdop_type = args.kdop
+        if args.max_parts is not None:
+            scene.colmod_decompose_max_parts = args.max_parts
+        if args.vertex_budget is not None:
+            scene.colmod_vertex_budget = args.vertex_budget
+        
+        if args.refresh_stale:
+            # Imported here: refresh imports this module for MODE_OPERATORS
+            from .refresh import refresh_stale_collisions
+            refresh_start = time.perf_counter()
+            refreshed, total, orphaned, failed = refresh_stale_collisions(bpy.context)
+            result["timings"]["refresh"] = time.perf_counter() - refresh_start
+            result.update(refreshed=refreshed, groups=total, orphaned=orphaned, failed=failed)
+            if not args.no_save:
+                bpy.ops.wm.save_mainfile(filepath=filepath)
+            return result
+        
+        objects = get_target_objects(args.collection, args.pattern)
+        result["objects"] = len(objects)
+        if not objects:
+            result["status"] = "skipped"
+            return result
+        
+        collisions_before = sum(1 for obj in bpy.data.objects if is_collision_object(obj))
+        for mode in args.mode:
+            mode_start = time.perf_counter()
+            status = run_mode(mode, objects)
+            result["timings"][mode] = time.perf_counter() - mode_start
+            if 'FINISHED' not in status:
+                raise RuntimeError(f"{MODE_OPERATORS[mode]} returned {sorted(status)}")
+        result["collisions"] = (
+            sum(1 for obj in bpy.data.objects if is_collision_object(obj)) - collisions_before
+        )
+        
+        if not args.no_save:
+            bpy.ops.wm.save_mainfile(filepath=filepath)
+    
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+        result["traceback"] = traceback.format_exc()
+    
+    finally:
+        result["seconds"] = time.perf_counter() - start
+    
+    return result
+
+
+def main(argv=None):
+    """Entry point for `blender --background --python-expr ... -- --colmod ...`."""
+    args = parse_args(argv)
+    ensure_registered()
+    
+    results = []
+    for filepath in args.files:
+        result = process_file(filepath, args)
+        print(f"COLMOD: {result['status']} {filepath} ({result['seconds']:.2f}s)")
+        results.append(result)
+    
+    if args.report:
+        with open(args.report, "w") as report_file:
+            json.dump(results, report_file, indent=2)
+    
+    return results
@@ -0,0 +1,149 @@
+"""
+Batch Driver.
+Spreads .blend files across several background Blender processes and writes a JSON summary.
+Runs with a plain Python interpreter; it does not import bpy or the addon package.
+
+Usage:
+    python colmod_01/batch_driver.py --blender /path/to/blender --workers 8 \
+        --summary summary.json assets/ -- --mode individual --collection Props
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+# Directory holding the colmod_01 package, added to the workers' sys.path
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER_EXPR = (
+    "import sys; sys.path.insert(0, {parent!r}); "
+    "from colmod_01 import batch; batch.main()"
+)
+
+
+def find_blend_files(paths):
+    """Expand files and directories into a sorted list of .blend files."""
+    blend_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, files in os.walk(path):
+                blend_files.extend(
+                    os.path.join(root, name) for name in files if name.endswith(".blend")
+                )
+        elif path.endswith(".blend"):
+            blend_files.append(path)
+    return sorted(os.path.abspath(path) for path in blend_files)
+
+
+def split_files(files, workers):
+    """Deal files round-robin into at most `workers` non-empty chunks."""
+    chunks = [files[index::workers] for index in range(workers)]
+    return [chunk for chunk in chunks if chunk]
+
+
+def start_worker(blender, chunk, worker_args, report_path, log_file):
+    """Launch one background Blender that processes a chunk of files."""
+    command = [
+        blender, "--background", "--factory-startup",
+        "--python-expr", WORKER_EXPR.format(parent=PACKAGE_PARENT),
+        "--", "--colmod", *worker_args, "--report", report_path, *chunk,
+    ]
+    return subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT)
+
+
+def collect_results(chunk, report_path, returncode, log_path):
+    """Read a worker's report, marking every file failed if the worker died."""
+    try:
+        with open(report_path) as report_file:
+            results = json.load(report_file)
+    except (OSError, ValueError):
+        results = []
+    
+    reported = {result["file"] for result in results}
+    for filepath in chunk:
+        if filepath not in reported:
+            results.append({
+                "file": filepath,
+                "status": "failed",
+                "error": f"Worker exited with code {returncode} before reporting, see {log_path}",
+            })
+    return results
+
+
+def run(blend_files, blender, workers, worker_args, log_dir):
+    """
+    Process files on parallel Blender workers and wait for all of them.
+    
+    Returns:
+        The per-file results of every worker
+    """
+    chunks = split_files(blend_files, workers)
+    running = []
+    for index, chunk in enumerate(chunks):
+        report_path = os.path.join(log_dir, f"worker_{index:02d}.json")
+        log_path = os.path.join(log_dir, f"worker_{index:02d}.log")
+        log_file = open(log_path, "w")
+        process = start_worker(blender, chunk, worker_args, report_path, log_file)
+        running.append((process, chunk, report_path, log_path, log_file))
+    
+    results = []
+    for process, chunk, report_path, log_path, log_file in running:
+        returncode = process.wait()
+        log_file.close()
+        results.extend(collect_results(chunk, report_path, returncode, log_path))
+    return results
+
+
+def main(argv=None):
+    """Entry point for the batch driver."""
+    if argv is None:
+        argv = sys.argv[1:]
+    # Everything after '--' is passed through to the workers
+    if "--" in argv:
+        split = argv.index("--")
+        argv, worker_args = argv[:split], argv[split + 1:]
+    else:
+        worker_args = []
+    
+    parser = argparse.ArgumentParser(description="Run COLMOD over many .blend files in parallel.")
+    parser.add_argument("paths", nargs="+", help=".blend files or directories to search")
+    parser.add_argument("--blender", default="blender", help="Blender executable")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of Blender processes")
+    parser.add_argument("--summary", default="colmod_summary.json", help="Path of the JSON summary")
+    parser.add_argument("--log-dir", help="Keep worker logs and reports in this directory")
+    args = parser.parse_args(argv)
+    
+    blend_files = find_blend_files(args.paths)
+    if not blend_files:
+        print("No .blend files found.", file=sys.stderr)
+        return 1
+    
+    start = time.perf_counter()
+    if args.log_dir:
+        os.makedirs(args.log_dir, exist_ok=True)
+        results = run(blend_files, args.blender, max(args.workers, 1), worker_args, args.log_dir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="colmod_batch_") as log_dir:
+            results = run(blend_files, args.blender, max(args.workers, 1), worker_args, log_dir)
+    
+    failed = [result for result in results if result["status"] == "failed"]
+    summary = {
+        "files": len(results),
+        "failed": len(failed),
+        "workers": max(args.workers, 1),
+        "seconds": time.perf_counter() - start,
+        "results": sorted(results, key=lambda result: result["file"]),
+    }
+    with open(args.summary, "w") as summary_file:
+        json.dump(summary, summary_file, indent=2)
+    
+    print(f"COLMOD: {len(results)} files, {len(failed)} failed, summary written to {args.summary}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+"""
+Benchmark Suite.
+Times every generator and its internal stages on synthetic scenes inside a background Blender.
+Results are written as JSON and can be compared against a stored baseline.
+
+Usage:
+    blender --background --python-expr "from colmod_01 import benchmark; benchmark.main()" -- \
+        --colmod --preset quick --output results.json --baseline baseline.json --threshold 0.15
+"""
+import argparse
+import fnmatch
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from collections import namedtuple
+
+import bpy
+import bmesh
+import numpy as np
+
+from . import profiling
+from .batch import MODE_OPERATORS, ensure_registered, run_mode
+from .benchmark_compare import compare_results
+from .utils import ensure_object_mode, is_collision_object
+
+
+# Scene sizes per preset: vertex counts for single meshes, object counts for scenes
+PRESETS = {
+    'quick': {
+        "sphere": (1_000, 100_000),
+        "blob": (10_000,),
+        "objects": (10, 1_000),
+        "linked": (1_000,),
+        "edit": (100_000,),
+    },
+    'full': {
+        "sphere": (1_000, 10_000, 100_000, 1_000_000, 5_000_000),
+        "blob": (1_000, 100_000, 1_000_000),
+        "objects": (10, 100, 1_000, 20_000),
+        "linked": (100, 5_000),
+        "edit": (100_000, 1_000_000),
+    },
+}
+
+# Generators timed for each kind of scene
+CASE_MODES = {
+    "sphere": ('mass', 'individual', 'box', 'kdop'),
+    "blob": ('mass', 'individual', 'decompose'),
+    "objects": ('individual', 'mass', 'cluster', 'budget', 'box', 'kdop'),
+    "linked": ('individual', 'box'),
+    "edit": ('individual', 'mass', 'box'),
+}
+
+# Radial noise amplitude of the blob meshes
+BLOB_NOISE = 0.2
+
+# Icosphere subdivisions of the small meshes populating multi-object scenes (642 verts)
+SCENE_OBJECT_SUBDIVISIONS = 3
+
+# Distance between objects laid out on a grid
+GRID_SPACING = 3.0
+
+# Frequency of the selected face bands in Edit Mode scenes (one island per band)
+SELECTION_BANDS = 12.0
+
+Case = namedtuple("Case", ("name", "kind", "size", "modes"))
+
+
+def parse_args(argv=None):
+    """Parse the arguments that follow Blender's '--' separator."""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    
+    parser = argparse.ArgumentParser(
+        prog="colmod benchmark",
+        description="Time COLMOD generators on synthetic scenes and compare against a baseline.",
+    )
+    parser.add_argument("--colmod", action="store_true", help="Marker separating COLMOD arguments")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default='quick', help="Scene sizes to run")
+    parser.add_argument("--case", default="*", help="Only run cases whose name matches this glob")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per generator; the median is kept")
+    parser.add_argument("--backend", choices=('BMESH', 'QUICKHULL'), default='BMESH', help="Hull backend")
+    parser.add_argument("--decimate-ratio", type=float, default=1.0, help="Scene decimation ratio")
+    parser.add_argument("--cache", action="store_true", help="Leave the hull cache enabled")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    parser.add_argument("--input", help="Compare an existing results file instead of running the suite")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="Fractional slowdown of a metric that counts as a regression",
+    )
+    parser.add_argument(
+        "--min-seconds", type=float, default=0.005,
+        help="Ignore slowdowns smaller than this many seconds (timer noise)",
+    )
+    return parser.parse_args(argv)
+
+
+def get_cases(preset, pattern="*"):
+    """List the benchmark cases of a preset whose names match a glob."""
+    cases = []
+    for kind, sizes in PRESETS[preset].items():
+        for size in sizes:
+            name = f"{kind}_{size}"
+            if fnmatch.fnmatchcase(name, pattern):
+                cases.append(Case(name, kind, size, CASE_MODES[kind]))
+    return cases
+
+
+def clear_scene():
+    """Remove every object and mesh so each case starts from an empty file."""
+    if bpy.context.view_layer.objects.active is not None:
+        ensure_object_mode()
+    bpy.data.batch_remove(list(bpy.data.objects))
+    bpy.data.batch_remove(list(bpy.data.meshes))
+
+
+def remove_collisions():
+    """Delete the collision objects and meshes created by a previous run."""
+    collisions = [obj for obj in bpy.data.objects if is_collision_object(obj)]
+    meshes = {obj.data for obj in collisions}
+    bpy.data.batch_remove(collisions)
+    bpy.data.batch_remove([mesh for mesh in meshes if mesh.users == 0])
+
+
+def create_sphere_mesh(name, vertex_count, noise=0.0, seed=0):
+    """
+    Create a UV sphere with roughly the given number of vertices.
+    
+    Args:
+        noise: Amplitude of random radial displacement (0 = perfect sphere)
+        seed: Random seed, so every run hulls the same blob
+    """
+    segments = max(int(round(math.sqrt(vertex_count))), 3)
+    bm = bmesh.new()
+    bmesh.ops.create_uvsphere(bm, u_segments=segments, v_segments=segments, radius=1.0)
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    
+    if noise:
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", coords)
+        coords = coords.reshape(-1, 3)
+        rng = np.random.default_rng(seed)
+        coords *= (1.0 + noise * rng.standard_normal(len(coords))).astype(np.float32)[:, None]
+        mesh.vertices.foreach_set("co", coords.ravel())
+        mesh.update()
+    return mesh
+
+
+def create_small_mesh(name):
+    """Create the icosphere used to populate multi-object scenes."""
+    bm = bmesh.new()
+    bmesh.ops.create_icosphere(bm, subdivisions=SCENE_OBJECT_SUBDIVISIONS, radius=1.0)
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+
+def link_object(name, mesh, location=(0.0, 0.0, 0.0)):
+    """Create an object for a mesh and link it to the scene collection."""
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def grid_location(index, count):
+    """Place objects on a square grid so their hulls do not overlap."""
+    side = max(int(math.ceil(math.sqrt(count))), 1)
+    return ((index % side) * GRID_SPACING, (index // side) * GRID_SPACING, 0.0)
+
+
+def select_face_bands(mesh):
+    """Select horizontal bands of faces, giving one connected island per band."""
+    centers = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("center", centers)
+    face_select = np.sin(centers[2::3] * SELECTION_BANDS) > 0.5
+    
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    vert_select = np.zeros(len(mesh.vertices), dtype=bool)
+    vert_select[loop_vertices[np.repeat(face_select, loop_totals)]] = True
+    
+    edge_vertices = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edge_vertices)
+    edge_select = vert_select[edge_vertices[0::2]] & vert_select[edge_vertices[1::2]]
+    
+    mesh.polygons.foreach_set("select", face_select)
+    mesh.vertices.foreach_set("select", vert_select)
+    mesh.edges.foreach_set("select", edge_select)
+
+
+def build_case(case):
+    """
+    Populate the empty scene for a case.
+    
+    Returns:
+        The mesh objects the generators run on
+    """
+    if case.kind in ("sphere", "blob", "edit"):
+        noise = BLOB_NOISE if case.kind == "blob" else 0.0
+        mesh = create_sphere_mesh(case.name, case.size, noise=noise)
+        objects = [link_object(case.name, mesh)]
+    elif case.kind == "objects":
+        template = create_small_mesh(case.name)
+        objects = [
+            link_object(
+                f"{case.name}_{index:05d}",
+                template if index == 0 else template.copy(),
+                grid_location(index, case.size),
+            )
+            for index in range(case.size)
+        ]
+    elif case.kind == "linked":
+        # Every object shares one mesh datablock
+        mesh = create_small_mesh(case.name)
+        objects = [
+            link_object(f"{case.name}_{index:05d}", mesh, grid_location(index, case.size))
+            for index in range(case.size)
+        ]
+    else:
+        raise ValueError(f"Unknown benchmark case kind: {case.kind}")
+    
+    if case.kind == "edit":
+        select_face_bands(objects[0].data)
+        bpy.context.view_layer.objects.active = objects[0]
+        objects[0].select_set(True)
+        bpy.ops.object.mode_set(mode='EDIT')
+    return objects
+
+
+def configure_scene(args):
+    """Apply the benchmark settings to the scene and turn stage profiling on."""
+    scene = bpy.context.scene
+    scene.colmod_decimate_ratio = args.decimate_ratio
+    scene.colmod_hull_backend = args.backend
+    scene.colmod_use_cache = args.cache
+    scene.colmod_profile = True
+    scene.colmod_profile_log = ""
+
+
+def time_mode(mode, objects, repeat):
+    """
+    Run one generator several times on the same scene.
+    
+    Returns:
+        Dictionary with the median wall time, every run's time and median stage times
+    """
+    runs = []
+    stage_runs = []
+    for _ in range(repeat):
+        remove_collisions()
+        profiling.last_run = None
+        
+        start = time.perf_counter()
+        status = run_mode(mode, objects)
+        runs.append(time.perf_counter() - start)
+        if 'FINISHED' not in status:
+            raise RuntimeError(f"{MODE_OPERATORS[mode]} returned {sorted(status)}")
+        
+        recorder = profiling.last_run
+        stage_runs.append(
+            {stage: data["seconds"] for stage, data in recorder.stage_totals().items()}
+            if recorder is not None else {}
+        )
+    
+    stages = {}
+    for stage in stage_runs[0]:
+        stages[stage] = statistics.median(run.get(stage, 0.0) for run in stage_runs)
+    
+    return {
+        "seconds": statistics.median(runs),
+        "runs": runs,
+        "stages": stages,
+        "collisions": sum(1 for obj in bpy.data.objects if is_collision_object(obj)),
+    }
+
+
+def run_case(case, args):
+    """Build a case's scene and time each of its generators."""
+    clear_scene()
+    configure_scene(args)
+    
+    build_start = time.perf_counter()
+    objects = build_case(case)
+    result = {
+        "objects": len(objects),
+        "verts": sum(len(mesh.vertices) for mesh in {obj.data for obj in objects}),
+        "build_seconds": time.perf_counter() - build_start,
+        "modes": {},
+    }
+    for mode in case.modes:
+        result["modes"][mode] = time_mode(mode, objects, max(args.repeat, 1))
+    return result
+
+
+def run_suite(args):
+    """
+    Run every selected case.
+    
+    Returns:
+        A JSON-serialisable results dictionary
+    """
+    results = {
+        "timestamp": time.time(),
+        "blender": bpy.app.version_string,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "preset": args.preset,
+        "repeat": args.repeat,
+        "backend": args.backend,
+        "decimate_ratio": args.decimate_ratio,
+        "cases": {},
+    }
+    for case in get_cases(args.preset, args.case):
+        case_result = run_case(case, args)
+        results["cases"][case.name] = case_result
+        for mode, data in case_result["modes"].items():
+            print(f"COLMOD bench: {case.name} {mode} {data['seconds']:.4f}s")
+    clear_scene()
+    return results
+
+
+def main(argv=None):
+    """Entry point for `blender --background --python-expr ... -- --colmod ...`."""
+    args = parse_args(argv)
+    
+    if args.input:
+        with open(args.input) as input_file:
+            results = json.load(input_file)
+    else:
+        ensure_registered()
+        results = run_suite(args)
+        if args.output:
+            with open(args.output, "w") as output_file:
+                json.dump(results, output_file, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_results(baseline, results, args.threshold, args.min_seconds)
+        for metric, base, seconds in regressions:
+            print(f"COLMOD bench: REGRESSION {metric} {base:.4f}s -> {seconds:.4f}s "
+                  f"({seconds / max(base, 1e-9):.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"COLMOD bench: no regressions beyond {args.threshold:.0%}")
+    
+    return results
@@ -0,0 +1,41 @@
+"""
+Benchmark Baseline Comparison.
+Flags metrics of a benchmark run that got slower than a stored baseline allows.
+Nothing here touches bpy, so results can be compared outside Blender.
+"""
+
+
+def flatten_metrics(results):
+    """Map 'case/mode' and 'case/mode/stage' metric names to median seconds."""
+    metrics = {}
+    for case_name, case in results["cases"].items():
+        for mode, data in case["modes"].items():
+            key = f"{case_name}/{mode}"
+            metrics[key] = data["seconds"]
+            for stage, seconds in data["stages"].items():
+                metrics[f"{key}/{stage}"] = seconds
+    return metrics
+
+
+def compare_results(baseline, current, threshold, min_seconds=0.0):
+    """
+    Find metrics that got slower than the baseline allows.
+    
+    Args:
+        threshold: Allowed fractional slowdown (0.1 = 10%)
+        min_seconds: Absolute slowdown below which a metric is never flagged
+    
+    Returns:
+        List of (metric, baseline_seconds, current_seconds), worst ratio first
+    """
+    baseline_metrics = flatten_metrics(baseline)
+    regressions = []
+    for metric, seconds in flatten_metrics(current).items():
+        base = baseline_metrics.get(metric)
+        if base is None:
+            continue  # New metric, nothing to compare against
+        if seconds - base > min_seconds and seconds > base * (1.0 + threshold):
+            regressions.append((metric, base, seconds))
+    
+    regressions.sort(key=lambda item: item[2] / max(item[1], 1e-9), reverse=True)
+    return regressions
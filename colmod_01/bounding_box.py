@@ -1,37 +1,64 @@
 """
 Bounding Box Collision Generator.
-Creates axis-aligned bounding boxes around selected objects or vertices.
+Creates axis-aligned or oriented bounding boxes around selected objects or vertices.
 """
 import bpy
-import bmesh
-from mathutils import Vector
+from mathutils import Matrix, Vector
 
 from .utils import (
+    has_numpy,
     get_selected_mesh_objects,
     get_active_mesh_object,
     ensure_object_mode,
     restore_mode,
-    select_only_objects,
-    get_unique_name,
-    get_collision_material,
-    assign_material,
 )
+from .mesh_io import (
+    read_vertex_coords,
+    read_evaluated_hull_points,
+    prefilter_hull_points,
+    concatenate_coords,
+)
+from .fingerprint import stamp_collisions
+from .builders import create_box_collisions
+from .names import UniqueNameIndex
+from .profiling import profiled, object_scope, instrumented
+
+try:
+    from . import geometry
+except ImportError:
+    geometry = None  # NumPy is missing, only axis-aligned boxes are fitted
+
+
+@instrumented("obb", count_in=lambda points: len(points))
+def fit_oriented_box(points):
+    """
+    Fit an oriented bounding box around world-space points.
+    
+    Returns:
+        (matrix_world, dimensions): a rotation and translation without scale,
+        and the box size along its local axes
+    """
+    center, axes, dimensions = geometry.oriented_bounding_box(points)
+    matrix_world = Matrix(axes.tolist()).to_4x4()
+    matrix_world.translation = Vector(center)
+    return matrix_world, Vector(dimensions)
 
 
 class BoundingBoxModifierOperator(bpy.types.Operator):
-    """Create a collision box around the selected object or vertices.
+    """Create a collision box around the selected objects or vertices.
     
-    Works in both Object Mode (selected objects) and Edit Mode (selected vertices).
+    Works in both Object Mode (selected objects, together or one box each) and
+    Edit Mode (selected vertices). Boxes are aligned to the world axes or
+    rotated to fit the geometry as tightly as possible.
     Original meshes are never modified - only new collision objects are created.
     """
     bl_idname = "colmod_01.create_bounding_box"
     bl_label = "Create Bounding Box"
     bl_options = {'REGISTER', 'UNDO'}
-    bl_description = "Create axis-aligned bounding box collision around selection"
+    bl_description = "Create an axis-aligned or oriented bounding box collision around selection"
 
+    @profiled
     def execute(self, context):
-        # Store original selection and mode
-        original_objects = set(bpy.context.selected_objects)
         previous_mode = ensure_object_mode()
         
         try:
@@ -40,123 +67,130 @@ class BoundingBoxModifierOperator(bpy.types.Operator):
             
             if not selected_objects:
                 self.report({'ERROR'}, "No mesh objects selected.")
+                restore_mode(previous_mode)
                 return {'CANCELLED'}
             
             # Determine if we're working with vertex selection from Edit Mode
             was_edit_mode = (previous_mode == 'EDIT_MESH')
             active_obj = get_active_mesh_object()
             
+            oriented = context.scene.colmod_box_orientation == 'ORIENTED'
+            if oriented and not has_numpy():
+                self.report({'WARNING'}, "Oriented boxes need NumPy, creating axis-aligned boxes.")
+                oriented = False
+            
+            mesh_digests = {}
             if was_edit_mode and active_obj:
-                # We were in Edit Mode - get selected vertices
-                bpy.ops.object.mode_set(mode='EDIT')
-                bm = bmesh.from_edit_mesh(active_obj.data)
-                selected_verts = [v.co for v in bm.verts if v.select]
-                bm.free()
+                # We were in Edit Mode - leaving it synced the selection flags
+                # back to the mesh, so they can be read without a bmesh
+                selected_verts = read_vertex_coords(
+                    active_obj.data, active_obj.matrix_world, selected_only=True
+                )
                 
-                if not selected_verts:
+                if len(selected_verts) == 0:
                     self.report({'ERROR'}, "No vertices selected in Edit Mode.")
+                    restore_mode(previous_mode)
                     return {'CANCELLED'}
                 
-                # Calculate bounds from selected vertices
-                min_coords, max_coords = self._calculate_bounds_from_vertices(
-                    selected_verts, active_obj
-                )
-                
-                # Create the bounding box
-                self._create_bounding_box(active_obj, min_coords, max_coords)
-                
+                # One box around the selected vertices
+                groups = [(active_obj, [active_obj], [prefilter_hull_points(selected_verts)[0]])]
+            
             else:
-                # Object Mode - create bounds from all selected objects
-                min_coords = Vector((float('inf'), float('inf'), float('inf')))
-                max_coords = Vector((float('-inf'), float('-inf'), float('-inf')))
-                
-                for obj in selected_objects:
-                    obj_min, obj_max = self._calculate_object_bounds(obj)
-                    min_coords = Vector((
-                        min(min_coords.x, obj_min.x),
-                        min(min_coords.y, obj_min.y),
-                        min(min_coords.z, obj_min.z),
-                    ))
-                    max_coords = Vector((
-                        max(max_coords.x, obj_max.x),
-                        max(max_coords.y, obj_max.y),
-                        max(max_coords.z, obj_max.z),
-                    ))
-                
-                # Use the first selected object as the reference for naming
-                reference_obj = selected_objects[0]
-                self._create_bounding_box(reference_obj, min_coords, max_coords)
+                # World-space points of the evaluated meshes, modifiers included,
+                # so the boxes follow the same geometry as their fingerprints
+                point_sets, _culled = read_evaluated_hull_points(
+                    selected_objects,
+                    matrices=[obj.matrix_world for obj in selected_objects],
+                    mesh_digests=mesh_digests,
+                )
+                if context.scene.colmod_box_per_object:
+                    # Object Mode - one box around each selected object
+                    groups = [
+                        (obj, [obj], [points]) for obj, points in zip(selected_objects, point_sets)
+                    ]
+                else:
+                    # Object Mode - one box around all selected objects, named after the first
+                    groups = [(selected_objects[0], selected_objects, point_sets)]
+            
+            boxes = []
+            for reference_obj, objects, point_sets in groups:
+                with object_scope(reference_obj.name):
+                    if oriented:
+                        box = self._fit_oriented_box(point_sets)
+                    else:
+                        box = self._fit_aligned_box(point_sets)
+                # Objects without vertices have no bounds
+                if box is not None:
+                    boxes.append((reference_obj, *box, [obj.name for obj in objects]))
+            
+            if not boxes:
+                self.report({'ERROR'}, "No collision objects were created.")
+                restore_mode(previous_mode)
+                return {'CANCELLED'}
             
-            # Restore original selection state
-            bpy.ops.object.select_all(action='DESELECT')
-            for obj in original_objects:
-                if obj.name in bpy.data.objects:
-                    obj.select_set(True)
+            # Boxes around Edit Mode vertices cannot be regenerated from their sources
+            self._create_bounding_boxes(
+                boxes, None if was_edit_mode and active_obj else 'box', mesh_digests
+            )
             
             # Restore mode
             restore_mode(previous_mode)
             
             return {'FINISHED'}
-            
+        
         except Exception as e:
             # Restore mode on error
             restore_mode(previous_mode)
             self.report({'ERROR'}, f"Failed to create bounding box: {str(e)}")
             return {'CANCELLED'}
 
-    def _calculate_object_bounds(self, obj):
-        """Calculate the min and max coordinates of an object's bounding box."""
-        min_coords = Vector((float('inf'), float('inf'), float('inf')))
-        max_coords = Vector((float('-inf'), float('-inf'), float('-inf')))
+    @instrumented("bounds", count_in=lambda self, point_sets: sum(len(points) for points in point_sets))
+    def _fit_aligned_box(self, point_sets):
+        """
+        Fit a world axis-aligned box around world-space point sets.
         
-        for vertex in obj.data.vertices:
-            global_coord = obj.matrix_world @ vertex.co
-            min_coords.x = min(min_coords.x, global_coord.x)
-            min_coords.y = min(min_coords.y, global_coord.y)
-            min_coords.z = min(min_coords.z, global_coord.z)
-            max_coords.x = max(max_coords.x, global_coord.x)
-            max_coords.y = max(max_coords.y, global_coord.y)
-            max_coords.z = max(max_coords.z, global_coord.z)
+        Returns:
+            (matrix_world, dimensions), or None if there are no points
+        """
+        points = concatenate_coords(point_sets)
+        if len(points) == 0:
+            return None
         
-        return min_coords, max_coords
+        if has_numpy():
+            min_coords, max_coords = Vector(points.min(axis=0)), Vector(points.max(axis=0))
+        else:
+            min_coords = Vector([min(co[axis] for co in points) for axis in range(3)])
+            max_coords = Vector([max(co[axis] for co in points) for axis in range(3)])
+        return Matrix.Translation((min_coords + max_coords) * 0.5), max_coords - min_coords
 
-    def _calculate_bounds_from_vertices(self, vertices, obj):
-        """Calculate the min and max coordinates from a list of vertices."""
-        min_coords = Vector((float('inf'), float('inf'), float('inf')))
-        max_coords = Vector((float('-inf'), float('-inf'), float('-inf')))
-        
-        for vertex in vertices:
-            global_coord = obj.matrix_world @ vertex
-            min_coords.x = min(min_coords.x, global_coord.x)
-            min_coords.y = min(min_coords.y, global_coord.y)
-            min_coords.z = min(min_coords.z, global_coord.z)
-            max_coords.x = max(max_coords.x, global_coord.x)
-            max_coords.y = max(max_coords.y, global_coord.y)
-            max_coords.z = max(max_coords.z, global_coord.z)
+    def _fit_oriented_box(self, point_sets):
+        """
+        Fit a rotated box around world-space point sets, as for _fit_aligned_box.
         
-        return min_coords, max_coords
+        The point sets are already culled to hull candidates, so only those
+        are searched on large meshes.
+        """
+        points = concatenate_coords(point_sets)
+        if len(points) == 0:
+            return None
+        return fit_oriented_box(points)
 
-    def _create_bounding_box(self, original_obj, min_coords, max_coords):
-        """Create a bounding box mesh at the specified coordinates."""
-        # Calculate dimensions and center
-        dimensions = max_coords - min_coords
-        location = (min_coords + max_coords) * 0.5
-        
-        # Create cube at the calculated location
-        bpy.ops.mesh.primitive_cube_add(size=1, location=location)
-        bounding_box_obj = bpy.context.active_object
-        bounding_box_obj.scale = dimensions
-        
-        # Set the bounding box's name with Unreal Engine convention
-        base_name = original_obj.name
-        bounding_box_obj.name = get_unique_name(base_name, "UBX_")
-        
-        # Assign collision material
-        collision_material = get_collision_material()
-        assign_material(bounding_box_obj, collision_material)
+    def _create_bounding_boxes(self, boxes, mode, mesh_digests):
+        """
+        Create a UBX box for each (reference_obj, matrix_world, dimensions, source_names) in one pass.
         
-        # Deselect the new collision object
-        bounding_box_obj.select_set(False)
+        The boxes are built through the data API, so the selection and the
+        active object are left untouched.
+        """
+        names = UniqueNameIndex(bpy.data.objects.keys())
+        collision_objects = create_box_collisions(
+            [names.allocate(box[0].name, "UBX_") for box in boxes],
+            [matrix_world for _obj, matrix_world, _size, _sources in boxes],
+            [dimensions for _obj, _matrix, dimensions, _sources in boxes],
+            mode,
+            [source_names for _obj, _matrix, _size, source_names in boxes],
+        )
+        stamp_collisions(collision_objects, mesh_digests)
 
 
 def register():
@@ -0,0 +1,229 @@
+"""
+Budgeted Convex Hull Collision Generator.
+Spreads a scene-wide collision vertex budget over the selected objects and hulls each within its share.
+"""
+import bpy
+
+from .utils import (
+    np,
+    has_numpy,
+    get_selected_mesh_objects,
+    ensure_object_mode,
+    restore_mode,
+)
+from .mesh_io import read_instanced_sources
+from .fingerprint import stamp_collisions
+from .builders import build_convex_hull_mesh, build_mesh_from_triangles, create_collision_object
+from .names import UniqueNameIndex
+from .profiling import profiled, object_scope, stage
+
+try:
+    from . import geometry
+    from .hull_jobs import run_scheduled_hull_batch
+except ImportError:
+    # NumPy is missing, the operator reports an error
+    geometry = run_scheduled_hull_batch = None
+
+
+# Custom property on source objects scaling their share of a vertex budget (default 1.0)
+IMPORTANCE_PROPERTY = "colmod_importance"
+
+# Spend versus budget of the most recent plan, shown in the COLMOD panel
+last_report = []
+
+
+def _record_report(spent, budget, hulls, meshes):
+    """Keep the spend of a finished plan for the COLMOD panel."""
+    global last_report
+    last_report = [
+        f"Vertices: {spent} / {budget}",
+        f"Hulls: {hulls} ({meshes} meshes)",
+    ]
+    if spent > budget:
+        last_report.append(f"Over budget by {spent - budget}: every hull is at its minimum")
+
+
+class BudgetedHullModifierOperator(bpy.types.Operator):
+    """Creates individual convex hulls whose vertex counts share one scene-wide budget.
+    
+    Every selected object is hulled at full resolution and its vertices are
+    ranked by the volume they add. The budget then goes to whichever vertices
+    remove the most error anywhere in the selection, weighted by each
+    object's world-space size and its colmod_importance custom property.
+    Original meshes are never modified - only new collision objects are created.
+    """
+    bl_idname = "colmod_01.create_budgeted_hulls"
+    bl_label = "Create Budgeted Hulls"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Create convex hulls for the selected objects that together stay within the vertex budget"
+
+    @profiled
+    def execute(self, context):
+        if not has_numpy():
+            self.report({'ERROR'}, "Budgeted hulls need NumPy.")
+            return {'CANCELLED'}
+        
+        previous_mode = ensure_object_mode()
+        
+        try:
+            scene = context.scene
+            budget = scene.colmod_vertex_budget
+            max_vertices = scene.colmod_max_hull_vertices
+            
+            mesh_digests = {}
+            sources = self._collect_sources(mesh_digests)
+            if sources is None:
+                restore_mode(previous_mode)
+                return {'CANCELLED'}
+            
+            # Full-resolution hulls and their simplification orders, on the worker pool
+            scheduled = run_scheduled_hull_batch([points for _instances, points in sources])
+            
+            with stage("budget_plan", verts_in=len(sources)) as timed:
+                base_counts, granted = self._plan(sources, scheduled, budget, max_vertices)
+                timed.verts_out = int(base_counts.sum() + granted.sum())
+            
+            names = UniqueNameIndex(bpy.data.objects.keys())
+            # Every hull's share depends on the whole selection, so each one records all the sources
+            source_names = [name for instances, _points in sources for name, _matrix in instances]
+            collisions = []
+            spent = 0
+            for (instances, _points), (result, schedule), base, extra in zip(
+                sources, scheduled, base_counts, granted
+            ):
+                source_name = instances[0][0]
+                with object_scope(source_name):
+                    mesh = self._build_hull(result, schedule, base + extra, source_name)
+                if mesh is None:
+                    continue
+                
+                for index, (instance_name, matrix_world) in enumerate(instances):
+                    name = names.allocate(instance_name, "UCX_")
+                    if index == 0:
+                        mesh.name = name
+                    collisions.append(
+                        create_collision_object(name, mesh, matrix_world, 'budget', source_names)
+                    )
+                spent += len(mesh.vertices) * len(instances)
+            
+            hulls = len(collisions)
+            if not hulls:
+                self.report({'ERROR'}, "No collision objects were created.")
+                restore_mode(previous_mode)
+                return {'CANCELLED'}
+            
+            stamp_collisions(collisions, mesh_digests)
+            _record_report(spent, budget, hulls, len(sources))
+            self.report({'INFO'}, f"Created {hulls} hulls with {spent} of {budget} budgeted vertices.")
+            
+            # Restore mode
+            restore_mode(previous_mode)
+            
+            return {'FINISHED'}
+        
+        except Exception as e:
+            # Restore mode on error
+            restore_mode(previous_mode)
+            self.report({'ERROR'}, f"Failed to create budgeted hulls: {str(e)}")
+            return {'CANCELLED'}
+
+    def _collect_sources(self, mesh_digests):
+        """
+        Gather the local-space hull candidates of every selected object, once per mesh.
+        
+        Linked duplicates without modifiers share one source and one hull
+        mesh; each of their instances is charged against the budget.
+        
+        Args:
+            mesh_digests: Dict receiving the evaluated mesh digest of every object
+        
+        Returns:
+            List of (instances, points) where instances holds (name, matrix_world)
+            pairs, or None after reporting an error
+        """
+        selected_objects = get_selected_mesh_objects()
+        
+        if not selected_objects:
+            self.report({'ERROR'}, "No mesh objects selected.")
+            return None
+        
+        sources, _removed = read_instanced_sources(selected_objects, mesh_digests=mesh_digests)
+        sources = [(instances, points) for instances, points in sources if len(points)]
+        
+        if not sources:
+            self.report({'ERROR'}, "No collision objects were created.")
+            return None
+        return sources
+
+    def _plan(self, sources, scheduled, budget, max_vertices):
+        """
+        Split the vertex budget between the source hulls.
+        
+        A vertex's gain is the hull volume it adds, scaled to world space and
+        by the importance of every instance; its cost is one budget vertex per
+        instance. Flat sources are bmesh hulls outside the plan and are charged first.
+        
+        Returns:
+            (base_counts, granted): the minimum vertex count of each hull and
+            the further vertices it was granted
+        """
+        base_counts = np.zeros(len(sources), dtype=np.int64)
+        gains = []
+        unit_costs = []
+        for index, ((instances, _points), (result, schedule)) in enumerate(zip(sources, scheduled)):
+            unit_costs.append(len(instances))
+            if schedule is None:
+                base_counts[index] = len(result.points)
+                gains.append(np.empty(0))
+                continue
+            
+            removals, costs = schedule
+            base_counts[index] = len(result.vertices) - len(removals)
+            weight = sum(
+                abs(matrix_world.to_3x3().determinant()) * self._importance(instance_name)
+                for instance_name, matrix_world in instances
+            )
+            # Vertices come back in reverse removal order, the most valuable first
+            hull_gains = costs[::-1] * weight
+            if max_vertices > 0:
+                hull_gains = hull_gains[:max(max_vertices - base_counts[index], 0)]
+            gains.append(hull_gains)
+        
+        unit_costs = np.array(unit_costs, dtype=np.int64)
+        remaining = budget - int((base_counts * unit_costs).sum())
+        granted = geometry.allocate_vertex_budget(gains, unit_costs, remaining)
+        return base_counts, granted
+
+    def _importance(self, object_name):
+        """Read an object's importance tag, 1.0 when it has none."""
+        obj = bpy.data.objects.get(object_name)
+        try:
+            return max(float(obj.get(IMPORTANCE_PROPERTY, 1.0)), 0.0)
+        except (TypeError, ValueError):
+            return 1.0
+
+    def _build_hull(self, result, schedule, vertex_count, name):
+        """Build the hull mesh of one source with `vertex_count` vertices, or None if it is empty."""
+        if schedule is None:
+            if len(result.points) == 0:
+                return None
+            return build_convex_hull_mesh(result.points, name)
+        
+        removals, _costs = schedule
+        keep = np.ones(len(result.vertices), dtype=bool)
+        keep[removals[:len(result.vertices) - vertex_count]] = False
+        if keep.all():
+            return build_mesh_from_triangles(result.vertices, result.triangles, name)
+        return build_mesh_from_triangles(*geometry.quickhull(result.vertices[keep]), name)
+
+
+def register():
+    bpy.utils.register_class(BudgetedHullModifierOperator)
+
+
+def unregister():
+    bpy.utils.unregister_class(BudgetedHullModifierOperator)
+
+
+if __name__ == "__main__":
+    register()
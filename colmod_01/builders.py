@@ -0,0 +1,458 @@
+"""
+Collision Mesh Builders.
+Creates hull, box, sphere and capsule meshes and their collision objects through the data API,
+and simplifies finished hulls in place.
+"""
+import bpy
+import bmesh
+from itertools import product
+from math import cos, pi, radians, sin
+
+from .fingerprint import MODE_PROPERTY, SOURCES_PROPERTY
+from .mesh_io import read_hull_triangles
+from .utils import assign_material, get_collision_material
+from .profiling import instrumented
+
+try:
+    import numpy as np
+    from . import geometry
+except ImportError:
+    np = None
+    geometry = None
+
+
+# Face and shape angle limits used by bpy.ops.mesh.convex_hull() to join triangles
+HULL_JOIN_THRESHOLD = radians(40.0)
+
+# Unit cube corners, indexed by x * 4 + y * 2 + z, and its outward-facing quads
+BOX_CORNERS = tuple(product((-0.5, 0.5), repeat=3))
+BOX_FACES = (
+    (0, 1, 3, 2), (4, 6, 7, 5),
+    (0, 4, 5, 1), (2, 3, 7, 6),
+    (0, 2, 6, 4), (1, 5, 7, 3),
+)
+BOX_LOOP_VERTICES = tuple(v for face in BOX_FACES for v in face)
+BOX_LOOP_STARTS = tuple(range(0, len(BOX_LOOP_VERTICES), 4))
+BOX_LOOP_TOTALS = (4,) * len(BOX_FACES)
+
+# Segments around and rings from pole to pole of sphere and capsule meshes;
+# the ring count must be even so capsules split at the equator
+ROUND_SEGMENTS = 16
+ROUND_RINGS = 8
+
+
+def points_to_bmesh(points, mesh):
+    """
+    Create a new bmesh holding one loose vertex per point.
+    
+    The points are staged in `mesh`, the empty datablock the hull is written
+    to afterwards, so no scratch mesh is created.
+    """
+    bm = bmesh.new()
+    if np is None:
+        for co in points:
+            bm.verts.new(co)
+        return bm
+    
+    # Fill the mesh in one bulk call; bm.verts.new() per point is slow
+    points = np.ascontiguousarray(points, dtype=np.float32)
+    mesh.vertices.add(len(points))
+    mesh.vertices.foreach_set("co", points.ravel())
+    bm.from_mesh(mesh)
+    return bm
+
+
+@instrumented(
+    "hull",
+    count_in=lambda points, *a, **k: len(points),
+    count_out=lambda mesh, *a, **k: len(mesh.vertices),
+)
+def build_convex_hull_mesh(points, name, backend='BMESH'):
+    """
+    Build a convex hull mesh datablock from points without bpy.ops.
+    
+    Mirrors bpy.ops.mesh.convex_hull() defaults: interior and unused geometry is
+    deleted and coplanar triangles are joined. No object, selection or mode
+    changes are involved.
+    
+    Args:
+        points: Sequence of 3D coordinates
+        name: Name for the new mesh datablock
+        backend: 'BMESH' for bmesh.ops.convex_hull, 'QUICKHULL' for the NumPy kernel
+    
+    Returns:
+        The new mesh datablock
+    """
+    if backend == 'QUICKHULL' and geometry is not None:
+        try:
+            vertices, triangles = geometry.quickhull(points)
+        except ValueError:
+            pass  # Flat input, leave the degenerate case to bmesh
+        else:
+            return build_mesh_from_triangles(vertices, triangles, name)
+    
+    mesh = bpy.data.meshes.new(name)
+    bm = points_to_bmesh(points, mesh)
+    result = bmesh.ops.convex_hull(bm, input=bm.verts[:])
+    bmesh.ops.delete(
+        bm, geom=result["geom_interior"] + result["geom_unused"], context='VERTS'
+    )
+    return _bmesh_to_hull_mesh(bm, name, mesh)
+
+
+@instrumented(
+    "hull_mesh",
+    count_in=lambda vertices, *a, **k: len(vertices),
+    count_out=lambda mesh, *a, **k: len(mesh.vertices),
+)
+def build_mesh_from_triangles(vertices, triangles, name, mesh=None):
+    """
+    Build a hull mesh datablock from precomputed hull triangles.
+    
+    Coplanar triangles are joined exactly as for bmesh hulls, so both hull
+    backends produce the same topology. An existing mesh is overwritten in place.
+    """
+    if mesh is None:
+        mesh = bpy.data.meshes.new(name)
+    else:
+        mesh.clear_geometry()
+    mesh.from_pydata([tuple(co) for co in vertices], [], [tuple(tri) for tri in triangles])
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    return _bmesh_to_hull_mesh(bm, name, mesh)
+
+
+def _bmesh_to_hull_mesh(bm, name, mesh=None):
+    """Join coplanar hull triangles, write the bmesh to a mesh and free it."""
+    bmesh.ops.join_triangles(
+        bm,
+        faces=bm.faces[:],
+        angle_face_threshold=HULL_JOIN_THRESHOLD,
+        angle_shape_threshold=HULL_JOIN_THRESHOLD,
+    )
+    if mesh is None:
+        mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+
+def _evaluate_with_decimate(meshes, ratio):
+    """
+    Evaluate a collapse Decimate modifier on each mesh through the depsgraph.
+    
+    Temporary objects are linked to the scene collection so that a single
+    depsgraph update evaluates the whole batch. They are removed afterwards.
+    
+    Yields:
+        (mesh, evaluated_mesh) pairs; evaluated meshes are only valid inside the loop
+    """
+    collection = bpy.context.scene.collection
+    temp_objects = []
+    try:
+        for mesh in meshes:
+            temp_obj = bpy.data.objects.new("colmod_decimate", mesh)
+            decimate_mod = temp_obj.modifiers.new(name="Decimate", type='DECIMATE')
+            decimate_mod.ratio = ratio
+            collection.objects.link(temp_obj)
+            temp_objects.append(temp_obj)
+        
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        for temp_obj in temp_objects:
+            evaluated_obj = temp_obj.evaluated_get(depsgraph)
+            evaluated_mesh = evaluated_obj.to_mesh()
+            try:
+                yield temp_obj.data, evaluated_mesh
+            finally:
+                evaluated_obj.to_mesh_clear()
+    finally:
+        for temp_obj in temp_objects:
+            bpy.data.objects.remove(temp_obj)
+
+
+@instrumented(
+    "decimate",
+    count_in=lambda meshes, *a, **k: sum(len(mesh.vertices) for mesh in meshes),
+    count_out=lambda _result, meshes, *a, **k: sum(len(mesh.vertices) for mesh in meshes),
+)
+def apply_decimate(meshes, ratio):
+    """
+    Apply a collapse Decimate to each mesh in place without bpy.ops.
+    
+    Args:
+        meshes: Mesh datablocks to simplify
+        ratio: Decimate ratio; 1.0 or above leaves the meshes untouched
+    """
+    if ratio >= 1.0 or not meshes:
+        return
+    
+    results = []
+    for mesh, evaluated_mesh in _evaluate_with_decimate(meshes, ratio):
+        bm = bmesh.new()
+        bm.from_mesh(evaluated_mesh)
+        results.append((mesh, bm))
+    
+    for mesh, bm in results:
+        bm.to_mesh(mesh)
+        bm.free()
+
+
+@instrumented(
+    "vertex_limit",
+    count_in=lambda meshes, *a, **k: sum(len(mesh.vertices) for mesh in meshes),
+    count_out=lambda _result, meshes, *a, **k: sum(len(mesh.vertices) for mesh in meshes),
+)
+def limit_hull_vertices(meshes, max_vertices):
+    """
+    Simplify hull meshes in place to a vertex budget, keeping them convex.
+    
+    Unlike Decimate, the result is always a convex hull contained in the input
+    and its size is a vertex count, matching Unreal Engine's UCX limit.
+    
+    Args:
+        meshes: Hull mesh datablocks to simplify
+        max_vertices: Vertex budget per hull; 0 leaves the meshes untouched
+    
+    Returns:
+        The number of meshes that were simplified
+    """
+    if max_vertices <= 0 or geometry is None:
+        return 0
+    max_vertices = max(max_vertices, 4)
+    
+    simplified = 0
+    for mesh in meshes:
+        if len(mesh.vertices) <= max_vertices:
+            continue
+        try:
+            vertices, triangles = geometry.simplify_hull(
+                *read_hull_triangles(mesh), max_vertices
+            )
+        except ValueError:
+            continue  # Flat hull, leave it as it is
+        build_mesh_from_triangles(vertices, triangles, mesh.name, mesh)
+        simplified += 1
+    return simplified
+
+
+@instrumented(
+    "auto_fit",
+    count_in=lambda meshes, *a, **k: sum(len(mesh.vertices) for mesh in meshes),
+    count_out=lambda _result, meshes, *a, **k: sum(len(mesh.vertices) for mesh in meshes),
+)
+def fit_hulls_to_error(meshes, max_deviation, min_volume_ratio=0.0):
+    """
+    Simplify each hull mesh in place to the fewest vertices within an error bound.
+    
+    Replaces a hand-picked Decimate ratio: every hull gets its own level of
+    detail, searched against its full-resolution hull.
+    
+    Args:
+        meshes: Full-resolution convex hull meshes
+        max_deviation: Largest distance the full hull may lie outside the result,
+            as a fraction of the hull's bounding box diagonal
+        min_volume_ratio: Smallest fraction of the full hull volume to keep
+    
+    Returns:
+        The number of meshes that were simplified
+    """
+    if geometry is None:
+        return 0
+    
+    simplified = 0
+    for mesh in meshes:
+        coords, triangles = read_hull_triangles(mesh)
+        if len(coords) <= 4:
+            continue
+        diagonal = float(np.linalg.norm(coords.max(axis=0) - coords.min(axis=0)))
+        vertices, triangles = geometry.fit_hull(
+            coords, triangles, max_deviation * diagonal, min_volume_ratio
+        )
+        if len(vertices) < len(coords):
+            build_mesh_from_triangles(vertices, triangles, mesh.name, mesh)
+            simplified += 1
+    return simplified
+
+
+def fill_new_mesh(name, flat_coords, loop_starts, loop_totals, loop_vertices):
+    """
+    Create a mesh datablock with foreach_set, the one way every generated mesh is built.
+    
+    Args:
+        name: Name for the new mesh datablock
+        flat_coords: Vertex positions as one flat x, y, z sequence
+        loop_starts, loop_totals: First loop and loop count of each polygon
+        loop_vertices: Vertex index of each loop
+    
+    Returns:
+        The new mesh datablock
+    """
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(flat_coords) // 3)
+    mesh.vertices.foreach_set("co", flat_coords)
+    mesh.loops.add(len(loop_vertices))
+    mesh.loops.foreach_set("vertex_index", loop_vertices)
+    mesh.polygons.add(len(loop_totals))
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    mesh.polygons.foreach_set("loop_total", loop_totals)
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+def build_mesh_from_arrays(name, coords, loop_totals, loop_vertices):
+    """Create a mesh datablock from vertex positions and polygon loops in bulk."""
+    loop_totals = np.asarray(loop_totals, dtype=np.int32)
+    loop_starts = np.zeros(len(loop_totals), dtype=np.int32)
+    np.cumsum(loop_totals[:-1], out=loop_starts[1:])
+    return fill_new_mesh(
+        name,
+        np.ascontiguousarray(coords, dtype=np.float32).ravel(),
+        loop_starts,
+        loop_totals,
+        np.ascontiguousarray(loop_vertices, dtype=np.int32),
+    )
+
+
+def build_box_mesh(name, dimensions):
+    """
+    Build a box mesh centred on the origin without bpy.ops.
+    
+    Args:
+        name: Name for the new mesh datablock
+        dimensions: Size of the box along X, Y and Z
+    
+    Returns:
+        The new mesh datablock
+    """
+    size_x, size_y, size_z = dimensions
+    coords = [
+        value
+        for x, y, z in BOX_CORNERS
+        for value in (x * size_x, y * size_y, z * size_z)
+    ]
+    
+    return fill_new_mesh(name, coords, BOX_LOOP_STARTS, BOX_LOOP_TOTALS, BOX_LOOP_VERTICES)
+
+
+@instrumented("box_create", count_out=lambda objects, *a, **k: len(objects) * len(BOX_CORNERS))
+def create_box_collisions(names, matrices, dimensions, mode=None, sources=None):
+    """
+    Create box collision objects in one pass through the data API.
+    
+    No operator runs, so the active object and selection are left alone and
+    thousands of boxes can be made without a depsgraph update per box.
+    
+    Args:
+        names: Object (and mesh) name of each box
+        matrices: World matrix of each box centre, without scale
+        dimensions: Size of each box along its local axes
+        mode: Generator mode recorded on every box, see create_collision_object
+        sources: Source object names of each box
+    
+    Returns:
+        The new collision objects, in order
+    """
+    sources = sources or [()] * len(names)
+    return [
+        create_collision_object(name, build_box_mesh(name, size), matrix, mode, source_names)
+        for name, matrix, size, source_names in zip(names, matrices, dimensions, sources)
+    ]
+
+
+def build_round_mesh(name, radius, half_length=0.0):
+    """
+    Build a UV sphere, or a capsule along local Z, centred on the origin without bpy.ops.
+    
+    Args:
+        name: Name for the new mesh datablock
+        radius: Sphere or cap radius
+        half_length: Half the distance between the cap centres (0 = sphere)
+    
+    Returns:
+        The new mesh datablock
+    """
+    # Rings of (z, ring_radius); a capsule repeats the equator once per cap
+    rings = []
+    for ring in range(1, ROUND_RINGS):
+        angle = pi * ring / ROUND_RINGS
+        z, ring_radius = radius * cos(angle), radius * sin(angle)
+        if ring * 2 < ROUND_RINGS or (ring * 2 == ROUND_RINGS and half_length > 0.0):
+            rings.append((z + half_length, ring_radius))
+        if ring * 2 > ROUND_RINGS or ring * 2 == ROUND_RINGS:
+            rings.append((z - half_length, ring_radius))
+    
+    coords = [0.0, 0.0, radius + half_length]
+    for z, ring_radius in rings:
+        for segment in range(ROUND_SEGMENTS):
+            angle = 2.0 * pi * segment / ROUND_SEGMENTS
+            coords.extend((ring_radius * cos(angle), ring_radius * sin(angle), z))
+    coords.extend((0.0, 0.0, -radius - half_length))
+    
+    def ring_vertex(ring, segment):
+        return 1 + ring * ROUND_SEGMENTS + segment % ROUND_SEGMENTS
+    
+    bottom = len(coords) // 3 - 1
+    faces = [(0, ring_vertex(0, s), ring_vertex(0, s + 1)) for s in range(ROUND_SEGMENTS)]
+    for ring in range(len(rings) - 1):
+        faces.extend(
+            (ring_vertex(ring, s), ring_vertex(ring + 1, s),
+             ring_vertex(ring + 1, s + 1), ring_vertex(ring, s + 1))
+            for s in range(ROUND_SEGMENTS)
+        )
+    last = len(rings) - 1
+    faces.extend(
+        (bottom, ring_vertex(last, s + 1), ring_vertex(last, s)) for s in range(ROUND_SEGMENTS)
+    )
+    
+    loop_vertices = [v for face in faces for v in face]
+    loop_starts = [0]
+    for face in faces[:-1]:
+        loop_starts.append(loop_starts[-1] + len(face))
+    
+    return fill_new_mesh(name, coords, loop_starts, [len(face) for face in faces], loop_vertices)
+
+
+@instrumented("round_create", count_in=lambda names, *a, **k: len(names))
+def create_round_collisions(names, matrices, shapes, mode=None, sources=None):
+    """
+    Create sphere or capsule collision objects in one pass through the data API.
+    
+    Args:
+        names: Object (and mesh) name of each collision
+        matrices: World matrix of each centre, without scale; capsules run along local Z
+        shapes: (radius, half_length) of each collision, half_length 0 for spheres
+        mode: Generator mode recorded on every collision, see create_collision_object
+        sources: Source object names of each collision
+    
+    Returns:
+        The new collision objects, in order
+    """
+    sources = sources or [()] * len(names)
+    return [
+        create_collision_object(
+            name, build_round_mesh(name, radius, half_length), matrix, mode, source_names
+        )
+        for name, matrix, (radius, half_length), source_names in zip(names, matrices, shapes, sources)
+    ]
+
+
+@instrumented("link_object")
+def create_collision_object(name, mesh, matrix_world=None, mode=None, sources=()):
+    """
+    Link a new collision object for a mesh and assign the collision material.
+    
+    The object is linked to the active collection but is not selected and
+    does not become active. When a generator mode is given, it is stored
+    with the source object names as custom properties, so live preview can
+    regenerate the collision from its sources. Collisions built from an
+    Edit Mode selection pass no mode, since the selection is not kept.
+    """
+    collision_obj = bpy.data.objects.new(name, mesh)
+    if matrix_world is not None:
+        collision_obj.matrix_world = matrix_world
+    if mode is not None:
+        collision_obj[MODE_PROPERTY] = mode
+        collision_obj[SOURCES_PROPERTY] = list(sources)
+    bpy.context.collection.objects.link(collision_obj)
+    assign_material(collision_obj, get_collision_material())
+    return collision_obj
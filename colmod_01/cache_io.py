@@ -0,0 +1,120 @@
+"""
+Hull Cache Access.
+Loads and stores hull meshes in the scene's on-disk hull cache.
+"""
+import bpy
+
+from .builders import build_mesh_from_arrays
+from .mesh_io import read_mesh_arrays
+from .profiling import instrumented
+
+try:
+    import numpy as np
+    from . import geometry, hull_cache
+except ImportError:
+    np = None
+    geometry = None
+    hull_cache = None
+
+
+def get_hull_cache(scene):
+    """Return the scene's hull cache, or None when caching is off or NumPy is missing."""
+    if hull_cache is None or not scene.colmod_use_cache:
+        return None
+    directory = bpy.path.abspath(scene.colmod_cache_dir) or hull_cache.default_cache_directory()
+    return hull_cache.HullCache(directory, scene.colmod_cache_size * 1024 * 1024)
+
+
+@instrumented("cache_load")
+def load_cached_hull(cache, key, name):
+    """Build a mesh from a cached hull, or return None on a miss."""
+    if cache is None:
+        return None
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    return build_mesh_from_arrays(name, *cached)
+
+
+@instrumented("cache_store")
+def store_cached_hulls(cache, entries):
+    """
+    Write finished hull meshes to the cache.
+    
+    Args:
+        cache: A HullCache, or None to do nothing
+        entries: (key, mesh) pairs
+    """
+    if cache is None:
+        return
+    for key, mesh in entries:
+        cache.put(key, *read_mesh_arrays(mesh))
+
+
+@instrumented("cache_load")
+def load_cached_parts(cache, key, name):
+    """
+    Build one mesh per part of a cached multi-part entry.
+    
+    Parts share no vertices, so they are recovered as the connected islands
+    of the stored mesh, in the order they were stored.
+    
+    Returns:
+        List of part meshes, or None on a miss
+    """
+    if cache is None:
+        return None
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    
+    coords, loop_totals, loop_vertices = (np.asarray(array) for array in cached)
+    loop_starts = np.zeros(len(loop_totals), dtype=np.int64)
+    np.cumsum(loop_totals[:-1], out=loop_starts[1:])
+    islands = geometry.connected_vertex_groups(loop_totals, loop_vertices)
+    labels = np.empty(len(coords), dtype=np.int64)
+    for index, vertices in enumerate(islands):
+        labels[vertices] = index
+    face_labels = labels[loop_vertices[loop_starts]]
+    loop_labels = np.repeat(face_labels, loop_totals)
+    
+    meshes = []
+    remap = np.empty(len(coords), dtype=np.int32)
+    for index, vertices in enumerate(islands):
+        remap[vertices] = np.arange(len(vertices), dtype=np.int32)
+        meshes.append(build_mesh_from_arrays(
+            name,
+            coords[vertices],
+            loop_totals[face_labels == index],
+            remap[loop_vertices[loop_labels == index]],
+        ))
+    return meshes
+
+
+@instrumented("cache_store")
+def store_cached_parts(cache, key, meshes):
+    """Write the part meshes of one source to the cache as a single entry."""
+    if cache is None or key is None or not meshes:
+        return
+    coord_sets, total_sets, loop_sets = [], [], []
+    offset = 0
+    for mesh in meshes:
+        coords, loop_totals, loop_vertices = read_mesh_arrays(mesh)
+        coord_sets.append(coords)
+        total_sets.append(loop_totals)
+        loop_sets.append(loop_vertices + offset)
+        offset += len(coords)
+    cache.put(key, np.concatenate(coord_sets), np.concatenate(total_sets), np.concatenate(loop_sets))
+
+
+@instrumented("cache_evict")
+def trim_hull_cache(cache):
+    """Trim the cache to its size limit; called once per run, since it scans the whole cache folder."""
+    if cache is not None:
+        cache.evict()
+
+
+def report_cache_stats(operator, cache):
+    """Add the hull cache hit/miss counts to an operator's report."""
+    if cache is not None:
+        operator.report({'INFO'}, f"Hull cache: {cache.hits} hits, {cache.misses} misses.")
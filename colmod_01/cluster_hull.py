@@ -0,0 +1,140 @@
+"""
+Clustered Convex Hull Collision Generator.
+Groups nearby selected objects and creates one convex hull per group.
+"""
+import bpy
+
+from .utils import (
+    has_numpy,
+    get_selected_mesh_objects,
+    ensure_object_mode,
+    restore_mode,
+    get_auto_fit,
+)
+from .mesh_io import read_evaluated_hull_points, read_world_bounds
+from .fingerprint import stamp_collisions
+from .builders import create_collision_object
+from .mass_hull import build_merged_hull
+from .names import UniqueNameIndex
+from .profiling import profiled, object_scope, instrumented
+
+try:
+    from . import geometry
+except ImportError:
+    geometry = None  # NumPy is missing, the operator reports an error
+
+
+@instrumented("cluster", count_in=lambda objects, *a, **k: len(objects))
+def cluster_objects(objects, distance, max_objects=0):
+    """
+    Group objects whose world bounds lie within a distance of each other.
+    
+    Args:
+        objects: Mesh objects to group
+        distance: Largest gap between the bounds of objects in one group
+        max_objects: Largest number of objects per group (0 = no limit)
+    
+    Returns:
+        Lists of objects, one per group, in selection order
+    """
+    if not objects:
+        return []
+    lows, highs = read_world_bounds(objects)
+    return [
+        [objects[index] for index in members]
+        for members in geometry.cluster_boxes(lows, highs, distance, max_objects)
+    ]
+
+
+class ClusterHullModifierOperator(bpy.types.Operator):
+    """Creates one convex hull around each cluster of nearby selected objects.
+    
+    A middle ground between one mass hull spanning empty space and hundreds of
+    individual hulls: objects whose bounds lie within the cluster distance of
+    each other share a hull, named after the first object of the cluster.
+    Original meshes are never modified - only new collision objects are created.
+    """
+    bl_idname = "colmod_01.create_cluster_hulls"
+    bl_label = "Create Cluster Hulls"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Create one convex hull collision around each group of nearby selected objects"
+
+    @profiled
+    def execute(self, context):
+        if not has_numpy():
+            self.report({'ERROR'}, "Cluster hulls need NumPy.")
+            return {'CANCELLED'}
+        
+        previous_mode = ensure_object_mode()
+        
+        try:
+            scene = context.scene
+            # Error-bounded simplification works on the full-resolution hull
+            auto_fit = get_auto_fit(scene)
+            decimate_ratio = 1.0 if auto_fit else scene.colmod_decimate_ratio
+            max_vertices = scene.colmod_max_hull_vertices
+            backend = scene.colmod_hull_backend
+            
+            selected_objects = get_selected_mesh_objects()
+            
+            if not selected_objects:
+                self.report({'ERROR'}, "No mesh objects selected.")
+                restore_mode(previous_mode)
+                return {'CANCELLED'}
+            
+            clusters = cluster_objects(
+                selected_objects, scene.colmod_cluster_distance, scene.colmod_cluster_max_objects
+            )
+            
+            # World-space hull candidates of every object, in one depsgraph evaluation
+            mesh_digests = {}
+            point_sets, culled_points = read_evaluated_hull_points(
+                selected_objects, decimate_ratio, [obj.matrix_world for obj in selected_objects],
+                mesh_digests,
+            )
+            object_points = dict(zip(selected_objects, point_sets))
+            
+            names = UniqueNameIndex(bpy.data.objects.keys())
+            collision_objects = []
+            for members in clusters:
+                # Each hull lives in the space of the first object of its cluster
+                reference_obj = members[0]
+                name = names.allocate(reference_obj.name, "UCX_")
+                matrix_world = reference_obj.matrix_world.copy()
+                with object_scope(reference_obj.name):
+                    mesh, removed = build_merged_hull(
+                        [object_points[obj] for obj in members],
+                        name, matrix_world, backend, auto_fit, max_vertices,
+                    )
+                culled_points += removed
+                collision_objects.append(create_collision_object(
+                    name, mesh, matrix_world, 'cluster', [obj.name for obj in members]
+                ))
+            stamp_collisions(collision_objects, mesh_digests)
+            
+            self.report({'INFO'}, f"Created {len(clusters)} hulls for {len(selected_objects)} objects.")
+            if culled_points:
+                self.report({'INFO'}, f"Culled {culled_points} interior points before hulling.")
+            
+            # Restore mode
+            restore_mode(previous_mode)
+            
+            return {'FINISHED'}
+        
+        except Exception as e:
+            # Restore mode on error
+            restore_mode(previous_mode)
+            self.report({'ERROR'}, f"Failed to create cluster hulls: {str(e)}")
+            return {'CANCELLED'}
+
+
+def register():
+    bpy.utils.register_class(ClusterHullModifierOperator)
+
+
+def unregister():
+    bpy.utils.unregister_class(ClusterHullModifierOperator)
+
+
+if __name__ == "__main__":
+    register()
@@ -0,0 +1,214 @@
+"""
+Convex Decomposition Collision Generator.
+Splits concave objects into several convex hulls, one UCX collision per part.
+"""
+import bpy
+
+from .utils import (
+    has_numpy,
+    get_selected_mesh_objects,
+    get_active_mesh_object,
+    ensure_object_mode,
+    restore_mode,
+)
+from .mesh_io import read_triangle_corners, read_instanced_sources
+from .fingerprint import stamp_collisions
+from .builders import (
+    build_convex_hull_mesh,
+    build_mesh_from_triangles,
+    limit_hull_vertices,
+    create_collision_object,
+)
+from .cache_io import (
+    get_hull_cache,
+    load_cached_parts,
+    store_cached_parts,
+    trim_hull_cache,
+    report_cache_stats,
+)
+from .names import UniqueNameIndex
+from .profiling import profiled, object_scope, stage
+
+try:
+    from .hull_jobs import run_decomposition_batch, run_hull_batch
+    from .hull_cache import make_key as make_cache_key
+except ImportError:
+    run_decomposition_batch = run_hull_batch = make_cache_key = None
+
+
+class ConvexDecompositionModifierOperator(bpy.types.Operator):
+    """Creates several convex hulls that together cover each selected object.
+    
+    Concave objects (arches, door frames, vehicles) are split by planes until
+    every part is nearly convex, and each part gets its own UCX collision.
+    The split is deterministic, so unchanged objects reuse cached parts.
+    Original meshes are never modified - only new collision objects are created.
+    """
+    bl_idname = "colmod_01.create_convex_decomposition"
+    bl_label = "Create Convex Decomposition"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Split each selected object or face selection into convex parts, one UCX per part"
+
+    @profiled
+    def execute(self, context):
+        if not has_numpy():
+            self.report({'ERROR'}, "Convex decomposition needs NumPy.")
+            return {'CANCELLED'}
+        
+        # Leaving Edit Mode syncs the face selection back to the mesh data
+        previous_mode = ensure_object_mode()
+        
+        try:
+            scene = context.scene
+            max_parts = scene.colmod_decompose_max_parts
+            concavity = scene.colmod_decompose_concavity
+            part_vertices = scene.colmod_decompose_part_vertices
+            cache = get_hull_cache(scene)
+            
+            self._mesh_digests = {}
+            sources = self._collect_sources(previous_mode)
+            if sources is None:
+                restore_mode(previous_mode)
+                return {'CANCELLED'}
+            
+            names = UniqueNameIndex(bpy.data.objects.keys())
+            self._mode = None if previous_mode == 'EDIT_MESH' else 'decompose'
+            self._collision_objects = []
+            created = 0
+            misses = []
+            for instances, triangles in sources:
+                cache_key = None
+                if cache is not None:
+                    cache_key = make_cache_key(
+                        [triangles],
+                        mode='decompose',
+                        prefix="UCX_",
+                        max_parts=max_parts,
+                        concavity=round(concavity, 6),
+                        part_vertices=part_vertices,
+                    )
+                    meshes = load_cached_parts(cache, cache_key, instances[0][0])
+                    if meshes is not None:
+                        created += self._instance_parts(meshes, instances, names)
+                        continue
+                misses.append((instances, triangles, cache_key))
+            
+            # Split every source on the worker pool, then hull all parts at once
+            with stage("decompose", verts_in=sum(len(t) * 3 for _i, t, _k in misses)) as timed:
+                part_sets = run_decomposition_batch(
+                    [triangles for _instances, triangles, _key in misses], max_parts, concavity
+                )
+                timed.verts_out = sum(len(points) for parts in part_sets for points in parts)
+            results = run_hull_batch([points for parts in part_sets for points in parts])
+            
+            computed = []
+            result_index = 0
+            for (instances, _triangles, cache_key), parts in zip(misses, part_sets):
+                meshes = []
+                with object_scope(instances[0][0]):
+                    for result in results[result_index:result_index + len(parts)]:
+                        if result.vertices is None:
+                            meshes.append(build_convex_hull_mesh(result.points, instances[0][0]))
+                        else:
+                            meshes.append(build_mesh_from_triangles(
+                                result.vertices, result.triangles, instances[0][0]
+                            ))
+                    limit_hull_vertices(meshes, part_vertices)
+                result_index += len(parts)
+                created += self._instance_parts(meshes, instances, names)
+                computed.append((cache_key, meshes))
+            
+            if not created:
+                self.report({'ERROR'}, "No collision objects were created.")
+                restore_mode(previous_mode)
+                return {'CANCELLED'}
+            
+            for cache_key, meshes in computed:
+                store_cached_parts(cache, cache_key, meshes)
+            trim_hull_cache(cache)
+            stamp_collisions(self._collision_objects, self._mesh_digests)
+            report_cache_stats(self, cache)
+            
+            # Restore mode
+            restore_mode(previous_mode)
+            
+            return {'FINISHED'}
+        
+        except Exception as e:
+            # Restore mode on error
+            restore_mode(previous_mode)
+            self.report({'ERROR'}, f"Failed to create convex decomposition: {str(e)}")
+            return {'CANCELLED'}
+
+    def _collect_sources(self, previous_mode):
+        """
+        Gather the local-space triangles to decompose, once per mesh datablock.
+        
+        Whole objects are read from their evaluated meshes, with linked
+        duplicates sharing one decomposition. In Edit Mode the selected faces
+        of the active object form one source.
+        
+        Returns:
+            List of (instances, triangles) where instances holds (name, matrix_world)
+            pairs, or None after reporting an error
+        """
+        selected_objects = get_selected_mesh_objects()
+        
+        if not selected_objects:
+            self.report({'ERROR'}, "No mesh objects selected.")
+            return None
+        
+        active_obj = get_active_mesh_object()
+        sources = []
+        whole_objects = selected_objects
+        if previous_mode == 'EDIT_MESH':
+            whole_objects = [obj for obj in selected_objects if obj != active_obj]
+            
+            if active_obj in selected_objects:
+                with object_scope(active_obj.name):
+                    triangles = read_triangle_corners(active_obj.data, selected_only=True)
+                
+                if len(triangles):
+                    sources.append(([(active_obj.name, active_obj.matrix_world.copy())], triangles))
+                else:
+                    self.report({'WARNING'}, f"No faces selected in object: {active_obj.name}")
+        
+        sources.extend(read_instanced_sources(
+            whole_objects, triangles=True, mesh_digests=self._mesh_digests
+        )[0])
+        sources = [(instances, triangles) for instances, triangles in sources if len(triangles)]
+        if not sources:
+            self.report({'ERROR'}, "No collision objects were created.")
+            return None
+        return sources
+
+    def _instance_parts(self, meshes, instances, names):
+        """
+        Link one collision object per part and instance, sharing the part meshes.
+        
+        Returns:
+            The number of collision objects created
+        """
+        created = 0
+        for index, (source_name, matrix_world) in enumerate(instances):
+            for mesh in meshes:
+                name = names.allocate(source_name, "UCX_")
+                if index == 0:
+                    mesh.name = name
+                self._collision_objects.append(
+                    create_collision_object(name, mesh, matrix_world, self._mode, [source_name])
+                )
+                created += 1
+        return created
+
+
+def register():
+    bpy.utils.register_class(ConvexDecompositionModifierOperator)
+
+
+def unregister():
+    bpy.utils.unregister_class(ConvexDecompositionModifierOperator)
+
+
+if __name__ == "__main__":
+    register()
@@ -0,0 +1,145 @@
+"""
+Collision Provenance.
+Records on each generated collision how it was made and a fingerprint of its sources,
+so stale collisions can be found and rebuilt.
+"""
+import bpy
+import hashlib
+import json
+import struct
+
+from .mesh_io import CoordBuffer, evaluate_objects, read_vertex_coords, mesh_digest
+from .utils import get_auto_fit
+from .profiling import instrumented
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Custom properties recording how a collision was generated and from what state of its sources
+MODE_PROPERTY = "colmod_mode"
+SOURCES_PROPERTY = "colmod_sources"
+PARAMS_PROPERTY = "colmod_params"
+FINGERPRINT_PROPERTY = "colmod_fingerprint"
+
+# Scene settings each generator mode depends on
+_HULL_SETTINGS = (
+    "colmod_decimate_mode",
+    "colmod_decimate_ratio",
+    "colmod_max_deviation",
+    "colmod_min_volume_ratio",
+    "colmod_max_hull_vertices",
+    "colmod_hull_backend",
+)
+GENERATOR_SETTINGS = {
+    'mass': _HULL_SETTINGS,
+    'individual': _HULL_SETTINGS,
+    'cluster': _HULL_SETTINGS + ("colmod_cluster_distance", "colmod_cluster_max_objects"),
+    'budget': ("colmod_vertex_budget", "colmod_max_hull_vertices"),
+    'box': ("colmod_box_orientation", "colmod_box_per_object"),
+    'kdop': ("colmod_kdop_type", "colmod_max_hull_vertices"),
+    'decompose': (
+        "colmod_decompose_max_parts",
+        "colmod_decompose_concavity",
+        "colmod_decompose_part_vertices",
+    ),
+    'sphere': (),
+    'capsule': (),
+}
+
+
+def generator_params(scene, mode):
+    """
+    Serialise the scene settings a generator mode depends on.
+    
+    Settings of the simplification method that is not selected are left out,
+    so switching between them does not mark every hull stale twice.
+    
+    Returns:
+        A JSON string that is equal for equal settings
+    """
+    params = {}
+    for name in GENERATOR_SETTINGS.get(mode, ()):
+        value = getattr(scene, name)
+        params[name] = round(value, 6) if isinstance(value, float) else value
+    if "colmod_decimate_mode" in params:
+        unused = ("colmod_decimate_ratio",) if get_auto_fit(scene) else (
+            "colmod_max_deviation", "colmod_min_volume_ratio",
+        )
+        for name in unused:
+            del params[name]
+    return json.dumps(params, sort_keys=True)
+
+
+@instrumented("fingerprint", count_in=lambda objects, *a, **k: len(objects))
+def read_source_fingerprints(objects):
+    """
+    Hash the evaluated geometry and world matrix of each object.
+    
+    Modifiers are included, so editing a modifier changes the fingerprint
+    just like editing the mesh. Every object is evaluated in one depsgraph update.
+    
+    Returns:
+        Dict mapping object names to hex digests
+    """
+    buffer = CoordBuffer() if np is not None else None
+    fingerprints = {}
+    for obj, evaluated_mesh in evaluate_objects(objects):
+        coords = read_vertex_coords(evaluated_mesh, buffer=buffer) if buffer is not None else None
+        fingerprints[obj.name] = source_fingerprint(obj, mesh_digest(evaluated_mesh, coords))
+    return fingerprints
+
+
+def source_fingerprint(obj, mesh_digest):
+    """Combine an object's world matrix with the digest of its evaluated mesh."""
+    digest = hashlib.blake2b(mesh_digest, digest_size=16)
+    digest.update(struct.pack("<16f", *(value for row in obj.matrix_world for value in row)))
+    return digest.hexdigest()
+
+
+def combine_fingerprints(fingerprints, source_names):
+    """Combine the fingerprints of a collision's sources, or return None if one is missing."""
+    if any(name not in fingerprints for name in source_names):
+        return None
+    return hashlib.blake2b(
+        "\n".join(fingerprints[name] for name in source_names).encode(), digest_size=16
+    ).hexdigest()
+
+
+def stamp_collisions(collision_objects, mesh_digests=None):
+    """
+    Record the generator settings and source fingerprint on new collisions.
+    
+    Collisions without a generator mode (Edit Mode selections) are skipped.
+    Sources are fingerprinted from the mesh digests taken while the generator
+    read them; only sources without one are evaluated again, once each.
+    
+    Args:
+        collision_objects: Collisions created by one operator run
+        mesh_digests: Evaluated mesh digests by source name, filled by the readers
+    """
+    collision_objects = [obj for obj in collision_objects if MODE_PROPERTY in obj]
+    if not collision_objects:
+        return
+    
+    sources = {}
+    for collision_obj in collision_objects:
+        for name in collision_obj[SOURCES_PROPERTY]:
+            if name not in sources and name in bpy.data.objects:
+                sources[name] = bpy.data.objects[name]
+    mesh_digests = mesh_digests or {}
+    fingerprints = read_source_fingerprints(
+        [obj for name, obj in sources.items() if name not in mesh_digests]
+    )
+    fingerprints.update(
+        (name, source_fingerprint(obj, mesh_digests[name]))
+        for name, obj in sources.items() if name in mesh_digests
+    )
+    
+    scene = bpy.context.scene
+    for collision_obj in collision_objects:
+        collision_obj[PARAMS_PROPERTY] = generator_params(scene, collision_obj[MODE_PROPERTY])
+        fingerprint = combine_fingerprints(fingerprints, collision_obj[SOURCES_PROPERTY])
+        collision_obj[FINGERPRINT_PROPERTY] = fingerprint or ""
@@ -0,0 +1,1430 @@
+"""
+Pure NumPy geometry kernels for COLMOD.
+Nothing in this module imports bpy, so it can run off Blender's main thread.
+"""
+import heapq
+import itertools
+
+import numpy as np
+
+
+# Half of the 26 neighbour directions of a cube; each is probed both ways
+EXTREME_DIRECTIONS = np.array(
+    [d for d in itertools.product((-1.0, 0.0, 1.0), repeat=3) if d > (0.0, 0.0, 0.0)]
+)
+
+# k-DOP slab normals: the 3 axes, then the 6 edge diagonals (18-DOP), then the
+# 4 corner diagonals (26-DOP); each slab bounds two opposite directions
+KDOP_DIRECTIONS = EXTREME_DIRECTIONS[
+    np.argsort(np.count_nonzero(EXTREME_DIRECTIONS, axis=1), kind="stable")
+]
+
+# Oriented box search: points hulled for the search, hull faces tried as box
+# axes, and the rotation steps of the final local refinement
+OBB_SEARCH_POINTS = 2048
+OBB_CANDIDATE_FACES = 24
+OBB_REFINE_STEPS = np.radians([4.0, 2.0, 1.0, 0.5, 0.25, 0.1])
+
+# Convex decomposition: cut positions tried along each axis of a part, and the
+# number of triangles sampled to score cuts and measure concavity
+DECOMPOSE_CUTS = 5
+DECOMPOSE_SAMPLE_TRIANGLES = 128
+
+# Badoiu-Clarkson steps that shrink a bounding ball after Ritter's fit
+BALL_REFINE_STEPS = 64
+
+# Clustering: each grid level's cells are this many times larger than the level below
+CLUSTER_LEVEL_SCALE = 4
+
+# Offsets to the cells a box spans in a grid whose cells are at least as large as the box
+_CELL_OFFSETS = np.array(list(itertools.product((0, 1), repeat=3)), dtype=np.int64)
+
+
+def point_tolerance(points):
+    """Return a distance tolerance scaled to the magnitude of the coordinates."""
+    if len(points) == 0:
+        return 0.0
+    return 1e-5 * max(float(np.abs(points).max()), 1.0)
+
+
+def remove_duplicate_points(points):
+    """
+    Return the points with exact duplicates removed, keeping input order.
+    
+    Rows are sorted by a 64-bit hash of their float32 bits instead of a full
+    lexicographic sort. Hash collisions can only cause a duplicate to be kept,
+    never a distinct point to be dropped.
+    """
+    if len(points) < 2:
+        return points
+    points = np.ascontiguousarray(points, dtype=np.float32)
+    bits = points.view(np.uint32).astype(np.uint64)
+    keys = (
+        bits[:, 0] * np.uint64(0x9E3779B97F4A7C15)
+        ^ bits[:, 1] * np.uint64(0xC2B2AE3D27D4EB4F)
+        ^ bits[:, 2] * np.uint64(0x165667B19E3779F9)
+    )
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    candidates = np.flatnonzero(sorted_keys[1:] == sorted_keys[:-1])
+    same = (points[order[candidates + 1]] == points[order[candidates]]).all(axis=1)
+    keep = np.ones(len(points), dtype=bool)
+    keep[order[candidates[same] + 1]] = False
+    return points[keep]
+
+
+def extreme_point_indices(points):
+    """Return the indices of the points that are extreme along EXTREME_DIRECTIONS."""
+    indices = set()
+    for direction in EXTREME_DIRECTIONS:
+        projection = points @ direction.astype(points.dtype)
+        indices.add(int(projection.argmin()))
+        indices.add(int(projection.argmax()))
+    return np.array(sorted(indices))
+
+
+def polytope_planes(vertices, tolerance):
+    """
+    Find the supporting facet planes of a small convex point set by brute force.
+    
+    Args:
+        vertices: (K, 3) array with K small (at most 26 extreme points)
+        tolerance: Distance below which points count as lying on a plane
+    
+    Returns:
+        (normals, offsets) with outward unit normals, so that every vertex
+        satisfies normals @ p <= offsets + tolerance. Empty when the set is flat.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if len(vertices) < 4:
+        return np.empty((0, 3)), np.empty(0)
+    
+    triples = np.array(list(itertools.combinations(range(len(vertices)), 3)))
+    a, b, c = (vertices[triples[:, i]] for i in range(3))
+    normals = np.cross(b - a, c - a)
+    lengths = np.linalg.norm(normals, axis=1)
+    valid = lengths > tolerance * tolerance
+    normals = normals[valid] / lengths[valid, None]
+    offsets = np.einsum("ij,ij->i", normals, a[valid])
+    
+    # A triple spans a facet when every vertex lies on one side of its plane
+    distances = vertices @ normals.T - offsets
+    below = (distances <= tolerance).all(axis=0)
+    above = (distances >= -tolerance).all(axis=0)
+    normals = np.concatenate([normals[below], -normals[above & ~below]])
+    offsets = np.concatenate([offsets[below], -offsets[above & ~below]])
+    if len(normals) == 0:
+        return normals, offsets
+    
+    # Coplanar vertices yield the same facet several times
+    planes = np.column_stack([normals, offsets])
+    _, unique_index = np.unique(np.round(planes / tolerance), axis=0, return_index=True)
+    planes = planes[np.sort(unique_index)]
+    return planes[:, :3], planes[:, 3]
+
+
+def filter_interior_points(points):
+    """
+    Discard points that cannot lie on the convex hull.
+    
+    Akl-Toussaint heuristic: the points extreme along 26 fixed directions span
+    an inner polytope, and anything strictly inside it is interior to the hull.
+    Exact duplicates among the survivors are removed as well. Boundary points
+    are always kept, so the hull of the result equals the hull of the input.
+    
+    Args:
+        points: (N, 3) array of coordinates
+    
+    Returns:
+        (filtered_points, removed_count)
+    """
+    points = np.asarray(points)
+    count = len(points)
+    if count < 8:
+        filtered = remove_duplicate_points(points)
+        return filtered, count - len(filtered)
+    
+    tolerance = point_tolerance(points)
+    normals, offsets = polytope_planes(points[extreme_point_indices(points)], tolerance)
+    points = points[~_interior_mask(points, normals, offsets, tolerance)]
+    
+    filtered = remove_duplicate_points(points)
+    return filtered, count - len(filtered)
+
+
+def _interior_mask(points, normals, offsets, tolerance):
+    """Flag the points strictly inside the polytope given by its facet planes."""
+    interior = np.full(len(points), len(normals) > 0)
+    for normal, offset in zip(normals.astype(points.dtype), offsets):
+        interior &= points @ normal < offset - tolerance
+    return interior
+
+
+def filter_interior_sets(point_sets):
+    """
+    Akl-Toussaint filter over the union of several point sets, keeping the sets apart.
+    
+    Args:
+        point_sets: List of (N, 3) coordinate arrays
+    
+    Returns:
+        (filtered_sets, removed_count); sets culled entirely are dropped
+    """
+    points = np.concatenate(point_sets)
+    tolerance = point_tolerance(points)
+    normals, offsets = polytope_planes(points[extreme_point_indices(points)], tolerance)
+    keep = ~_interior_mask(points, normals, offsets, tolerance)
+    
+    ends = np.cumsum([len(subset) for subset in point_sets])[:-1]
+    kept = np.split(points[keep], np.cumsum(keep)[ends - 1] if len(ends) else [])
+    return [subset for subset in kept if len(subset)], int(len(points) - keep.sum())
+
+
+def _cross_rows(u, v):
+    """Row-wise cross product; np.cross has a large fixed overhead per call."""
+    return u[:, [1, 2, 0]] * v[:, [2, 0, 1]] - u[:, [2, 0, 1]] * v[:, [1, 2, 0]]
+
+
+def _initial_simplex(points, tolerance):
+    """Pick four affinely independent points to seed Quickhull."""
+    axis_extremes = np.concatenate([points.argmin(axis=0), points.argmax(axis=0)])
+    candidates = points[axis_extremes]
+    spans = np.linalg.norm(candidates[:, None, :] - candidates[None, :, :], axis=2)
+    i, j = np.unravel_index(spans.argmax(), spans.shape)
+    a, b = int(axis_extremes[i]), int(axis_extremes[j])
+    if spans[i, j] <= tolerance:
+        raise ValueError("Points are coincident, no convex hull exists.")
+
+    direction = (points[b] - points[a]) / spans[i, j]
+    offsets = points - points[a]
+    line_distances = np.linalg.norm(offsets - np.outer(offsets @ direction, direction), axis=1)
+    c = int(line_distances.argmax())
+    if line_distances[c] <= tolerance:
+        raise ValueError("Points are collinear, no convex hull exists.")
+
+    normal = np.cross(points[b] - points[a], points[c] - points[a])
+    normal /= np.linalg.norm(normal)
+    plane_distances = np.abs(offsets @ normal)
+    d = int(plane_distances.argmax())
+    if plane_distances[d] <= tolerance:
+        raise ValueError("Points are coplanar, no convex hull exists.")
+    return a, b, c, d
+
+
+def quickhull(points):
+    """
+    Compute the convex hull of a 3D point set with the Quickhull algorithm.
+
+    Args:
+        points: (N, 3) array of coordinates
+
+    Returns:
+        (vertices, triangles): the (M, 3) hull vertices and (F, 3) vertex
+        indices of the hull triangles, wound counter-clockwise seen from outside
+
+    Raises:
+        ValueError: If the points are flat and span no volume
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) < 4:
+        raise ValueError("At least four points are needed for a convex hull.")
+    # Much tighter than point_tolerance(): a loose visibility test leaves
+    # sliver faces whose tilted planes put nearby points outside the hull
+    tolerance = 1e-12 * max(float(np.abs(points).max()), 1.0)
+
+    faces = {}
+    normals = {}
+    offsets = {}
+    edge_faces = {}
+    outside = {}
+    next_id = itertools.count()
+
+    def add_faces(triangles):
+        corners = points[np.array(triangles)]
+        face_normals = _cross_rows(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        lengths = np.sqrt(np.einsum("ij,ij->i", face_normals, face_normals))
+        face_normals /= np.maximum(lengths, 1e-300)[:, None]
+        face_offsets = np.einsum("ij,ij->i", face_normals, corners[:, 0])
+        new_faces = []
+        for (a, b, c), normal, offset in zip(triangles, face_normals, face_offsets):
+            face = next(next_id)
+            faces[face] = (a, b, c)
+            normals[face] = normal
+            offsets[face] = offset
+            edge_faces[(a, b)] = face
+            edge_faces[(b, c)] = face
+            edge_faces[(c, a)] = face
+            new_faces.append(face)
+        return new_faces
+
+    def assign_outside(candidates, new_faces):
+        if len(candidates) == 0 or not new_faces:
+            return
+        face_normals = np.array([normals[f] for f in new_faces])
+        face_offsets = np.array([offsets[f] for f in new_faces])
+        distances = points[candidates] @ face_normals.T - face_offsets
+        best = distances.argmax(axis=1)
+        is_outside = distances[np.arange(len(candidates)), best] > tolerance
+        for column in np.unique(best[is_outside]):
+            outside[new_faces[column]] = candidates[is_outside & (best == column)]
+
+    # Seed with a tetrahedron whose faces all point away from the fourth vertex
+    a, b, c, d = _initial_simplex(points, tolerance)
+    seed_triangles = []
+    for tri, apex in (((a, b, c), d), ((a, d, b), c), ((a, c, d), b), ((b, d, c), a)):
+        normal = np.cross(points[tri[1]] - points[tri[0]], points[tri[2]] - points[tri[0]])
+        if normal @ (points[apex] - points[tri[0]]) > 0:
+            tri = (tri[0], tri[2], tri[1])
+        seed_triangles.append(tri)
+    seed_faces = add_faces(seed_triangles)
+
+    remaining = np.setdiff1d(np.arange(len(points)), (a, b, c, d))
+    assign_outside(remaining, seed_faces)
+    pending = list(outside)
+
+    while pending:
+        face = pending.pop()
+        if face not in outside:
+            continue
+
+        # The furthest outside point is guaranteed to be a hull vertex
+        candidates = outside[face]
+        eye = int(candidates[(points[candidates] @ normals[face]).argmax()])
+        eye_point = points[eye]
+
+        # Flood-fill the faces the eye point can see and collect their horizon
+        visible = {face}
+        stack = [face]
+        horizon = []
+        while stack:
+            current = stack.pop()
+            a, b, c = faces[current]
+            for edge in ((a, b), (b, c), (c, a)):
+                neighbour = edge_faces[(edge[1], edge[0])]
+                if neighbour in visible:
+                    continue
+                if normals[neighbour] @ eye_point - offsets[neighbour] > tolerance:
+                    visible.add(neighbour)
+                    stack.append(neighbour)
+                else:
+                    horizon.append(edge)
+
+        orphans = [outside.pop(f) for f in visible if f in outside]
+        for current in visible:
+            a, b, c = faces.pop(current)
+            for edge in ((a, b), (b, c), (c, a)):
+                if edge_faces.get(edge) == current:
+                    del edge_faces[edge]
+            del normals[current], offsets[current]
+
+        new_faces = add_faces([(a, b, eye) for a, b in horizon])
+        if orphans:
+            orphans = np.concatenate(orphans)
+            assign_outside(orphans[orphans != eye], new_faces)
+        pending.extend(f for f in new_faces if f in outside)
+
+    triangles = np.array(list(faces.values()), dtype=np.int64)
+    used, triangles = np.unique(triangles, return_inverse=True)
+    return points[used], triangles.reshape(-1, 3)
+
+
+def _ring_order(v, faces, vertex_faces):
+    """Return the neighbours of a vertex as one ordered cycle, or None if its fan is not a disk."""
+    following = {}
+    for face in vertex_faces[v]:
+        a, b, c = faces[face]
+        if a == v:
+            following[b] = c
+        elif b == v:
+            following[c] = a
+        else:
+            following[a] = b
+    
+    start = next(iter(following))
+    order = [start]
+    current = following[start]
+    while current != start:
+        if current not in following or len(order) >= len(following):
+            return None
+        order.append(current)
+        current = following[current]
+    return order if len(order) == len(following) else None
+
+
+def _removal_cost(v, points, order):
+    """
+    Volume of the cap cut off by removing a hull vertex.
+    
+    The ring of neighbours is closed with a fan around its centroid, so the cost
+    is exact when the ring is planar and a close estimate otherwise.
+    """
+    count = len(order)
+    vx, vy, vz = points[v]
+    xs, ys, zs = zip(*[points[w] for w in order])
+    cx = sum(xs) / count - vx
+    cy = sum(ys) / count - vy
+    cz = sum(zs) / count - vz
+    total = 0.0
+    ax, ay, az = xs[-1] - vx, ys[-1] - vy, zs[-1] - vz
+    for x, y, z in zip(xs, ys, zs):
+        bx, by, bz = x - vx, y - vy, z - vz
+        total += (ay * bz - az * by) * cx + (az * bx - ax * bz) * cy + (ax * by - ay * bx) * cz
+        ax, ay, az = bx, by, bz
+    return abs(total) / 6.0
+
+
+def _strip_triangles(order):
+    """Triangulate a ring polygon as a strip, alternating between both ends."""
+    low, high = 0, len(order) - 1
+    triangles = []
+    take_low = True
+    while high - low >= 2:
+        if take_low:
+            triangles.append((order[low], order[low + 1], order[high]))
+            low += 1
+        else:
+            triangles.append((order[low], order[high - 1], order[high]))
+            high -= 1
+        take_low = not take_low
+    return triangles
+
+
+def _greedy_removals(vertices, triangles, min_vertices):
+    """
+    Order hull vertices by greedy removal, cheapest first.
+    
+    The cost of a vertex is the volume its removal cuts off the hull. A heap
+    with lazy invalidation holds the costs and only the neighbours of a removed
+    vertex are re-scored, so the pass runs in O(n log n). Removal stops at
+    `min_vertices`; vertices that cannot be removed without breaking the
+    surface are never listed.
+    
+    Returns:
+        (removals, costs): vertex indices in the order they were removed, and
+        the volume each removal cut off
+    """
+    # Scalar Python math beats NumPy on the handful of neighbours per step
+    points = vertices.tolist()
+    faces = dict(enumerate(map(tuple, triangles.tolist())))
+    vertex_faces = [set() for _ in points]
+    for face, triangle in faces.items():
+        for v in triangle:
+            vertex_faces[v].add(face)
+    next_face = itertools.count(len(faces))
+    alive = [True] * len(points)
+    removals = []
+    costs = []
+    versions = [0] * len(points)
+    
+    def score(v):
+        order = _ring_order(v, faces, vertex_faces)
+        if order is None or len(order) < 3:
+            return None
+        return (_removal_cost(v, points, order), versions[v], v)
+    
+    heap = [entry for entry in map(score, range(len(points))) if entry is not None]
+    heapq.heapify(heap)
+    remaining = len(points)
+    
+    while remaining > min_vertices and heap:
+        cost, version, v = heapq.heappop(heap)
+        if not alive[v] or version != versions[v]:
+            continue  # Stale entry, the vertex was removed or re-scored
+        
+        order = _ring_order(v, faces, vertex_faces)
+        if order is None:
+            continue
+        
+        # Close the hole without duplicating an edge that already exists
+        ring_edges = {frozenset(edge) for edge in zip(order, order[1:] + order[:1])}
+        patch = None
+        for shift in range(len(order)):
+            candidate = _strip_triangles(order[shift:] + order[:shift])
+            diagonals = {
+                frozenset(edge)
+                for a, b, c in candidate
+                for edge in ((a, b), (b, c), (c, a))
+            } - ring_edges
+            if not any(
+                any(b in faces[face] for face in vertex_faces[a])
+                for a, b in map(tuple, diagonals)
+            ):
+                patch = candidate
+                break
+        if patch is None:
+            continue  # Re-scored once a neighbour changes
+        
+        for face in vertex_faces[v]:
+            for w in faces.pop(face):
+                if w != v:
+                    vertex_faces[w].discard(face)
+        vertex_faces[v] = set()
+        for triangle in patch:
+            face = next(next_face)
+            faces[face] = triangle
+            for w in triangle:
+                vertex_faces[w].add(face)
+        alive[v] = False
+        removals.append(v)
+        costs.append(cost)
+        remaining -= 1
+        
+        for w in order:
+            versions[w] += 1
+            entry = score(w)
+            if entry is not None:
+                heapq.heappush(heap, entry)
+    
+    return removals, costs
+
+
+def simplify_hull(vertices, triangles, max_vertices):
+    """
+    Reduce a convex hull to at most `max_vertices` vertices, keeping it convex.
+    
+    Vertices are removed greedily in _greedy_removals() order. The kept
+    vertices are hulled again at the end, so the result is exactly convex and
+    contained in the input hull.
+    
+    Args:
+        vertices: (N, 3) hull vertices
+        triangles: (F, 3) hull triangles, wound counter-clockwise seen from outside
+        max_vertices: Vertex budget, at least 4
+    
+    Returns:
+        (vertices, triangles) in the same form as quickhull()
+    
+    Raises:
+        ValueError: If the budget is below 4 or the kept vertices are flat
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    triangles = np.asarray(triangles, dtype=np.int64)
+    if max_vertices < 4:
+        raise ValueError("A convex hull needs at least four vertices.")
+    if len(vertices) <= max_vertices:
+        return vertices, triangles
+    
+    keep = np.ones(len(vertices), dtype=bool)
+    keep[_greedy_removals(vertices, triangles, max_vertices)[0]] = False
+    return quickhull(vertices[keep])
+
+
+def removal_schedule(vertices, triangles):
+    """
+    Order a convex hull's vertices for simplification and price every step.
+    
+    Dropping the first k removals and hulling the rest gives the same result
+    as simplify_hull() with a budget of N - k vertices.
+    
+    Args:
+        vertices: (N, 3) hull vertices
+        triangles: (F, 3) hull triangles, wound counter-clockwise seen from outside
+    
+    Returns:
+        (removals, costs) as int64 and float64 arrays; costs[i] is the volume
+        that removal i cuts off the hull
+    """
+    removals, costs = _greedy_removals(
+        np.asarray(vertices, dtype=np.float64), np.asarray(triangles, dtype=np.int64), 4
+    )
+    return np.array(removals, dtype=np.int64), np.array(costs, dtype=np.float64)
+
+
+def allocate_vertex_budget(gains, unit_costs, budget):
+    """
+    Spread a vertex budget over many hulls by greedy error reduction.
+    
+    Each hull offers its further vertices in order, each removing some error
+    at some cost. Gains are first made non-increasing, since a vertex is worth
+    at least as much as any vertex it unlocks. A priority queue popping the
+    best gain per cost would then take vertices in globally descending ratio
+    order, so one sort of all ratios replaces the queue and tens of thousands
+    of hulls are planned in one vectorised pass. Spending stops at the first
+    vertex that no longer fits the budget.
+    
+    Args:
+        gains: Sequence of 1D arrays, the error removed by each further vertex of a hull
+        unit_costs: Budget consumed by each vertex of a hull, e.g. its instance count
+        budget: Total budget to spend
+    
+    Returns:
+        (H,) int64 array, the number of further vertices granted to each hull
+    """
+    counts = np.array([len(hull_gains) for hull_gains in gains], dtype=np.int64)
+    granted = np.zeros(len(counts), dtype=np.int64)
+    if budget <= 0 or counts.sum() == 0:
+        return granted
+    
+    owners = np.repeat(np.arange(len(counts)), counts)
+    positions = np.arange(len(owners)) - np.repeat(np.cumsum(counts) - counts, counts)
+    costs = np.asarray(unit_costs, dtype=np.float64)[owners]
+    ratios = np.concatenate([
+        np.maximum.accumulate(np.asarray(hull_gains, dtype=np.float64)[::-1])[::-1]
+        for hull_gains in gains if len(hull_gains)
+    ]) / costs
+    
+    # Ties keep each hull's vertices in order, so every hull is granted a prefix
+    order = np.lexsort((positions, -ratios))
+    taken = order[np.cumsum(costs[order]) <= budget]
+    granted += np.bincount(owners[taken], minlength=len(counts))
+    return granted
+
+
+def hull_volume(vertices, triangles):
+    """Volume enclosed by a closed, consistently wound triangle mesh."""
+    corners = np.asarray(vertices, dtype=np.float64)[np.asarray(triangles)]
+    return abs(float(np.einsum(
+        "ij,ij->i", corners[:, 0], _cross_rows(corners[:, 1], corners[:, 2])
+    ).sum())) / 6.0
+
+
+def hull_deviation(points, vertices, triangles):
+    """
+    Largest distance of any point outside a convex hull, measured to the face planes.
+    
+    This is the one-sided Hausdorff distance from the points to the hull
+    wherever the nearest hull feature is a face, and a lower bound near edges
+    and corners.
+    """
+    corners = np.asarray(vertices, dtype=np.float64)[np.asarray(triangles)]
+    normals = _cross_rows(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.sqrt(np.einsum("ij,ij->i", normals, normals))
+    keep = lengths > 0.0
+    normals = normals[keep] / lengths[keep, None]
+    offsets = np.einsum("ij,ij->i", normals, corners[keep, 0])
+    distances = (np.asarray(points, dtype=np.float64) @ normals.T - offsets).max(axis=1)
+    return max(float(distances.max()), 0.0)
+
+
+class _PrefixHull:
+    """Convex hull of a growing prefix of a point sequence, grown one point at a time.
+    
+    Faces live in arrays that are only appended to, so the hull of a shorter
+    prefix is restored from a snapshot instead of being hulled again.
+    """
+
+    def __init__(self, points, seed, tolerance):
+        self.points = points
+        self.tolerance = tolerance
+        self.triangles = np.empty((64, 3), dtype=np.int64)
+        self.normals = np.empty((64, 3))
+        self.offsets = np.empty(64)
+        self.alive = np.zeros(64, dtype=bool)
+        self.size = 0
+        self.edge_faces = {}
+        
+        a, b, c, d = seed
+        triangles = []
+        for tri, apex in (((a, b, c), d), ((a, d, b), c), ((a, c, d), b), ((b, d, c), a)):
+            normal = np.cross(points[tri[1]] - points[tri[0]], points[tri[2]] - points[tri[0]])
+            if normal @ (points[apex] - points[tri[0]]) > 0:
+                tri = (tri[0], tri[2], tri[1])
+            triangles.append(tri)
+        self._add_faces(triangles)
+
+    def _add_faces(self, triangles):
+        count = len(triangles)
+        if self.size + count > len(self.alive):
+            capacity = max(2 * len(self.alive), self.size + count)
+            for name in ("triangles", "normals", "offsets", "alive"):
+                old = getattr(self, name)
+                grown = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+                grown[:self.size] = old[:self.size]
+                setattr(self, name, grown)
+        
+        triangles = np.array(triangles, dtype=np.int64)
+        corners = self.points[triangles]
+        normals = _cross_rows(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        lengths = np.sqrt(np.einsum("ij,ij->i", normals, normals))
+        normals /= np.maximum(lengths, 1e-300)[:, None]
+        
+        faces = slice(self.size, self.size + count)
+        self.triangles[faces] = triangles
+        self.normals[faces] = normals
+        self.offsets[faces] = np.einsum("ij,ij->i", normals, corners[:, 0])
+        self.alive[faces] = True
+        for face, (a, b, c) in enumerate(triangles.tolist(), self.size):
+            self.edge_faces[(a, b)] = face
+            self.edge_faces[(b, c)] = face
+            self.edge_faces[(c, a)] = face
+        self.size += count
+
+    def add(self, index):
+        """Grow the hull by one point; points on or inside the hull leave it unchanged."""
+        point = self.points[index]
+        distances = self.normals[:self.size] @ point - self.offsets[:self.size]
+        distances[~self.alive[:self.size]] = -np.inf
+        face = int(distances.argmax())
+        if distances[face] <= self.tolerance:
+            return
+        
+        # Flood-fill the faces the point can see and collect their horizon, as in quickhull()
+        visible = {face}
+        stack = [face]
+        horizon = []
+        while stack:
+            current = stack.pop()
+            a, b, c = self.triangles[current].tolist()
+            for edge in ((a, b), (b, c), (c, a)):
+                neighbour = self.edge_faces[(edge[1], edge[0])]
+                if neighbour in visible:
+                    continue
+                if distances[neighbour] > self.tolerance:
+                    visible.add(neighbour)
+                    stack.append(neighbour)
+                else:
+                    horizon.append(edge)
+        
+        for current in visible:
+            self.alive[current] = False
+            a, b, c = self.triangles[current].tolist()
+            for edge in ((a, b), (b, c), (c, a)):
+                if self.edge_faces.get(edge) == current:
+                    del self.edge_faces[edge]
+        self._add_faces([(a, b, index) for a, b in horizon])
+
+    def faces(self):
+        """Indices into the points of the current hull triangles."""
+        return self.triangles[:self.size][self.alive[:self.size]]
+
+    def snapshot(self):
+        return self.size, self.alive[:self.size].copy(), dict(self.edge_faces)
+
+    def restore(self, snapshot):
+        self.size, alive, edge_faces = snapshot
+        self.alive[:self.size] = alive
+        self.edge_faces = dict(edge_faces)
+
+
+def fit_hull(vertices, triangles, max_deviation, min_volume_ratio=0.0):
+    """
+    Find the smallest simplification of a convex hull within an error bound.
+    
+    One greedy pass over the full-resolution hull fixes the removal order, so
+    every candidate is a prefix of the reversed order: the vertices that are
+    removed last. Candidates are grown as one incremental hull instead of
+    being hulled again for each probe. The kept vertex count first grows from
+    the smallest hull in doubling steps, then a binary search between the
+    last rejected and the first accepted count restores the smaller hull from
+    a snapshot, so the whole search inserts O(n) points and measures the
+    error O(log n) times.
+    
+    Args:
+        vertices: (N, 3) hull vertices
+        triangles: (F, 3) hull triangles, wound counter-clockwise seen from outside
+        max_deviation: Largest distance a full hull vertex may lie outside the result
+        min_volume_ratio: Smallest fraction of the full volume the result must keep
+    
+    Returns:
+        (vertices, triangles) in the same form as quickhull()
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    triangles = np.asarray(triangles, dtype=np.int64)
+    removals = np.array(_greedy_removals(vertices, triangles, 4)[0], dtype=np.int64)
+    full_volume = hull_volume(vertices, triangles)
+    tolerance = 1e-12 * max(float(np.abs(vertices).max()), 1.0)
+    
+    # Vertices in the order they are kept: never removable first, then the last removed
+    listed = np.zeros(len(vertices), dtype=bool)
+    listed[removals] = True
+    sequence = np.concatenate([np.flatnonzero(~listed), removals[::-1]])
+    
+    # The smallest prefix that spans a volume; shorter prefixes are flat and rejected
+    seeded = max(len(sequence) - len(removals), 4)
+    while True:
+        try:
+            seed = _initial_simplex(vertices[sequence[:seeded]], tolerance)
+            break
+        except ValueError:
+            if seeded == len(sequence):
+                return vertices, triangles
+            seeded = min(2 * seeded, len(sequence))
+    hull = _PrefixHull(vertices, [int(sequence[i]) for i in seed], tolerance)
+    for index in sequence[:seeded].tolist():
+        hull.add(index)
+    grown = seeded
+    
+    def grow(kept):
+        nonlocal grown
+        for index in sequence[grown:kept].tolist():
+            hull.add(index)
+        grown = kept
+    
+    def accepted():
+        # Kept vertices lie on the hull, so only the removed ones can stick out
+        faces = hull.faces()
+        if hull_deviation(vertices[sequence[grown:]], vertices, faces) > max_deviation:
+            return False
+        return hull_volume(vertices, faces) >= min_volume_ratio * full_volume
+    
+    def result():
+        used, faces = np.unique(hull.faces(), return_inverse=True)
+        return vertices[used], faces.reshape(-1, 3)
+    
+    # Error shrinks with every kept vertex, so search the smallest acceptable prefix
+    rejected = None
+    step = 1
+    kept = seeded
+    while True:
+        if kept >= len(sequence):
+            if rejected is None:
+                return vertices, triangles
+            low, low_state = rejected
+            high, best = len(sequence), (vertices, triangles)
+            break
+        grow(kept)
+        if accepted():
+            if rejected is None:
+                return result()
+            low, low_state = rejected
+            high, best = kept, result()
+            break
+        rejected = (kept, hull.snapshot())
+        kept += step
+        step *= 2
+    
+    while high - low > 1:
+        middle = (low + high) // 2
+        hull.restore(low_state)
+        grown = low
+        grow(middle)
+        if accepted():
+            high, best = middle, result()
+        else:
+            low, low_state = middle, hull.snapshot()
+    return best
+
+
+def _convex_hull_2d(points):
+    """Andrew's monotone chain; returns the 2D hull vertices counter-clockwise."""
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    sorted_points = points[order].tolist()
+
+    def half(chain_points):
+        chain = []
+        for x, y in chain_points:
+            while len(chain) >= 2:
+                (ax, ay), (bx, by) = chain[-2], chain[-1]
+                if (bx - ax) * (y - ay) - (by - ay) * (x - ax) > 0.0:
+                    break
+                chain.pop()
+            chain.append((x, y))
+        return chain
+    
+    lower = half(sorted_points)
+    upper = half(reversed(sorted_points))
+    return np.array(lower[:-1] + upper[:-1])
+
+
+def _min_area_direction(points):
+    """
+    Rotating calipers: the edge direction of the smallest rectangle around 2D points.
+    
+    The smallest enclosing rectangle has a side on a hull edge, so every edge
+    direction is tried at once with one (edges x hull) projection.
+    """
+    hull = _convex_hull_2d(points)
+    if len(hull) < 3:
+        return np.array([1.0, 0.0])
+    edges = np.roll(hull, -1, axis=0) - hull
+    lengths = np.sqrt(np.einsum("ij,ij->i", edges, edges))
+    directions = edges[lengths > 0.0] / lengths[lengths > 0.0, None]
+    along = hull @ directions.T
+    across = hull @ np.stack((-directions[:, 1], directions[:, 0]), axis=1).T
+    areas = np.ptp(along, axis=0) * np.ptp(across, axis=0)
+    return directions[areas.argmin()]
+
+
+def _frame_around_axis(axis, points):
+    """Rotation (rows are box axes) with one axis fixed and the other two fitted by calipers."""
+    axis = axis / np.linalg.norm(axis)
+    helper = np.eye(3)[np.abs(axis).argmin()]
+    u = np.cross(axis, helper)
+    u /= np.linalg.norm(u)
+    w = np.cross(axis, u)
+    direction = _min_area_direction(np.stack((points @ u, points @ w), axis=1))
+    first = direction[0] * u + direction[1] * w
+    return np.array([first, np.cross(axis, first), axis])
+
+
+def _axis_rotations(axes, angle):
+    """Rotation matrices by `angle` around each of the given unit axes (Rodrigues)."""
+    cross = np.zeros((len(axes), 3, 3))
+    cross[:, 0, 1], cross[:, 0, 2] = -axes[:, 2], axes[:, 1]
+    cross[:, 1, 0], cross[:, 1, 2] = axes[:, 2], -axes[:, 0]
+    cross[:, 2, 0], cross[:, 2, 1] = -axes[:, 1], axes[:, 0]
+    return np.eye(3) + np.sin(angle) * cross + (1.0 - np.cos(angle)) * cross @ cross
+
+
+def _box_scores(points, rotations, padding):
+    """Padded volume of the box around points for each rotation (rows are box axes)."""
+    projected = np.einsum("nj,kij->kni", points, rotations)
+    extents = projected.max(axis=1) - projected.min(axis=1) + padding
+    return extents.prod(axis=1)
+
+
+def oriented_bounding_box(points):
+    """
+    Fit a tight oriented bounding box around points.
+    
+    Candidate orientations come from PCA and from the largest faces of the
+    convex hull, each completed by a rotating-calipers search in the face
+    plane. The best one is refined by small rotations about its own axes.
+    Orientations are searched on a hull of at most OBB_SEARCH_POINTS points
+    and the final extents are taken over every point, so the box always
+    contains the input.
+    
+    Args:
+        points: (N, 3) array of coordinates, ideally pre-filtered
+    
+    Returns:
+        (center, axes, dimensions): the box centre, a right-handed rotation whose
+        columns are the box axes, and the box size along each axis
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) < 4:
+        low, high = points.min(axis=0), points.max(axis=0)
+        return (low + high) * 0.5, np.eye(3), high - low
+    
+    sample = points
+    if len(points) > OBB_SEARCH_POINTS:
+        # Extreme points plus a fixed random subset keep the search deterministic
+        rng = np.random.default_rng(0)
+        chosen = rng.choice(len(points), OBB_SEARCH_POINTS, replace=False)
+        sample = points[np.union1d(chosen, extreme_point_indices(points))]
+    try:
+        sample, triangles = quickhull(sample)
+    except ValueError:
+        triangles = None  # Flat input, PCA still finds the plane
+    
+    centered = sample - sample.mean(axis=0)
+    _values, vectors = np.linalg.eigh(centered.T @ centered)
+    candidate_axes = list(vectors.T)
+    if triangles is not None:
+        corners = sample[triangles]
+        normals = _cross_rows(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        areas = np.sqrt(np.einsum("ij,ij->i", normals, normals))
+        largest = np.argsort(areas)[::-1][:OBB_CANDIDATE_FACES]
+        candidate_axes += list(normals[largest] / areas[largest, None])
+    
+    rotations = np.array([vectors.T] + [_frame_around_axis(a, sample) for a in candidate_axes])
+    padding = point_tolerance(sample)
+    scores = _box_scores(sample, rotations, padding)
+    best, best_score = rotations[scores.argmin()], scores.min()
+    
+    for step in OBB_REFINE_STEPS:
+        while True:
+            turns = np.concatenate((_axis_rotations(best, step), _axis_rotations(best, -step)))
+            trials = best @ turns.transpose(0, 2, 1)
+            scores = _box_scores(sample, trials, padding)
+            if scores.min() >= best_score * (1.0 - 1e-9):
+                break
+            best, best_score = trials[scores.argmin()], scores.min()
+    
+    if np.linalg.det(best) < 0.0:
+        best = best * np.array([[1.0], [1.0], [-1.0]])
+    projected = points @ best.T
+    low, high = projected.min(axis=0), projected.max(axis=0)
+    return ((low + high) * 0.5) @ best, best.T, high - low
+
+
+def kdop_vertices(points, k=18):
+    """
+    Fit a k-DOP around points and return its corner points.
+    
+    The k-DOP is the intersection of k/2 slabs, each bounded by the minimum
+    and maximum projection of the points onto a fixed direction, so the fit
+    is one (N x k/2) projection. Corners are the intersections of every
+    three slab planes that satisfy all the other slabs; they are merged
+    within tolerance, ready to be hulled.
+    
+    Args:
+        points: (N, 3) array of coordinates
+        k: 6 (a box), 18 or 26
+    
+    Returns:
+        (M, 3) array of k-DOP corners
+    """
+    points = np.asarray(points, dtype=np.float64)
+    directions = KDOP_DIRECTIONS[:k // 2]
+    directions = directions / np.linalg.norm(directions, axis=1)[:, None]
+    projections = points @ directions.T
+    normals = np.concatenate((directions, -directions))
+    offsets = np.concatenate((projections.max(axis=0), -projections.min(axis=0)))
+    
+    triples = np.array(list(itertools.combinations(range(len(normals)), 3)))
+    systems = normals[triples]
+    solvable = np.abs(np.linalg.det(systems)) > 1e-9
+    corners = np.linalg.solve(systems[solvable], offsets[triples[solvable]][:, :, None])[:, :, 0]
+    
+    tolerance = point_tolerance(points)
+    inside = (corners @ normals.T <= offsets + tolerance).all(axis=1)
+    corners = corners[inside]
+    # Planes meeting at one corner in more than three ways give near-duplicates
+    _, unique_index = np.unique(np.round(corners / tolerance), axis=0, return_index=True)
+    return corners[np.sort(unique_index)]
+
+
+def _sample_hull(points):
+    """Hull of a point sample as (vertices, triangles), or None when it is flat."""
+    try:
+        return quickhull(filter_interior_points(points)[0])
+    except ValueError:
+        return None
+
+
+def clip_triangles(triangles, normal, offset):
+    """
+    Split triangles by a plane into the pieces below and above it.
+    
+    Triangles crossing the plane are cut into one triangle on the side of
+    their lone vertex and two on the other side, keeping the winding.
+    
+    Args:
+        triangles: (T, 3, 3) corner positions
+        normal, offset: The plane normal @ p == offset
+    
+    Returns:
+        (below, above) corner arrays
+    """
+    distances = triangles @ normal - offset
+    above = distances > 0.0
+    above_count = above.sum(axis=1)
+    below_parts = [triangles[above_count == 0]]
+    above_parts = [triangles[above_count == 3]]
+    
+    for lone_above in (True, False):
+        crossing = above_count == (1 if lone_above else 2)
+        corners, corner_distances = triangles[crossing], distances[crossing]
+        lone = (above[crossing] == lone_above).argmax(axis=1)
+        # Rotate the corners so the lone vertex comes first
+        order = (lone[:, None] + np.arange(3)) % 3
+        corners = np.take_along_axis(corners, order[:, :, None], axis=1)
+        corner_distances = np.take_along_axis(corner_distances, order, axis=1)
+        
+        a, b, c = corners[:, 0], corners[:, 1], corners[:, 2]
+        da, db, dc = corner_distances.T
+        ab = a + (b - a) * (da / (da - db))[:, None]
+        ac = a + (c - a) * (da / (da - dc))[:, None]
+        lone_side = np.stack((a, ab, ac), axis=1)
+        other_side = np.concatenate((np.stack((ab, b, c), axis=1), np.stack((ab, c, ac), axis=1)))
+        (above_parts if lone_above else below_parts).append(lone_side)
+        (below_parts if lone_above else above_parts).append(other_side)
+    return np.concatenate(below_parts), np.concatenate(above_parts)
+
+
+def part_concavity(triangles):
+    """
+    Measure how deep a part's surface lies inside its convex hull.
+    
+    As in HACD, the depth of a triangle is the distance from its centroid
+    along its normal to the hull, so walls facing into a hollow count even
+    when they touch the hull elsewhere. Triangles are sampled, so the cost
+    does not grow with the mesh.
+    
+    Returns:
+        The greatest depth of a sampled triangle
+    """
+    corners = triangles.reshape(-1, 3)
+    triangles = _sample_triangles(triangles, DECOMPOSE_SAMPLE_TRIANGLES)
+    hull = _sample_hull(np.concatenate((
+        triangles.reshape(-1, 3), corners[extreme_point_indices(corners)]
+    )))
+    if hull is None:
+        return 0.0
+    
+    vertices, hull_triangles = hull
+    hull_corners = vertices[hull_triangles]
+    hull_normals = _cross_rows(
+        hull_corners[:, 1] - hull_corners[:, 0], hull_corners[:, 2] - hull_corners[:, 0]
+    )
+    hull_normals /= np.maximum(np.sqrt(np.einsum("ij,ij->i", hull_normals, hull_normals)), 1e-300)[:, None]
+    hull_offsets = np.einsum("ij,ij->i", hull_normals, hull_corners[:, 0])
+    
+    normals = _cross_rows(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.sqrt(np.einsum("ij,ij->i", normals, normals))
+    valid = lengths > 0.0
+    normals = normals[valid] / lengths[valid, None]
+    centroids = triangles[valid].mean(axis=1)
+    
+    # Exit distance along each normal through every hull plane it faces
+    facing = normals @ hull_normals.T
+    gaps = hull_offsets - centroids @ hull_normals.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distances = np.where(facing > 1e-6, gaps / facing, np.inf).min(axis=1)
+    distances = distances[np.isfinite(distances)]
+    return max(float(distances.max()), 0.0) if len(distances) else 0.0
+
+
+def _sample_triangles(triangles, count):
+    """Evenly strided subset of at most `count` triangles."""
+    if len(triangles) <= count:
+        return triangles
+    return triangles[np.linspace(0, len(triangles) - 1, count).astype(np.int64)]
+
+
+def _best_cut(triangles):
+    """
+    Find the axis-aligned cut of a part whose halves have the smallest total hull volume.
+    
+    Cuts are tried at DECOMPOSE_CUTS evenly spaced positions along each axis
+    and scored by clipping a sample of the triangles, so the halves include
+    their cross-sections while the search cost does not grow with the mesh.
+    
+    Returns:
+        (normal, offset) of the best plane, or None if the part cannot be cut
+    """
+    sample = _sample_triangles(triangles, DECOMPOSE_SAMPLE_TRIANGLES)
+    corners = triangles.reshape(-1, 3)
+    low, high = corners.min(axis=0), corners.max(axis=0)
+    tolerance = point_tolerance(corners)
+    
+    def half_volume(half):
+        hull = _sample_hull(half.reshape(-1, 3)) if len(half) else None
+        return 0.0 if hull is None else hull_volume(*hull)
+    
+    best = None
+    for axis in range(3):
+        if high[axis] - low[axis] <= tolerance:
+            continue
+        normal = np.eye(3)[axis]
+        for step in range(1, DECOMPOSE_CUTS + 1):
+            offset = low[axis] + (high[axis] - low[axis]) * step / (DECOMPOSE_CUTS + 1)
+            below, above = clip_triangles(sample, normal, offset)
+            cost = half_volume(below) + half_volume(above)
+            if best is None or cost < best[0]:
+                best = (cost, normal, offset)
+    if best is None:
+        return None
+    return best[1], best[2]
+
+
+def decompose(triangles, max_parts, max_concavity):
+    """
+    Approximate convex decomposition by hierarchical plane splitting.
+    
+    The most concave part (see part_concavity) is cut along the plane that minimises the hull
+    volume of its halves until every part is within max_concavity or there
+    are max_parts parts. Triangles are clipped at every cut, so the hulls of
+    the parts together always cover the input. No randomness is involved:
+    the same input always gives the same parts.
+    
+    Args:
+        triangles: (T, 3, 3) corner positions of the surface
+        max_parts: Largest number of parts to return
+        max_concavity: Depth inside its hull that a part's surface may have
+    
+    Returns:
+        List of (K, 3) point arrays, one per part, whose hulls form the decomposition
+    """
+    triangles = np.asarray(triangles, dtype=np.float64)
+    parts = [triangles]
+    concavities = [part_concavity(triangles)]
+    
+    while len(parts) < max_parts:
+        index = int(np.argmax(concavities))
+        if concavities[index] <= max_concavity:
+            break
+        cut = _best_cut(parts[index])
+        halves = clip_triangles(parts[index], *cut) if cut is not None else None
+        if halves is None or len(halves[0]) == 0 or len(halves[1]) == 0:
+            concavities[index] = 0.0  # Uncuttable, keep the part as it is
+            continue
+        parts[index] = halves[0]
+        concavities[index] = part_concavity(halves[0])
+        parts.append(halves[1])
+        concavities.append(part_concavity(halves[1]))
+    
+    return [remove_duplicate_points(part.reshape(-1, 3)) for part in parts]
+
+
+def enclosing_ball(points):
+    """
+    Fit a small ball (a circle in 2D) around points in linear time.
+    
+    Ritter's fit gives a valid ball from two far-apart points, grown until it
+    holds every point. Badoiu-Clarkson steps then pull the centre towards the
+    farthest point by a shrinking fraction, converging on the minimum ball;
+    the smallest ball seen is kept. Every pass is one vectorised distance
+    computation, so the cost is O(N) per step.
+    
+    Args:
+        points: (N, D) array of coordinates, ideally pre-filtered
+    
+    Returns:
+        (center, radius)
+    """
+    points = np.asarray(points, dtype=np.float64)
+    
+    def farthest(center):
+        distances = np.einsum("ij,ij->i", points - center, points - center)
+        index = distances.argmax()
+        return index, float(np.sqrt(distances[index]))
+    
+    # Ritter: a diameter guess from a point, its farthest point and theirs
+    first, _distance = farthest(points[0])
+    second, diameter = farthest(points[first])
+    center = (points[first] + points[second]) * 0.5
+    radius = diameter * 0.5
+    while True:
+        index, distance = farthest(center)
+        if distance <= radius:
+            break
+        # Grow just enough to reach the outlier, keeping the far side in place
+        radius = (radius + distance) * 0.5
+        center = center + (points[index] - center) * ((distance - radius) / distance)
+    
+    best_center, best_radius = center, radius
+    for step in range(1, BALL_REFINE_STEPS + 1):
+        index, distance = farthest(center)
+        if distance < best_radius:
+            best_center, best_radius = center, distance
+        center = center + (points[index] - center) / (step + 1)
+    return best_center, best_radius
+
+
+def bounding_capsule(points):
+    """
+    Fit a capsule around points along their principal axis.
+    
+    The radius is the smallest circle around the points projected across the
+    axis. The cap centres are then pulled in as far as every point allows:
+    a point beyond a cap centre only has to lie within the hemisphere. When
+    the caps would cross, the capsule collapses to a sphere of that radius.
+    
+    Args:
+        points: (N, 3) array of coordinates, ideally pre-filtered
+    
+    Returns:
+        (center, axis, half_length, radius): the segment midpoint, the unit
+        axis, half the distance between the cap centres and the radius
+    """
+    points = np.asarray(points, dtype=np.float64)
+    mean = points.mean(axis=0)
+    centered = points - mean
+    _values, vectors = np.linalg.eigh(centered.T @ centered)
+    across_axes, axis = vectors[:, :2], vectors[:, 2]
+    
+    across = centered @ across_axes
+    circle_center, radius = enclosing_ball(across)
+    offsets = across - circle_center
+    radial = np.einsum("ij,ij->i", offsets, offsets)
+    reach = np.sqrt(np.maximum(radius * radius - radial, 0.0))
+    
+    along = centered @ axis
+    top = float((along - reach).max())
+    bottom = float((along + reach).min())
+    half_length = max(top - bottom, 0.0) * 0.5
+    center = mean + across_axes @ circle_center + axis * ((top + bottom) * 0.5)
+    return center, axis, half_length, radius
+
+
+def _union_roots(count, first, second):
+    """Label each of `count` nodes with the smallest node connected to it by the edges first[i]-second[i]."""
+    parent = np.arange(count)
+    while len(first):
+        root_first, root_second = parent[first], parent[second]
+        if np.array_equal(root_first, root_second):
+            break
+        smaller = np.minimum(root_first, root_second)
+        np.minimum.at(parent, root_first, smaller)
+        np.minimum.at(parent, root_second, smaller)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    return parent
+
+
+def _split_cluster(members, centers, max_size):
+    """Halve a cluster at the median of its longest axis until each piece fits max_size."""
+    if len(members) <= max_size:
+        return [members]
+    member_centers = centers[members]
+    axis = int(np.ptp(member_centers, axis=0).argmax())
+    order = members[np.argsort(member_centers[:, axis], kind="stable")]
+    middle = len(order) // 2
+    return (
+        _split_cluster(order[:middle], centers, max_size)
+        + _split_cluster(order[middle:], centers, max_size)
+    )
+
+
+def _grid_pairs(lows, highs, inserted, queries, cell):
+    """
+    Find the touching box pairs that share a grid cell, at least one box of each pair inserted.
+    
+    No box is larger than a cell, so each spans at most two cells per axis.
+    Queried boxes are only paired with inserted ones, so the pairs of a cell
+    grow with its inserted boxes, not with everything inside it.
+    
+    Returns:
+        (first, second) arrays of box indices
+    """
+    members = np.concatenate([inserted, queries])
+    is_inserted = np.arange(len(members)) < len(inserted)
+    cell_lows = np.floor(lows[members] / cell).astype(np.int64)
+    spans = np.floor(highs[members] / cell).astype(np.int64) - cell_lows + 1
+    
+    # One entry for every cell a box touches
+    entries = np.repeat(np.arange(len(members)), len(_CELL_OFFSETS))
+    offsets = np.tile(_CELL_OFFSETS, (len(members), 1))
+    touched = (offsets < spans[entries]).all(axis=1)
+    entries = entries[touched]
+    cells = cell_lows[entries] + offsets[touched]
+    cells -= cells.min(axis=0)
+    extent = cells.max(axis=0) + 1
+    cell_ids = (cells[:, 0] * extent[1] + cells[:, 1]) * extent[2] + cells[:, 2]
+    order = np.argsort(cell_ids, kind="stable")
+    entries, cell_ids = entries[order], cell_ids[order]
+    
+    # Pair every inserted entry with each entry of its cell
+    starts = np.flatnonzero(np.concatenate(([True], cell_ids[1:] != cell_ids[:-1])))
+    sizes = np.diff(np.append(starts, len(entries)))
+    cell_starts = np.repeat(starts, sizes)
+    sources = np.flatnonzero(is_inserted[entries])
+    counts = sizes[np.searchsorted(starts, sources, side="right") - 1]
+    first = np.repeat(sources, counts)
+    second = (
+        np.repeat(cell_starts[sources], counts)
+        + np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts, counts)
+    )
+    # Inserted pairs are listed from both ends; keep one
+    keep = np.where(is_inserted[entries[second]], first < second, True)
+    a, b = members[entries[first[keep]]], members[entries[second[keep]]]
+    touching = ((lows[a] <= highs[b]) & (lows[b] <= highs[a])).all(axis=1)
+    return a[touching], b[touching]
+
+
+def cluster_boxes(lows, highs, distance, max_size=0):
+    """
+    Group axis-aligned boxes that lie within `distance` of each other.
+    
+    Boxes are grown by half the distance and hashed into a hierarchy of
+    uniform grids. The finest cells match the median grown box and every
+    level is CLUSTER_LEVEL_SCALE times coarser. Each box is inserted into the
+    finest level whose cells are at least its size, so it touches at most
+    eight cells however large it is (a floor among small props stays cheap),
+    and is looked up in every coarser level. Touching pairs are joined by
+    union-find (single linkage), which keeps the cost near-linear in the
+    number of boxes. Clusters with more than max_size boxes are split at the
+    median of their longest axis.
+    
+    Args:
+        lows, highs: (N, 3) arrays of box corners
+        distance: Largest gap between boxes of one cluster
+        max_size: Largest number of boxes per cluster (0 = no limit)
+    
+    Returns:
+        List of box index arrays, one per cluster, ordered by their lowest index
+    """
+    lows = np.asarray(lows, dtype=np.float64) - distance * 0.5
+    highs = np.asarray(highs, dtype=np.float64) + distance * 0.5
+    count = len(lows)
+    if count == 0:
+        return []
+    
+    sizes = (highs - lows).max(axis=1)
+    cell = max(float(np.median(sizes)), point_tolerance(lows))
+    levels = np.zeros(count, dtype=np.int64)
+    large = sizes > cell
+    levels[large] = np.ceil(np.log(sizes[large] / cell) / np.log(CLUSTER_LEVEL_SCALE))
+    levels += sizes > cell * float(CLUSTER_LEVEL_SCALE) ** levels  # Rounding in the logarithm
+    
+    first, second = [], []
+    for level in np.unique(levels):
+        a, b = _grid_pairs(
+            lows, highs,
+            np.flatnonzero(levels == level), np.flatnonzero(levels < level),
+            cell * float(CLUSTER_LEVEL_SCALE) ** level,
+        )
+        first.append(a)
+        second.append(b)
+    first, second = np.concatenate(first), np.concatenate(second)
+    
+    roots = _union_roots(count, first, second)
+    order = np.argsort(roots, kind="stable")
+    clusters = np.split(order, np.flatnonzero(np.diff(roots[order])) + 1)
+    if max_size > 0:
+        centers = (lows + highs) * 0.5
+        clusters = [piece for members in clusters for piece in _split_cluster(members, centers, max_size)]
+        clusters.sort(key=lambda members: members.min())
+    return clusters
+
+
+def spatial_order(centers):
+    """
+    Order points along a Morton (Z-order) curve so neighbours in the order are near in space.
+    
+    Args:
+        centers: (N, 3) array of coordinates
+    
+    Returns:
+        (N,) permutation array
+    """
+    centers = np.asarray(centers, dtype=np.float64)
+    if len(centers) < 2:
+        return np.arange(len(centers))
+    low = centers.min(axis=0)
+    extent = max(float(np.ptp(centers, axis=0).max()), 1e-300)
+    cells = ((centers - low) / extent * 1023.0).astype(np.uint64)
+    codes = np.zeros(len(centers), dtype=np.uint64)
+    for bit in range(10):
+        for axis in range(3):
+            codes |= ((cells[:, axis] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(bit * 3 + axis)
+    return np.argsort(codes, kind="stable")
+
+
+def connected_vertex_groups(loop_totals, loop_vertices, face_mask=None):
+    """
+    Split faces into connected islands and return the vertices of each island.
+    
+    Faces sharing a vertex (and so any edge) belong to the same island. Runs a
+    vectorised union-find (hooking plus pointer jumping) over the bipartite
+    face-vertex graph, which takes O(log n) passes of linear work.
+    
+    Args:
+        loop_totals: (F,) number of loops per face, faces owning consecutive loops
+        loop_vertices: (L,) vertex index of every loop
+        face_mask: Optional (F,) boolean array restricting the faces considered
+    
+    Returns:
+        List of vertex index arrays, one per island, ordered by lowest face index
+    """
+    loop_totals = np.asarray(loop_totals, dtype=np.int64)
+    loop_vertices = np.asarray(loop_vertices, dtype=np.int64)
+    face_count = len(loop_totals)
+    loop_faces = np.repeat(np.arange(face_count), loop_totals)
+    if face_mask is not None:
+        loop_mask = np.repeat(np.asarray(face_mask, dtype=bool), loop_totals)
+        loop_faces = loop_faces[loop_mask]
+        loop_vertices = loop_vertices[loop_mask]
+    if len(loop_faces) == 0:
+        return []
+    
+    # Faces are nodes 0..F-1, vertices are nodes F.. so one parent array covers both
+    vertex_nodes = loop_vertices + face_count
+    parent = np.arange(face_count + int(loop_vertices.max()) + 1)
+    while True:
+        root_faces = parent[loop_faces]
+        root_vertices = parent[vertex_nodes]
+        if np.array_equal(root_faces, root_vertices):
+            break
+        # Hook both roots of every edge onto the smaller one
+        smaller = np.minimum(root_faces, root_vertices)
+        np.minimum.at(parent, root_faces, smaller)
+        np.minimum.at(parent, root_vertices, smaller)
+        # Compress every path down to its root
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    
+    # Every vertex belongs to exactly one island, labelled by its root face
+    vertices, first_loop = np.unique(loop_vertices, return_index=True)
+    labels = parent[vertex_nodes[first_loop]]
+    order = np.argsort(labels, kind='stable')
+    split_points = np.flatnonzero(np.diff(labels[order])) + 1
+    return np.split(vertices[order], split_points)
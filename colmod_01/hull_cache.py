@@ -0,0 +1,154 @@
+"""
+Hull Cache.
+Content-addressed on-disk cache of finished collision hulls.
+Entries are keyed by a hash of the source geometry and generator parameters,
+stored as compact binary files, memory-mapped on read and evicted least-recently-used first.
+"""
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+
+
+# Magic, format version, vertex count, polygon count, loop count
+HEADER = struct.Struct("<4sIIII")
+MAGIC = b"CMHC"
+VERSION = 1
+EXTENSION = ".hull"
+
+CachedHull = namedtuple("CachedHull", ("coords", "loop_totals", "loop_vertices"))
+
+
+def default_cache_directory():
+    """Return the cache directory used when none is configured."""
+    return os.path.join(tempfile.gettempdir(), "colmod_hull_cache")
+
+
+def make_key(arrays, **params):
+    """
+    Hash geometry buffers and generator parameters into a cache key.
+    
+    Args:
+        arrays: NumPy arrays holding everything the hull is computed from
+        params: JSON-serialisable generator parameters (ratio, mode, prefix...)
+    
+    Returns:
+        A hex digest string
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+class HullCache:
+    """Size-bounded on-disk store of hull meshes.
+    
+    Recency is tracked through file modification times, so several Blender
+    sessions can share one cache directory.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + EXTENSION)
+
+    def get(self, key):
+        """
+        Look up a hull.
+        
+        Returns:
+            A CachedHull of read-only memory-mapped arrays, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                magic, version, vert_count, poly_count, loop_count = HEADER.unpack(
+                    cache_file.read(HEADER.size)
+                )
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Unsupported cache entry: {path}")
+            
+            coords_offset = HEADER.size
+            totals_offset = coords_offset + vert_count * 12
+            loops_offset = totals_offset + poly_count * 4
+            hull = CachedHull(
+                self._map(path, np.float32, (vert_count, 3), coords_offset),
+                self._map(path, np.int32, (poly_count,), totals_offset),
+                self._map(path, np.int32, (loop_count,), loops_offset),
+            )
+            # Touch the entry so eviction sees it as recently used
+            os.utime(path)
+        except (OSError, ValueError, struct.error):
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return hull
+
+    @staticmethod
+    def _map(path, dtype, shape, offset):
+        if shape[0] == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+    def put(self, key, coords, loop_totals, loop_vertices):
+        """Store a hull; the file is written to a temporary name and swapped in atomically."""
+        coords = np.ascontiguousarray(coords, dtype=np.float32).reshape(-1, 3)
+        loop_totals = np.ascontiguousarray(loop_totals, dtype=np.int32)
+        loop_vertices = np.ascontiguousarray(loop_vertices, dtype=np.int32)
+        
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as cache_file:
+            cache_file.write(HEADER.pack(
+                MAGIC, VERSION, len(coords), len(loop_totals), len(loop_vertices)
+            ))
+            cache_file.write(coords.tobytes())
+            cache_file.write(loop_totals.tobytes())
+            cache_file.write(loop_vertices.tobytes())
+        os.replace(temp_path, path)
+
+    def evict(self):
+        """
+        Delete least-recently-used entries until the cache fits in max_bytes.
+        
+        Returns:
+            The number of entries removed
+        """
+        entries = []
+        total = 0
+        if not os.path.isdir(self.directory):
+            return 0
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(EXTENSION):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        
+        removed = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
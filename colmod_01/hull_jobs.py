@@ -0,0 +1,207 @@
+"""
+Background Convex Hull Jobs.
+Runs the NumPy hull kernel on a worker process pool so Blender's UI stays responsive.
+Nothing here touches bpy; results are committed to bpy.data by the caller on the main thread.
+"""
+import functools
+import multiprocessing
+import os
+import runpy
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import geometry
+
+
+# vertices/triangles are None when the points were flat and bmesh must finish the hull
+HullResult = namedtuple("HullResult", ("points", "vertices", "triangles", "removed"))
+
+# Candidate sets merged per node of the hull merge tree
+MERGE_FANOUT = 8
+
+# Script each worker process runs before its first job, see hull_worker.py
+WORKER_BOOTSTRAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hull_worker.py")
+
+
+def compute_hull(points):
+    """
+    Pre-filter and hull one point set.
+    
+    Args:
+        points: (N, 3) array of coordinates
+    
+    Returns:
+        A HullResult
+    """
+    points, removed = geometry.filter_interior_points(points)
+    try:
+        vertices, triangles = geometry.quickhull(points)
+    except ValueError:
+        return HullResult(points, None, None, removed)
+    return HullResult(points, vertices, triangles, removed)
+
+
+def decompose_parts(triangles, max_parts, concavity):
+    """
+    Split one surface into approximately convex parts.
+    
+    Args:
+        triangles: (T, 3, 3) corner positions
+        max_parts: Largest number of parts
+        concavity: Allowed depth inside a part's hull, as a fraction of the
+            surface's bounding box diagonal
+    
+    Returns:
+        List of (K, 3) point arrays, one per part
+    """
+    if len(triangles) == 0:
+        return []
+    corners = triangles.reshape(-1, 3)
+    diagonal = float(np.linalg.norm(corners.max(axis=0) - corners.min(axis=0)))
+    return geometry.decompose(triangles, max_parts, concavity * diagonal)
+
+
+def _create_executor(max_workers):
+    # Processes, not threads: quickhull and the simplifiers are mostly pure Python and hold
+    # the GIL. Workers are spawned rather than forked from Blender, and bootstrap the package
+    # without running __init__, so jobs unpickle with only NumPy and geometry.py.
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=runpy.run_path,
+        initargs=(WORKER_BOOTSTRAP, {
+            "PACKAGE": __package__,
+            "PACKAGE_DIR": os.path.dirname(WORKER_BOOTSTRAP),
+        }),
+    )
+
+
+def run_hull_batch(point_sets, max_workers=None):
+    """
+    Hull several point sets in parallel and wait for all of them.
+    
+    Returns:
+        One HullResult per point set, in the same order
+    """
+    with _create_executor(max_workers) as executor:
+        return list(executor.map(compute_hull, point_sets))
+
+
+def run_decomposition_batch(triangle_sets, max_parts, concavity, max_workers=None):
+    """
+    Decompose several surfaces in parallel and wait for all of them.
+    
+    Returns:
+        One list of part point arrays per surface, in the same order
+    """
+    decompose = functools.partial(decompose_parts, max_parts=max_parts, concavity=concavity)
+    with _create_executor(max_workers) as executor:
+        return list(executor.map(decompose, triangle_sets))
+
+
+def compute_scheduled_hull(points):
+    """
+    Hull one point set and order its vertices for simplification.
+    
+    Returns:
+        (HullResult, schedule) where schedule is geometry.removal_schedule()'s
+        (removals, costs), or None when the points were flat
+    """
+    result = compute_hull(points)
+    if result.vertices is None:
+        return result, None
+    return result, geometry.removal_schedule(result.vertices, result.triangles)
+
+
+def run_scheduled_hull_batch(point_sets, max_workers=None):
+    """
+    Hull and schedule several point sets in parallel and wait for all of them.
+    
+    Returns:
+        One (HullResult, schedule) pair per point set, in the same order
+    """
+    with _create_executor(max_workers) as executor:
+        return list(executor.map(compute_scheduled_hull, point_sets))
+
+
+def _hull_vertices(point_sets):
+    """Hull sibling point sets together and keep only the vertices of their hull."""
+    points = np.concatenate(point_sets)
+    result = compute_hull(points)
+    # Flat points enclose no volume to hull; the culled points stand in for the vertices
+    vertices = result.points if result.vertices is None else result.vertices
+    return vertices, len(points) - len(vertices)
+
+
+def merge_hull_candidates(point_sets, max_workers=None):
+    """
+    Reduce many hull candidate sets to the vertices of their joint hull, merging in a balanced tree.
+    
+    The hull of a union is the hull of the hulls, so no node needs more than
+    the hull vertices of its children. One pass against the extreme polytope
+    of all sets drops buried objects outright. Each remaining object is then
+    hulled on its own and only its hull vertices are kept. Sets are grouped
+    along a Morton curve, so siblings are neighbours, and every node hulls
+    the vertices of its children. The root's vertices are exactly the hull
+    vertices of all the points, so no huge point set is ever hulled. Each
+    level of the tree runs on the worker pool.
+    
+    Returns:
+        (points, removed_count)
+    """
+    point_sets = [points for points in point_sets if len(points)]
+    if not point_sets:
+        return np.empty((0, 3), dtype=np.float32), 0
+    
+    point_sets, removed = geometry.filter_interior_sets(point_sets)
+    centers = np.array([points.mean(axis=0) for points in point_sets])
+    # The leaves hull one object each
+    groups = [[point_sets[index]] for index in geometry.spatial_order(centers)]
+    with _create_executor(max_workers) as executor:
+        while True:
+            results = list(executor.map(_hull_vertices, groups))
+            point_sets = [vertices for vertices, _dropped in results]
+            removed += sum(dropped for _vertices, dropped in results)
+            if len(point_sets) == 1:
+                return point_sets[0], removed
+            groups = [
+                point_sets[index:index + MERGE_FANOUT]
+                for index in range(0, len(point_sets), MERGE_FANOUT)
+            ]
+
+
+class HullJobQueue:
+    """Queue of hull jobs that can be polled from a timer or modal operator.
+    
+    Keys are arbitrary hashable values chosen by the caller to identify each job.
+    """
+
+    def __init__(self, max_workers=None):
+        self._executor = _create_executor(max_workers)
+        self._futures = {}
+
+    @property
+    def pending(self):
+        """Number of submitted jobs that have not been collected yet."""
+        return len(self._futures)
+
+    def submit(self, key, points):
+        """Start hulling a point set in the background."""
+        self._futures[key] = self._executor.submit(compute_hull, points)
+
+    def pop_finished(self):
+        """
+        Collect every job that has finished since the last call.
+        
+        Returns:
+            List of (key, HullResult) pairs; worker exceptions are re-raised here
+        """
+        finished = [key for key, future in self._futures.items() if future.done()]
+        return [(key, self._futures.pop(key).result()) for key in finished]
+
+    def shutdown(self):
+        """Cancel queued jobs and release the workers without waiting."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._futures.clear()
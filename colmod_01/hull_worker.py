@@ -0,0 +1,19 @@
+"""
+Hull Worker Bootstrap.
+Run by runpy in every hull worker process before it takes jobs.
+Registers the addon package as a bare namespace, so unpickling a job imports
+hull_jobs and geometry from their files without running __init__, which needs bpy.
+"""
+import sys
+import types
+
+
+# PACKAGE and PACKAGE_DIR are passed in by hull_jobs._create_executor
+_parts = PACKAGE.split(".")
+for _index in range(1, len(_parts) + 1):
+    _name = ".".join(_parts[:_index])
+    if _name not in sys.modules:
+        _module = types.ModuleType(_name)
+        # Only the addon itself has modules to find, e.g. bl_ext.* parents stay empty
+        _module.__path__ = [PACKAGE_DIR] if _index == len(_parts) else []
+        sys.modules[_name] = _module
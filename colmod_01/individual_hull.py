@@ -3,19 +3,46 @@ Individual Convex Hull Collision Generator.
 Creates separate convex hulls for each selected object or face group.
 """
 import bpy
-import bmesh
 
 from .utils import (
     get_selected_mesh_objects,
     get_active_mesh_object,
     ensure_object_mode,
     restore_mode,
-    select_only_objects,
-    get_unique_name,
-    get_collision_material,
-    assign_material,
-    duplicate_object,
+    get_auto_fit,
+    has_numpy,
 )
+from .mesh_io import read_instanced_sources, read_selected_face_islands, prefilter_hull_points
+from .fingerprint import stamp_collisions
+from .builders import (
+    build_convex_hull_mesh,
+    build_mesh_from_triangles,
+    apply_decimate,
+    limit_hull_vertices,
+    fit_hulls_to_error,
+    create_collision_object,
+)
+from .cache_io import (
+    get_hull_cache,
+    load_cached_hull,
+    store_cached_hulls,
+    trim_hull_cache,
+    report_cache_stats,
+)
+
+from .names import UniqueNameIndex
+from .profiling import profiled, object_scope
+
+try:
+    from .hull_jobs import HullJobQueue, run_hull_batch
+    from .hull_cache import make_key as make_cache_key
+except ImportError:
+    # NumPy is missing: only bmesh hulls are available and caching is off
+    HullJobQueue = run_hull_batch = make_cache_key = None
+
+
+# Seconds between checks for finished background hull jobs
+JOB_POLL_INTERVAL = 0.1
 
 
 class IndividualHullModifierOperator(bpy.types.Operator):
@@ -29,137 +56,259 @@ class IndividualHullModifierOperator(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
     bl_description = "Create separate convex hull collisions for each selected object or face group"
 
+    @profiled
     def execute(self, context):
-        # Store original selection and mode
-        original_objects = set(bpy.context.selected_objects)
+        # Leaving Edit Mode syncs the face selection back to the mesh data
         previous_mode = ensure_object_mode()
         
         try:
-            decimate_ratio = context.scene.colmod_decimate_ratio
-            
-            # Get selected mesh objects
-            selected_objects = get_selected_mesh_objects()
+            self._begin_run(context)
             
-            if not selected_objects:
-                self.report({'ERROR'}, "No mesh objects selected.")
+            sources = self._collect_sources(previous_mode)
+            if sources is None:
                 return {'CANCELLED'}
             
-            # Track all created collision objects
-            created_collision_objects = []
+            # Cached hulls are committed straight away; only misses are computed
+            sources = self._commit_cached(sources)
             
-            for obj in selected_objects:
-                # Check if we should process selected faces (from Edit Mode)
-                if previous_mode == 'EDIT_MESH' and obj == get_active_mesh_object():
-                    # Get selected faces/vertices
-                    bpy.ops.object.mode_set(mode='EDIT')
-                    bm = bmesh.from_edit_mesh(obj.data)
-                    selected_verts = []
-                    
-                    if bm.faces:
-                        for face in bm.faces:
-                            if face.select:
-                                for vert in face.verts:
-                                    selected_verts.append(obj.matrix_world @ vert.co)
-                    
-                    bm.free()
-                    
-                    if selected_verts:
-                        # Create hull from selected faces
-                        collision_obj = self._create_hull_from_vertices(
-                            obj, selected_verts, decimate_ratio
-                        )
-                        created_collision_objects.append(collision_obj)
-                    else:
-                        self.report({'WARNING'}, f"No faces selected in object: {obj.name}")
-                else:
-                    # Create hull from entire object
-                    collision_obj = self._create_hull_from_object(obj, decimate_ratio)
-                    created_collision_objects.append(collision_obj)
+            if self._backend == 'QUICKHULL' and has_numpy():
+                # Hull every source on the worker pool, then commit here
+                results = run_hull_batch([points for _instances, points, _key in sources])
+            else:
+                results = [None] * len(sources)
             
-            if not created_collision_objects:
-                self.report({'ERROR'}, "No collision objects were created.")
-                return {'CANCELLED'}
+            for (instances, points, cache_key), result in zip(sources, results):
+                self._create_hull(instances, cache_key, points, result)
             
-            # Restore original selection state
-            bpy.ops.object.select_all(action='DESELECT')
-            for obj in original_objects:
-                if obj.name in bpy.data.objects:
-                    obj.select_set(True)
+            self._finish()
             
             # Restore mode
             restore_mode(previous_mode)
             
             return {'FINISHED'}
-            
+        
         except Exception as e:
             # Restore mode on error
             restore_mode(previous_mode)
             self.report({'ERROR'}, f"Failed to create individual hulls: {str(e)}")
             return {'CANCELLED'}
 
-    def _create_hull_from_object(self, obj, decimate_ratio):
-        """Create a convex hull collision from an entire object."""
-        # Duplicate the object without modifying the original
-        new_obj = duplicate_object(obj)
-        
-        # Apply convex hull
-        self._apply_convex_hull_and_decimate(new_obj, decimate_ratio)
-        
-        return new_obj
-
-    def _create_hull_from_vertices(self, original_obj, vertices, decimate_ratio):
-        """Create a convex hull collision from selected vertices."""
-        # Create a new mesh from the selected vertices
-        mesh = bpy.data.meshes.new(f"{original_obj.name}_selected_faces")
-        new_obj = bpy.data.objects.new(f"{original_obj.name}_selected_faces", mesh)
-        bpy.context.collection.objects.link(new_obj)
-        
-        # Build mesh from vertices
-        bm = bmesh.new()
-        for vert in vertices:
-            bm.verts.new(vert)
-        bm.verts.ensure_lookup_table()
-        bmesh.ops.convex_hull(bm, input=bm.verts)
-        bm.to_mesh(mesh)
-        bm.free()
-        
-        # Set transform to match original
-        new_obj.location = original_obj.location
-        new_obj.rotation_euler = original_obj.rotation_euler
-        new_obj.scale = original_obj.scale
-        
-        # Apply decimation
-        self._apply_convex_hull_and_decimate(new_obj, decimate_ratio)
-        
-        return new_obj
-
-    def _apply_convex_hull_and_decimate(self, obj, decimate_ratio):
-        """Apply convex hull and decimation to a collision object."""
-        # Make this object active and selected
-        bpy.context.view_layer.objects.active = obj
-        obj.select_set(True)
-        
-        # Apply convex hull in Edit Mode
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.convex_hull()
-        bpy.ops.object.mode_set(mode='OBJECT')
-        
-        # Apply decimation modifier
-        decimate_mod = obj.modifiers.new(name="Decimate", type='DECIMATE')
-        decimate_mod.ratio = decimate_ratio
-        bpy.ops.object.modifier_apply(modifier=decimate_mod.name)
-        
-        # Rename with Unreal Engine convention
-        base_name = obj.name.replace("_copy", "").replace("_selected_faces", "")
-        obj.name = get_unique_name(base_name, "UCX_")
-        
-        # Assign collision material
-        collision_material = get_collision_material()
-        assign_material(obj, collision_material)
-        
-        # Deselect the collision object
-        obj.select_set(False)
+    @profiled
+    def invoke(self, context, event):
+        # Only the NumPy backend can run off the main thread
+        if context.scene.colmod_hull_backend != 'QUICKHULL' or not has_numpy():
+            return self.execute(context)
+        
+        previous_mode = ensure_object_mode()
+        try:
+            self._begin_run(context)
+            sources = self._collect_sources(previous_mode)
+            if sources is not None:
+                sources = self._commit_cached(sources)
+        finally:
+            # Hull data is committed through the data API, so any mode will do
+            restore_mode(previous_mode)
+        
+        if sources is None:
+            return {'CANCELLED'}
+        if not sources:
+            self._finish()
+            return {'FINISHED'}
+        
+        self._jobs = HullJobQueue()
+        self._sources = {}
+        for index, (instances, points, cache_key) in enumerate(sources):
+            self._sources[index] = (instances, cache_key)
+            self._jobs.submit(index, points)
+        
+        window_manager = context.window_manager
+        self._timer = window_manager.event_timer_add(JOB_POLL_INTERVAL, window=context.window)
+        window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    @profiled
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self._stop_jobs(context)
+            self.report({'WARNING'}, "Hull generation cancelled.")
+            self._finish()
+            return {'FINISHED'}
+        
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        
+        try:
+            # Commit finished hulls to bpy.data on the main thread
+            for index, result in self._jobs.pop_finished():
+                instances, cache_key = self._sources[index]
+                self._create_hull(instances, cache_key, None, result)
+            
+            if self._jobs.pending:
+                return {'RUNNING_MODAL'}
+            
+            self._stop_jobs(context)
+            self._finish()
+            return {'FINISHED'}
+        
+        except Exception as e:
+            self._stop_jobs(context)
+            self.report({'ERROR'}, f"Failed to create individual hulls: {str(e)}")
+            return {'CANCELLED'}
+
+    def _stop_jobs(self, context):
+        """Remove the poll timer and release the worker pool."""
+        context.window_manager.event_timer_remove(self._timer)
+        self._jobs.shutdown()
+
+    def _begin_run(self, context):
+        """Capture the scene settings and reset the state of one operator run."""
+        scene = context.scene
+        self._decimate_ratio = scene.colmod_decimate_ratio
+        self._auto_fit = get_auto_fit(scene)
+        self._max_vertices = scene.colmod_max_hull_vertices
+        self._backend = scene.colmod_hull_backend
+        self._cache = get_hull_cache(scene)
+        self._names = UniqueNameIndex(bpy.data.objects.keys())
+        self._mode = 'individual'
+        self._created_collision_objects = []
+        self._mesh_digests = {}
+        self._computed_hulls = []
+        self._culled_points = 0
+
+    def _collect_sources(self, previous_mode):
+        """
+        Gather the local-space points to hull, once per mesh datablock.
+        
+        Whole objects are read from their evaluated meshes, so modifiers are
+        included. Objects sharing a mesh and without modifiers (linked duplicates)
+        form one source whose hull is computed once and instanced for each of
+        them. In Edit Mode, each connected island of selected faces on the
+        active object is a separate source.
+        
+        Returns:
+            List of (instances, points) where instances holds (name, matrix_world)
+            pairs, or None after reporting an error
+        """
+        # Get selected mesh objects
+        selected_objects = get_selected_mesh_objects()
+        
+        if not selected_objects:
+            self.report({'ERROR'}, "No mesh objects selected.")
+            return None
+        
+        active_obj = get_active_mesh_object()
+        sources = []
+        whole_objects = selected_objects
+        if previous_mode == 'EDIT_MESH':
+            self._mode = None  # Face selections cannot be regenerated
+            whole_objects = [obj for obj in selected_objects if obj != active_obj]
+            
+            if active_obj in selected_objects:
+                with object_scope(active_obj.name):
+                    islands = read_selected_face_islands(active_obj.data)
+                
+                if islands:
+                    # Every connected group of selected faces gets its own hull
+                    instance = (active_obj.name, active_obj.matrix_world.copy())
+                    sources.extend(([instance], points) for points in islands)
+                else:
+                    self.report({'WARNING'}, f"No faces selected in object: {active_obj.name}")
+        
+        whole_sources, removed = read_instanced_sources(whole_objects, mesh_digests=self._mesh_digests)
+        sources.extend(whole_sources)
+        self._culled_points += removed
+        
+        if not sources:
+            self.report({'ERROR'}, "No collision objects were created.")
+            return None
+        return sources
+
+    def _commit_cached(self, sources):
+        """
+        Create collision objects for every source whose hull is cached.
+        
+        Returns:
+            The remaining sources as (instances, points, cache_key)
+        """
+        misses = []
+        for instances, points in sources:
+            cache_key = None
+            if self._cache is not None:
+                cache_key = make_cache_key(
+                    [points],
+                    mode='individual',
+                    prefix="UCX_",
+                    decimate_ratio=round(self._decimate_ratio, 6),
+                    auto_fit=self._auto_fit,
+                    max_vertices=self._max_vertices,
+                    backend=self._backend,
+                )
+                mesh = load_cached_hull(self._cache, cache_key, instances[0][0])
+                if mesh is not None:
+                    self._instance_hull(mesh, instances)
+                    continue
+            misses.append((instances, points, cache_key))
+        return misses
+
+    def _create_hull(self, instances, cache_key, points, result=None):
+        """
+        Create a convex hull in mesh space and a collision object per instance.
+        
+        Args:
+            instances: (name, matrix_world) of each object sharing the source mesh
+            cache_key: Key to store the finished hull under, or None
+            points: Local-space points, used when no background result exists
+            result: Optional HullResult computed by the worker pool
+        """
+        # The mesh takes its final name from the first collision object
+        name = instances[0][0]
+        
+        with object_scope(name):
+            if result is None:
+                points, removed = prefilter_hull_points(points)
+                mesh = build_convex_hull_mesh(points, name)
+            elif result.vertices is None:
+                removed = result.removed
+                mesh = build_convex_hull_mesh(result.points, name)
+            else:
+                removed = result.removed
+                mesh = build_mesh_from_triangles(result.vertices, result.triangles, name)
+            
+            self._instance_hull(mesh, instances)
+        self._computed_hulls.append((cache_key, mesh))
+        self._culled_points += removed
+
+    def _instance_hull(self, mesh, instances):
+        """Link one collision object per instance, all sharing the hull mesh."""
+        for index, (source_name, matrix_world) in enumerate(instances):
+            name = self._names.allocate(source_name, "UCX_")
+            if index == 0:
+                mesh.name = name
+            collision_obj = create_collision_object(
+                name, mesh, matrix_world, self._mode, [source_name]
+            )
+            self._created_collision_objects.append(collision_obj)
+
+    def _finish(self):
+        """Decimate and simplify the newly computed hulls, cache them and report what was done."""
+        if not self._created_collision_objects:
+            self.report({'ERROR'}, "No collision objects were created.")
+            return
+        
+        # Simplify every new hull, decimating in one depsgraph evaluation; cached hulls already are
+        hull_meshes = [mesh for _key, mesh in self._computed_hulls]
+        if self._auto_fit is not None:
+            fit_hulls_to_error(hull_meshes, *self._auto_fit)
+        else:
+            apply_decimate(hull_meshes, self._decimate_ratio)
+        limit_hull_vertices(hull_meshes, self._max_vertices)
+        store_cached_hulls(self._cache, self._computed_hulls)
+        trim_hull_cache(self._cache)
+        stamp_collisions(self._created_collision_objects, self._mesh_digests)
+        
+        if self._culled_points:
+            self.report({'INFO'}, f"Culled {self._culled_points} interior points before hulling.")
+        report_cache_stats(self, self._cache)
 
 
 def register():
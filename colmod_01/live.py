@@ -0,0 +1,136 @@
+"""
+Live Collision Preview.
+Regenerates the collisions of edited source objects while Live Preview is on.
+Edits are collected by a depsgraph handler and applied by a debounced timer, so
+dragging a slider or an object only rebuilds once the artist pauses. Rebuilding
+goes through the stale collision refresh, limited to the edited sources.
+"""
+import time
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .refresh import find_generated_collisions, find_stale_groups, regenerate_collisions
+from .utils import is_collision_object
+from .fingerprint import GENERATOR_SETTINGS
+
+
+# Seconds without further edits before changed collisions are regenerated
+LIVE_DEBOUNCE = 0.3
+
+# Scene settings watched for changes; only collisions whose recorded settings differ are rebuilt
+LIVE_SETTINGS = tuple(dict.fromkeys(
+    name for settings in GENERATOR_SETTINGS.values() for name in settings
+))
+
+
+# Names of source objects edited since the last rebuild
+_changed_sources = set()
+
+# True when a setting changed, so every live collision is checked
+_settings_changed = False
+
+# Settings snapshot of the last depsgraph update
+_last_settings = None
+
+# time.monotonic() after which the pending edits are applied
+_deadline = 0.0
+
+# True while collisions are being regenerated, so their own updates are ignored
+_rebuilding = False
+
+
+def _read_settings(scene):
+    return tuple(getattr(scene, name) for name in LIVE_SETTINGS)
+
+
+def update_live_preview(self, context):
+    """Reset the pending edits when Live Preview is switched on or off."""
+    global _settings_changed, _last_settings
+    _changed_sources.clear()
+    _settings_changed = False
+    _last_settings = _read_settings(context.scene)
+
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    """Collect the source objects whose geometry or transform changed."""
+    global _settings_changed, _last_settings, _deadline
+    if _rebuilding or not getattr(scene, "colmod_live_update", False):
+        return
+    
+    settings = _read_settings(scene)
+    if settings != _last_settings:
+        _settings_changed = _last_settings is not None
+        _last_settings = settings
+    
+    for update in depsgraph.updates:
+        if not (update.is_updated_geometry or update.is_updated_transform):
+            continue
+        obj = update.id
+        if isinstance(obj, bpy.types.Object) and obj.type == 'MESH':
+            obj = obj.original
+            if not is_collision_object(obj):
+                _changed_sources.add(obj.name)
+    
+    if _changed_sources or _settings_changed:
+        # Every further edit pushes the rebuild back
+        _deadline = time.monotonic() + LIVE_DEBOUNCE
+        if not bpy.app.timers.is_registered(_apply_pending):
+            bpy.app.timers.register(_apply_pending, first_interval=LIVE_DEBOUNCE)
+
+
+def _apply_pending():
+    """Timer callback regenerating the collisions of the collected edits once edits pause."""
+    global _settings_changed, _rebuilding
+    remaining = _deadline - time.monotonic()
+    if remaining > 0.0:
+        return remaining
+    
+    context = bpy.context
+    scene = context.scene
+    if not scene.colmod_live_update:
+        _changed_sources.clear()
+        _settings_changed = False
+        return None
+    if context.mode != 'OBJECT':
+        return LIVE_DEBOUNCE  # Wait until the user leaves Edit Mode
+    
+    groups = find_generated_collisions(scene)
+    if not _settings_changed:
+        groups = {
+            key: collisions for key, collisions in groups.items()
+            if _changed_sources.intersection(key[1])
+        }
+    _changed_sources.clear()
+    _settings_changed = False
+    if not groups:
+        return None
+    
+    # Timers run without a window; operators need one for the active collection
+    override = {}
+    if context.window_manager.windows:
+        override["window"] = context.window_manager.windows[0]
+    _rebuilding = True
+    try:
+        # Fingerprints skip sources that were touched but did not change
+        groups, _orphaned = find_stale_groups(scene, groups)
+        if groups:
+            with context.temp_override(**override):
+                regenerate_collisions(bpy.context, groups)
+        # Evaluate now, so updates caused by the rebuild are not collected as edits
+        context.evaluated_depsgraph_get()
+    finally:
+        _rebuilding = False
+    return None
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+
+
+def unregister():
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
+    if bpy.app.timers.is_registered(_apply_pending):
+        bpy.app.timers.unregister(_apply_pending)
@@ -3,20 +3,91 @@ Mass Convex Hull Collision Generator.
 Creates a single convex hull around all selected objects or face groups.
 """
 import bpy
-import bmesh
+from mathutils import Matrix
 
 from .utils import (
     get_selected_mesh_objects,
     get_active_mesh_object,
     ensure_object_mode,
     restore_mode,
-    select_only_objects,
-    get_unique_name,
-    get_collision_material,
-    assign_material,
-    duplicate_object,
-    duplicate_objects,
+    get_auto_fit,
+    np,
 )
+from .mesh_io import (
+    read_selected_face_coords,
+    read_evaluated_hull_points,
+    concatenate_coords,
+    transform_coords,
+    prefilter_hull_points,
+)
+from .fingerprint import stamp_collisions
+from .builders import (
+    build_convex_hull_mesh,
+    apply_decimate,
+    limit_hull_vertices,
+    fit_hulls_to_error,
+    create_collision_object,
+)
+from .cache_io import (
+    get_hull_cache,
+    load_cached_hull,
+    store_cached_hulls,
+    trim_hull_cache,
+    report_cache_stats,
+)
+
+from .names import UniqueNameIndex
+from .profiling import profiled, object_scope, stage
+
+try:
+    from .hull_cache import make_key as make_cache_key
+    from .hull_jobs import merge_hull_candidates
+except ImportError:
+    # NumPy is missing: caching is off and points are hulled in one pass
+    make_cache_key = merge_hull_candidates = None
+
+
+def build_merged_hull(
+    coord_sets, name, matrix_world, backend, auto_fit, max_vertices, decimate_ratio=1.0,
+):
+    """
+    Hull several world-space point sets together and simplify the result.
+    
+    The sets (typically the hull candidates of one object each) are hulled
+    one by one and their hull vertices merged up a tree, hulling again at
+    every node (see merge_hull_candidates), so neither a joined
+    full-resolution mesh nor one huge point set is ever hulled. Only the
+    final hull is built by the chosen backend.
+    
+    Args:
+        coord_sets: World-space coordinate sets to merge
+        name: Name for the new mesh datablock
+        matrix_world: World matrix of the collision object; the hull is built in its space
+        backend: Hull backend, 'BMESH' or 'QUICKHULL'
+        auto_fit: Error bounds from get_auto_fit, or None
+        max_vertices: Hull vertex budget (0 = no limit)
+        decimate_ratio: Decimation applied to the hull when auto_fit is off
+    
+    Returns:
+        (mesh, culled_points)
+    """
+    inverse = matrix_world.inverted()
+    coord_sets = [transform_coords(coords, inverse) for coords in coord_sets]
+    
+    if merge_hull_candidates is not None:
+        # Merge the per-object hull vertices in a tree instead of hulling one huge point set
+        with stage("hull_merge", verts_in=sum(len(coords) for coords in coord_sets)) as timed:
+            points, removed = merge_hull_candidates(coord_sets)
+            timed.verts_out = len(points)
+    else:
+        points, removed = prefilter_hull_points(concatenate_coords(coord_sets))
+    mesh = build_convex_hull_mesh(points, name, backend)
+    if auto_fit is not None:
+        fit_hulls_to_error([mesh], *auto_fit)
+    else:
+        apply_decimate([mesh], decimate_ratio)
+    limit_hull_vertices([mesh], max_vertices)
+    return mesh, removed
 
 
 class MassHullModifierOperator(bpy.types.Operator):
@@ -30,129 +101,159 @@ class MassHullModifierOperator(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
     bl_description = "Create a single convex hull collision around all selected objects or faces"
 
+    @profiled
     def execute(self, context):
-        # Store original selection and mode
-        original_objects = set(bpy.context.selected_objects)
+        # Leaving Edit Mode syncs the face selection back to the mesh data
         previous_mode = ensure_object_mode()
         
         try:
-            decimate_ratio = context.scene.colmod_decimate_ratio
+            # Error-bounded simplification works on the full-resolution hull
+            auto_fit = get_auto_fit(context.scene)
+            decimate_ratio = 1.0 if auto_fit else context.scene.colmod_decimate_ratio
+            max_vertices = context.scene.colmod_max_hull_vertices
             
             # Get selected mesh objects
             selected_objects = get_selected_mesh_objects()
             
             if not selected_objects:
                 self.report({'ERROR'}, "No mesh objects selected.")
+                restore_mode(previous_mode)
                 return {'CANCELLED'}
             
             # Get the active object name for reference
             active_obj = get_active_mesh_object()
             reference_name = active_obj.name if active_obj else selected_objects[0].name
             
-            # Track all created collision objects (before joining)
-            created_objects = []
+            edit_mode = previous_mode == 'EDIT_MESH' and active_obj is not None
+            backend = context.scene.colmod_hull_backend
+            name = UniqueNameIndex(bpy.data.objects.keys()).allocate(reference_name, "UCX_")
             
-            if previous_mode == 'EDIT_MESH' and active_obj:
-                # Process selected faces from Edit Mode
-                bpy.ops.object.mode_set(mode='EDIT')
-                bm = bmesh.from_edit_mesh(active_obj.data)
-                
-                for obj in selected_objects:
-                    selected_verts = []
-                    
-                    if bm.faces:
-                        for face in bm.faces:
-                            if face.select:
-                                for vert in face.verts:
-                                    selected_verts.append(obj.matrix_world @ vert.co)
-                    
-                    if selected_verts:
-                        # Create hull from selected faces
-                        collision_obj = self._create_hull_from_vertices(
-                            obj, selected_verts
-                        )
-                        created_objects.append(collision_obj)
-                    else:
-                        self.report({'WARNING'}, f"No faces selected in object: {obj.name}")
-                
-                bm.free()
+            # The hull lives in the space of the first selected object
+            if edit_mode:
+                matrix_world = Matrix.Identity(4)
             else:
-                # Process entire objects
-                created_objects = duplicate_objects(selected_objects)
-            
-            if not created_objects:
-                self.report({'ERROR'}, "No collision objects were created.")
-                return {'CANCELLED'}
-            
-            # Apply decimation to each object before joining
-            for obj in created_objects:
-                decimate_mod = obj.modifiers.new(name="Decimate", type='DECIMATE')
-                decimate_mod.ratio = decimate_ratio
-                bpy.context.view_layer.objects.active = obj
-                bpy.ops.object.modifier_apply(modifier=decimate_mod.name)
+                matrix_world = selected_objects[0].matrix_world.copy()
             
-            # Join all decimated objects into one
-            select_only_objects(created_objects)
-            bpy.ops.object.join()
+            cache = get_hull_cache(context.scene)
+            # Object Mode sources are decimated while they are read, not as a hull
+            decimate_sources = decimate_ratio < 1.0 and not edit_mode
             
-            # Get the joined hull object
-            hull_object = bpy.context.active_object
-            
-            # Apply convex hull to the joined object
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.select_all(action='SELECT')
-            bpy.ops.mesh.convex_hull()
-            bpy.ops.object.mode_set(mode='OBJECT')
+            culled_points = 0
+            mesh_digests = {}
+            if edit_mode:
+                # Every object in multi-object Edit Mode contributes its own selected faces
+                source_objects, local_sets = self._read_selected_faces(selected_objects)
+                if not source_objects:
+                    self.report({'ERROR'}, "No faces selected in Edit Mode.")
+                    restore_mode(previous_mode)
+                    return {'CANCELLED'}
+            else:
+                source_objects = selected_objects
+                local_sets = None
+                if cache is not None or not decimate_sources:
+                    # Evaluated positions of whole objects, modifiers included, culled to hull candidates.
+                    # When decimating, they are only read to key the cache
+                    local_sets, culled_points = read_evaluated_hull_points(
+                        selected_objects, mesh_digests=mesh_digests
+                    )
             
-            # Rename with Unreal Engine convention
-            hull_object.name = get_unique_name(reference_name, "UCX_")
+            cache_key = None
+            mesh = None
+            if cache is not None:
+                cache_key = self._make_cache_key(
+                    source_objects, local_sets, edit_mode,
+                    decimate_ratio, auto_fit, max_vertices, backend,
+                )
+                mesh = load_cached_hull(cache, cache_key, name)
             
-            # Assign collision material
-            collision_material = get_collision_material()
-            assign_material(hull_object, collision_material)
+            if mesh is None:
+                if decimate_sources:
+                    coord_sets, culled_points = read_evaluated_hull_points(
+                        selected_objects, decimate_ratio,
+                        [obj.matrix_world for obj in selected_objects],
+                        mesh_digests,
+                    )
+                else:
+                    coord_sets = [
+                        transform_coords(points, obj.matrix_world)
+                        for points, obj in zip(local_sets, source_objects)
+                    ]
+                
+                if not coord_sets:
+                    self.report({'ERROR'}, "No collision objects were created.")
+                    restore_mode(previous_mode)
+                    return {'CANCELLED'}
+                
+                # Selected faces cannot be decimated as sources, so the hull is decimated instead
+                mesh, removed = build_merged_hull(
+                    coord_sets, name, matrix_world, backend, auto_fit, max_vertices,
+                    decimate_ratio if edit_mode else 1.0,
+                )
+                culled_points += removed
+                store_cached_hulls(cache, [(cache_key, mesh)])
+                trim_hull_cache(cache)
             
-            # Deselect the collision object
-            hull_object.select_set(False)
+            if edit_mode:
+                create_collision_object(name, mesh, matrix_world)
+            else:
+                stamp_collisions([create_collision_object(
+                    name, mesh, matrix_world, 'mass', [obj.name for obj in selected_objects]
+                )], mesh_digests)
             
-            # Restore original selection state
-            bpy.ops.object.select_all(action='DESELECT')
-            for obj in original_objects:
-                if obj.name in bpy.data.objects:
-                    obj.select_set(True)
+            if culled_points:
+                self.report({'INFO'}, f"Culled {culled_points} interior points before hulling.")
+            report_cache_stats(self, cache)
             
             # Restore mode
             restore_mode(previous_mode)
             
             return {'FINISHED'}
-            
+        
         except Exception as e:
             # Restore mode on error
             restore_mode(previous_mode)
             self.report({'ERROR'}, f"Failed to create mass hull: {str(e)}")
             return {'CANCELLED'}
 
-    def _create_hull_from_vertices(self, original_obj, vertices):
-        """Create a mesh object from selected vertices with convex hull."""
-        # Create a new mesh from the selected vertices
-        mesh = bpy.data.meshes.new(f"{original_obj.name}_selected_faces")
-        new_obj = bpy.data.objects.new(f"{original_obj.name}_selected_faces", mesh)
-        bpy.context.collection.objects.link(new_obj)
-        
-        # Build mesh from vertices
-        bm = bmesh.new()
-        for vert in vertices:
-            bm.verts.new(vert)
-        bm.verts.ensure_lookup_table()
-        bmesh.ops.convex_hull(bm, input=bm.verts)
-        bm.to_mesh(mesh)
-        bm.free()
+    def _make_cache_key(
+        self, source_objects, local_sets, edit_mode, decimate_ratio, auto_fit, max_vertices,
+        backend,
+    ):
+        """Hash the source hull points, transforms and settings of a mass hull."""
+        arrays = list(local_sets)
+        arrays += [np.array(obj.matrix_world, dtype=np.float32) for obj in source_objects]
+        return make_cache_key(
+            arrays,
+            mode='mass_edit' if edit_mode else 'mass',
+            prefix="UCX_",
+            decimate_ratio=round(decimate_ratio, 6),
+            auto_fit=auto_fit,
+            max_vertices=max_vertices,
+            backend=backend,
+        )
+
+    def _read_selected_faces(self, selected_objects):
+        """
+        Read the selected face vertices of every object, once per object.
         
-        # Reset transform
-        new_obj.location = (0, 0, 0)
-        new_obj.rotation_euler = (0, 0, 0)
-        new_obj.scale = (1, 1, 1)
+        Leaving Edit Mode synced the selection of all objects in multi-object
+        Edit Mode, so each mesh is read with vectorized foreach_get calls.
         
-        return new_obj
+        Returns:
+            (source_objects, local_sets) for the objects with selected faces
+        """
+        source_objects = []
+        local_sets = []
+        for obj in selected_objects:
+            with object_scope(obj.name):
+                points = read_selected_face_coords(obj.data)
+            
+            if len(points) == 0:
+                self.report({'WARNING'}, f"No faces selected in object: {obj.name}")
+                continue
+            source_objects.append(obj)
+            local_sets.append(points)
+        return source_objects, local_sets
 
 
 def register():
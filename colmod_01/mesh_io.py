@@ -0,0 +1,423 @@
+"""
+Mesh Reading.
+Bulk reads of vertex positions, selections and triangles from source and hull meshes,
+including evaluated sources with their modifiers, without copying any mesh.
+"""
+import bpy
+import hashlib
+import struct
+from mathutils import Vector
+
+from .profiling import instrumented, object_scope
+
+try:
+    import numpy as np
+    from . import geometry
+except ImportError:
+    np = None
+    geometry = None
+
+
+class CoordBuffer:
+    """Growable float32 scratch array reused across bulk position reads.
+    
+    Arrays returned by read() are views into the buffer and stay valid only
+    until the next read.
+    """
+
+    def __init__(self):
+        self._array = np.empty(0, dtype=np.float32)
+
+    def read(self, mesh):
+        """Read a mesh's vertex positions into the buffer as an (N, 3) view."""
+        size = len(mesh.vertices) * 3
+        if len(self._array) < size:
+            self._array = np.empty(size, dtype=np.float32)
+        coords = self._array[:size]
+        mesh.vertices.foreach_get("co", coords)
+        return coords.reshape(-1, 3)
+
+    def owns(self, array):
+        """Return True if an array may be a view into the buffer."""
+        return np.may_share_memory(array, self._array)
+
+
+@instrumented("read_coords", count_out=lambda coords, *a, **k: len(coords))
+def read_vertex_coords(mesh, matrix=None, selected_only=False, buffer=None):
+    """
+    Read vertex positions of a mesh into a NumPy array in one bulk call.
+    
+    Args:
+        mesh: The mesh datablock to read from
+        matrix: Optional 4x4 matrix applied to every coordinate
+        selected_only: Only return vertices whose select flag is set
+        buffer: Optional CoordBuffer to read into instead of a new array
+    
+    Returns:
+        A float32 array of shape (N, 3), or a list of Vectors without NumPy
+    """
+    if np is None:
+        vertices = [v for v in mesh.vertices if v.select] if selected_only else mesh.vertices
+        if matrix is None:
+            return [v.co.copy() for v in vertices]
+        return [matrix @ v.co for v in vertices]
+    
+    count = len(mesh.vertices)
+    if buffer is not None:
+        coords = buffer.read(mesh)
+    else:
+        coords = np.empty(count * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", coords)
+        coords.shape = (count, 3)
+    
+    if selected_only:
+        mask = np.empty(count, dtype=bool)
+        mesh.vertices.foreach_get("select", mask)
+        coords = coords[mask]
+    
+    if matrix is not None:
+        coords = transform_coords(coords, matrix)
+    return coords
+
+
+@instrumented("read_selection", count_out=lambda coords, *a, **k: len(coords))
+def read_selected_face_coords(mesh, matrix=None):
+    """
+    Read the positions of every vertex used by a selected face.
+    
+    The mesh must be out of Edit Mode so its selection flags are synced.
+    
+    Args:
+        mesh: The mesh datablock to read from
+        matrix: Optional 4x4 matrix applied to every coordinate
+    
+    Returns:
+        A float32 array of shape (N, 3), or a list of Vectors without NumPy
+    """
+    if np is None:
+        indices = sorted({i for poly in mesh.polygons if poly.select for i in poly.vertices})
+        if matrix is None:
+            return [mesh.vertices[i].co.copy() for i in indices]
+        return [matrix @ mesh.vertices[i].co for i in indices]
+    
+    poly_count = len(mesh.polygons)
+    selected = np.empty(poly_count, dtype=bool)
+    mesh.polygons.foreach_get("select", selected)
+    loop_totals = np.empty(poly_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    
+    # Polygons own contiguous loop ranges in order, so expand the face mask per loop
+    used = np.zeros(len(mesh.vertices), dtype=bool)
+    used[loop_verts[np.repeat(selected, loop_totals)]] = True
+    
+    coords = read_vertex_coords(mesh)[used]
+    if matrix is not None:
+        coords = transform_coords(coords, matrix)
+    return coords
+
+
+@instrumented(
+    "split_islands", count_out=lambda islands, *a, **k: sum(len(points) for points in islands)
+)
+def read_selected_face_islands(mesh):
+    """
+    Read the vertex positions of each connected island of selected faces.
+    
+    The mesh must be out of Edit Mode so its selection flags are synced.
+    Without NumPy all selected faces are returned as a single island.
+    
+    Returns:
+        List of coordinate sets, one per island
+    """
+    if geometry is None:
+        coords = read_selected_face_coords(mesh)
+        return [coords] if coords else []
+    
+    poly_count = len(mesh.polygons)
+    selected = np.empty(poly_count, dtype=bool)
+    mesh.polygons.foreach_get("select", selected)
+    loop_totals = np.empty(poly_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    
+    coords = read_vertex_coords(mesh)
+    islands = geometry.connected_vertex_groups(loop_totals, loop_verts, selected)
+    return [coords[vertices] for vertices in islands]
+
+
+def transform_coords(coords, matrix):
+    """Apply a 4x4 matrix to an (N, 3) coordinate array with one matrix multiply."""
+    if np is None:
+        return [matrix @ Vector(co) for co in coords]
+    matrix = np.array(matrix, dtype=np.float32)
+    return coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def concatenate_coords(coord_sets):
+    """Combine several coordinate sets into one."""
+    if np is None:
+        return [co for coords in coord_sets for co in coords]
+    if not coord_sets:
+        return np.empty((0, 3), dtype=np.float32)
+    return np.concatenate(coord_sets)
+
+
+@instrumented(
+    "prefilter",
+    count_in=lambda points: len(points),
+    count_out=lambda result, *a, **k: len(result[0]),
+)
+def prefilter_hull_points(points):
+    """
+    Cull points that cannot lie on the convex hull before running the hull kernel.
+    
+    Returns:
+        (points, removed_count); the points are returned unchanged without NumPy
+    """
+    if geometry is None or len(points) == 0:
+        return points, 0
+    return geometry.filter_interior_points(points)
+
+
+def evaluate_objects(objects, ratio=1.0):
+    """
+    Evaluate source objects through the depsgraph, modifiers included.
+    
+    Evaluated meshes come from to_mesh() and live outside bpy.data, sharing
+    unmodified data with the source. Below a ratio of 1.0, a collapse Decimate
+    is appended to temporary copies of the objects, which share the source
+    meshes, so it runs after the existing modifier stack.
+    
+    Yields:
+        (obj, evaluated_mesh) pairs; evaluated meshes are only valid inside the loop
+    """
+    temp_objects = []
+    try:
+        if ratio < 1.0:
+            collection = bpy.context.scene.collection
+            for obj in objects:
+                temp_obj = obj.copy()
+                decimate_mod = temp_obj.modifiers.new(name="Decimate", type='DECIMATE')
+                decimate_mod.ratio = ratio
+                collection.objects.link(temp_obj)
+                temp_objects.append(temp_obj)
+        
+        # One depsgraph update evaluates every object
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        for obj, source in zip(objects, temp_objects or objects):
+            evaluated_obj = source.evaluated_get(depsgraph)
+            evaluated_mesh = evaluated_obj.to_mesh()
+            try:
+                yield obj, evaluated_mesh
+            finally:
+                evaluated_obj.to_mesh_clear()
+    finally:
+        for temp_obj in temp_objects:
+            bpy.data.objects.remove(temp_obj)
+
+
+@instrumented(
+    "read_evaluated",
+    count_out=lambda result, *a, **k: sum(len(points) for points in result[0]),
+)
+def read_evaluated_hull_points(objects, ratio=1.0, matrices=None, mesh_digests=None):
+    """
+    Read hull candidate points from the evaluated meshes of objects.
+    
+    Only positions are read, into one reused scratch buffer, and points that
+    cannot lie on the convex hull are culled before anything is kept. Peak
+    memory follows the largest source and the hull points, not every mesh.
+    
+    Args:
+        objects: Mesh objects to read
+        ratio: Collapse Decimate ratio applied after the modifier stack
+        matrices: Optional 4x4 matrix per object applied to its points
+        mesh_digests: Optional dict receiving each object's evaluated mesh
+            digest by name, for stamp_collisions()
+    
+    Returns:
+        (point_sets, removed_count) with one point set per object, in order
+    """
+    if not objects:
+        return [], 0
+    
+    buffer = CoordBuffer() if np is not None else None
+    point_sets = []
+    removed = 0
+    for index, (obj, evaluated_mesh) in enumerate(evaluate_objects(objects, ratio)):
+        with object_scope(obj.name):
+            coords = read_vertex_coords(evaluated_mesh, buffer=buffer)
+            if mesh_digests is not None:
+                # A decimated read does not show the source, whose evaluation is already current
+                mesh_digests[obj.name] = (
+                    mesh_digest(evaluated_mesh, coords) if ratio >= 1.0 else _evaluated_mesh_digest(obj)
+                )
+            if matrices is not None:
+                coords = transform_coords(coords, matrices[index])
+            points, culled = prefilter_hull_points(coords)
+        if buffer is not None and buffer.owns(points):
+            points = points.copy()  # Nothing was culled, detach from the buffer
+        point_sets.append(points)
+        removed += culled
+    return point_sets, removed
+
+
+def mesh_digest(mesh, coords=None):
+    """Hash the vertex and face counts and the vertex positions of an evaluated mesh."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(struct.pack("<2q", len(mesh.vertices), len(mesh.polygons)))
+    if np is not None:
+        if coords is None:
+            coords = read_vertex_coords(mesh)
+        digest.update(memoryview(np.ascontiguousarray(coords, dtype=np.float32)).cast("B"))
+    else:
+        for vertex in mesh.vertices:
+            digest.update(struct.pack("<3f", *vertex.co))
+    return digest.digest()
+
+
+def _evaluated_mesh_digest(obj):
+    """Digest an object's evaluated mesh from the current depsgraph."""
+    evaluated_obj = obj.evaluated_get(bpy.context.evaluated_depsgraph_get())
+    try:
+        return mesh_digest(evaluated_obj.to_mesh())
+    finally:
+        evaluated_obj.to_mesh_clear()
+
+
+@instrumented("read_triangles", count_out=lambda corners, *a, **k: len(corners) * 3)
+def read_triangle_corners(mesh, selected_only=False):
+    """
+    Read the corner positions of a mesh's triangulated faces in bulk.
+    
+    Args:
+        mesh: The mesh datablock to read, out of Edit Mode
+        selected_only: Only return triangles of selected faces
+    
+    Returns:
+        A float32 array of shape (T, 3, 3)
+    """
+    mesh.calc_loop_triangles()
+    triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", triangles)
+    triangles = triangles.reshape(-1, 3)
+    
+    if selected_only:
+        selected = np.empty(len(mesh.polygons), dtype=bool)
+        mesh.polygons.foreach_get("select", selected)
+        polygon_indices = np.empty(len(mesh.loop_triangles), dtype=np.int32)
+        mesh.loop_triangles.foreach_get("polygon_index", polygon_indices)
+        triangles = triangles[selected[polygon_indices]]
+    return read_vertex_coords(mesh)[triangles]
+
+
+def read_evaluated_triangles(objects, mesh_digests=None):
+    """
+    Read the triangle corners of the evaluated meshes of objects, modifiers included.
+    
+    Args:
+        objects: Mesh objects to read
+        mesh_digests: Optional dict receiving each object's evaluated mesh
+            digest by name, for stamp_collisions()
+    
+    Returns:
+        One (T, 3, 3) array per object, in order
+    """
+    triangle_sets = []
+    for obj, evaluated_mesh in evaluate_objects(objects):
+        with object_scope(obj.name):
+            triangle_sets.append(read_triangle_corners(evaluated_mesh))
+            if mesh_digests is not None:
+                mesh_digests[obj.name] = mesh_digest(evaluated_mesh)
+    return triangle_sets
+
+
+def read_instanced_sources(objects, triangles=False, mesh_digests=None):
+    """
+    Read whole objects as collision sources, once per mesh they evaluate to.
+    
+    Objects sharing a mesh and without modifiers (linked duplicates) form one
+    source whose collision is computed once and instanced for each of them.
+    Every source is read in one depsgraph evaluation.
+    
+    Args:
+        objects: Mesh objects to read
+        triangles: Read triangle corners instead of hull candidate points
+        mesh_digests: Optional dict receiving the evaluated mesh digest of
+            every object by name, for stamp_collisions()
+    
+    Returns:
+        (sources, removed_count) where sources holds one (instances, data) pair
+        per source, instances being (name, matrix_world) pairs and data the
+        local-space points or triangles of the first of them
+    """
+    groups = {}
+    for obj in objects:
+        # Modifiers can make objects sharing a mesh evaluate differently
+        source_key = obj if obj.modifiers else obj.data
+        if source_key not in groups:
+            groups[source_key] = (obj, [])
+        groups[source_key][1].append((obj.name, obj.matrix_world.copy()))
+    
+    read_objects = [obj for obj, _instances in groups.values()]
+    if triangles:
+        data_sets, removed = read_evaluated_triangles(read_objects, mesh_digests), 0
+    else:
+        data_sets, removed = read_evaluated_hull_points(read_objects, mesh_digests=mesh_digests)
+    if mesh_digests is not None:
+        # Linked duplicates evaluate to the mesh of the object that was read
+        for obj, instances in groups.values():
+            for name, _matrix in instances:
+                mesh_digests[name] = mesh_digests[obj.name]
+    sources = [
+        (instances, data) for (_obj, instances), data in zip(groups.values(), data_sets)
+    ]
+    return sources, removed
+
+
+@instrumented("bounds", count_in=lambda objects: len(objects))
+def read_world_bounds(objects):
+    """
+    Read the world-space axis-aligned bounds of objects without touching their meshes.
+    
+    Uses each object's evaluated bounding box, so modifiers are included.
+    
+    Returns:
+        (lows, highs) as (N, 3) arrays
+    """
+    corners = np.array([[tuple(corner) for corner in obj.bound_box] for obj in objects], dtype=np.float64)
+    matrices = np.array([obj.matrix_world for obj in objects], dtype=np.float64).reshape(-1, 4, 4)
+    world = np.einsum("nij,nkj->nki", matrices[:, :3, :3], corners.reshape(-1, 8, 3))
+    world += matrices[:, None, :3, 3]
+    return world.min(axis=1), world.max(axis=1)
+
+
+def read_hull_triangles(mesh):
+    """
+    Read a hull mesh as vertex positions and triangles.
+    
+    Returns:
+        (coords, triangles) as float32 (N, 3) and int32 (F, 3) arrays
+    """
+    mesh.calc_loop_triangles()
+    triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", triangles)
+    return read_vertex_coords(mesh), triangles.reshape(-1, 3)
+
+
+def read_mesh_arrays(mesh):
+    """
+    Read a mesh's vertex positions and polygon loops in bulk.
+    
+    Returns:
+        (coords, loop_totals, loop_vertices) NumPy arrays
+    """
+    coords = read_vertex_coords(mesh)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    return coords, loop_totals, loop_vertices
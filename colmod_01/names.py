@@ -0,0 +1,37 @@
+"""
+Collision Name Allocation.
+Hands out unique {prefix}{base_name}_{counter:02d} names without rescanning the scene.
+Nothing here touches bpy; callers pass in the object names that already exist.
+"""
+
+
+class UniqueNameIndex:
+    """Allocates unique collision names in O(1) each.
+    
+    Existing object names are indexed once; afterwards the next free suffix is
+    tracked per prefix and base name. Create one per operator run, since
+    objects added or renamed elsewhere are not seen after construction.
+    """
+
+    def __init__(self, taken):
+        """
+        Args:
+            taken: Names already in use, usually bpy.data.objects.keys()
+        """
+        self._taken = set(taken)
+        self._next_counter = {}
+
+    def allocate(self, base_name, prefix):
+        """Reserve and return the next free name for a base name and prefix."""
+        key = (prefix, base_name)
+        counter = self._next_counter.get(key, 1)
+        
+        while True:
+            name = f"{prefix}{base_name}_{counter:02d}"
+            if name not in self._taken:
+                break
+            counter += 1
+        
+        self._taken.add(name)
+        self._next_counter[key] = counter + 1
+        return name
@@ -0,0 +1,199 @@
+"""
+Sphere and Capsule Collision Generator.
+Creates bounding spheres (USP_) and capsules (UCP_) around selected objects or vertices.
+"""
+import bpy
+from mathutils import Matrix, Vector
+
+from .utils import (
+    has_numpy,
+    get_selected_mesh_objects,
+    get_active_mesh_object,
+    ensure_object_mode,
+    restore_mode,
+)
+from .mesh_io import read_vertex_coords, read_evaluated_hull_points, prefilter_hull_points
+from .fingerprint import stamp_collisions
+from .builders import create_round_collisions
+from .names import UniqueNameIndex
+from .profiling import profiled, object_scope, instrumented
+
+try:
+    from . import geometry
+except ImportError:
+    geometry = None  # NumPy is missing, the operators report an error
+
+
+@instrumented("sphere_fit", count_in=lambda points: len(points))
+def fit_bounding_sphere(points):
+    """
+    Fit a bounding sphere around world-space points.
+    
+    Returns:
+        (matrix_world, radius, half_length): a translation to the centre, the
+        radius, and 0 so spheres share the capsule shape
+    """
+    center, radius = geometry.enclosing_ball(points)
+    return Matrix.Translation(Vector(center)), radius, 0.0
+
+
+@instrumented("capsule_fit", count_in=lambda points: len(points))
+def fit_bounding_capsule(points):
+    """
+    Fit a bounding capsule around world-space points.
+    
+    Returns:
+        (matrix_world, radius, half_length): a rotation taking local Z to the
+        capsule axis plus a translation to its centre, the radius, and half
+        the distance between the cap centres
+    """
+    center, axis, half_length, radius = geometry.bounding_capsule(points)
+    matrix_world = Vector(axis).to_track_quat('Z', 'Y').to_matrix().to_4x4()
+    matrix_world.translation = Vector(center)
+    return matrix_world, radius, half_length
+
+
+class _RoundCollisionOperator(bpy.types.Operator):
+    """Shared execute for operators fitting one rounded primitive per source.
+    
+    Subclasses set `prefix`, `mode` and `fit`, a function of world-space points
+    returning (matrix_world, radius, half_length).
+    """
+    bl_options = {'REGISTER', 'UNDO'}
+    prefix = ""
+    mode = None
+
+    @profiled
+    def execute(self, context):
+        if not has_numpy():
+            self.report({'ERROR'}, f"{self.bl_label} needs NumPy.")
+            return {'CANCELLED'}
+        
+        previous_mode = ensure_object_mode()
+        
+        try:
+            self._mesh_digests = {}
+            sources = self._collect_sources(previous_mode)
+            if sources is None:
+                restore_mode(previous_mode)
+                return {'CANCELLED'}
+            
+            names = UniqueNameIndex(bpy.data.objects.keys())
+            mode = None if previous_mode == 'EDIT_MESH' else self.mode
+            collision_names, source_names, matrices, shapes = [], [], [], []
+            for obj, points in sources:
+                if len(points) == 0:
+                    continue  # Objects without vertices have no bounds
+                with object_scope(obj.name):
+                    matrix_world, radius, half_length = self.fit(points)
+                collision_names.append(names.allocate(obj.name, self.prefix))
+                source_names.append([obj.name])
+                matrices.append(matrix_world)
+                shapes.append((radius, half_length))
+            
+            if not collision_names:
+                self.report({'ERROR'}, "No collision objects were created.")
+                restore_mode(previous_mode)
+                return {'CANCELLED'}
+            
+            stamp_collisions(
+                create_round_collisions(collision_names, matrices, shapes, mode, source_names),
+                self._mesh_digests,
+            )
+            
+            # Restore mode
+            restore_mode(previous_mode)
+            
+            return {'FINISHED'}
+        
+        except Exception as e:
+            # Restore mode on error
+            restore_mode(previous_mode)
+            self.report({'ERROR'}, f"Failed to create {self.prefix} collision: {str(e)}")
+            return {'CANCELLED'}
+
+    def _collect_sources(self, previous_mode):
+        """
+        Gather the world-space points to fit, one set per collision.
+        
+        In Edit Mode the selected vertices of the active object form one set.
+        Otherwise every selected object is read from its evaluated mesh, so
+        modifiers are included. Points are fitted in world space, so object
+        scale cannot squash a sphere into an ellipsoid.
+        
+        Returns:
+            List of (obj, points), or None after reporting an error
+        """
+        selected_objects = get_selected_mesh_objects()
+        
+        if not selected_objects:
+            self.report({'ERROR'}, "No mesh objects selected.")
+            return None
+        
+        active_obj = get_active_mesh_object()
+        if previous_mode == 'EDIT_MESH' and active_obj:
+            # Leaving Edit Mode synced the selection flags back to the mesh
+            coords = read_vertex_coords(
+                active_obj.data, active_obj.matrix_world, selected_only=True
+            )
+            if len(coords) == 0:
+                self.report({'ERROR'}, "No vertices selected in Edit Mode.")
+                return None
+            return [(active_obj, prefilter_hull_points(coords)[0])]
+        
+        point_sets, _removed = read_evaluated_hull_points(
+            selected_objects, matrices=[obj.matrix_world for obj in selected_objects],
+            mesh_digests=self._mesh_digests,
+        )
+        return list(zip(selected_objects, point_sets))
+
+
+class BoundingSphereModifierOperator(_RoundCollisionOperator):
+    """Create a bounding sphere collision around each selected object or the selected vertices.
+    
+    Works in both Object Mode (one sphere per selected object) and Edit Mode
+    (one sphere around the selected vertices).
+    Original meshes are never modified - only new collision objects are created.
+    """
+    bl_idname = "colmod_01.create_bounding_sphere"
+    bl_label = "Create Sphere Collision"
+    bl_description = "Create a bounding sphere collision around each selected object or the selected vertices"
+    prefix = "USP_"
+    mode = 'sphere'
+    fit = staticmethod(fit_bounding_sphere)
+
+
+class BoundingCapsuleModifierOperator(_RoundCollisionOperator):
+    """Create a bounding capsule collision around each selected object or the selected vertices.
+    
+    The capsule runs along the principal axis of the geometry. Works in both
+    Object Mode (one capsule per selected object) and Edit Mode (one capsule
+    around the selected vertices).
+    Original meshes are never modified - only new collision objects are created.
+    """
+    bl_idname = "colmod_01.create_bounding_capsule"
+    bl_label = "Create Capsule Collision"
+    bl_description = "Create a bounding capsule collision around each selected object or the selected vertices"
+    prefix = "UCP_"
+    mode = 'capsule'
+    fit = staticmethod(fit_bounding_capsule)
+
+
+classes = (
+    BoundingSphereModifierOperator,
+    BoundingCapsuleModifierOperator,
+)
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+
+
+if __name__ == "__main__":
+    register()
@@ -0,0 +1,249 @@
+"""
+Stage Timing Instrumentation.
+Records wall time and vertex counts per pipeline stage and per object while an operator runs.
+When profiling is off every hook is a single global check, so instrumented code pays nothing.
+"""
+import functools
+import json
+import time
+from collections import OrderedDict
+
+import bpy
+
+
+# Recorder of the operator run in progress, or None when profiling is off
+_active = None
+
+# Summary lines of the most recent profiled run, shown in the COLMOD panel
+last_summary = []
+
+# StageRecorder of the most recent profiled run, read by the benchmark suite
+last_run = None
+
+
+class StageRecorder:
+    """Collects stage records for one operator run.
+    
+    Stage times are inclusive: a stage that calls another instrumented stage
+    also contains that stage's time.
+    """
+
+    def __init__(self, operator_name):
+        self.operator_name = operator_name
+        self.records = []
+        self._objects = []
+        self._start = time.perf_counter()
+        self.total_seconds = 0.0
+
+    @property
+    def current_object(self):
+        """Name of the innermost object being processed, if any."""
+        return self._objects[-1] if self._objects else None
+
+    def add(self, stage, seconds, verts_in=None, verts_out=None):
+        """Append one stage record, tagged with the current object."""
+        self.records.append({
+            "stage": stage,
+            "object": self.current_object,
+            "seconds": seconds,
+            "verts_in": verts_in,
+            "verts_out": verts_out,
+        })
+
+    def stop(self):
+        """Freeze the total wall time of the run."""
+        self.total_seconds = time.perf_counter() - self._start
+
+    def stage_totals(self):
+        """
+        Aggregate the records per stage, in first-seen order.
+        
+        Returns:
+            OrderedDict of stage -> {calls, seconds, verts_in, verts_out}
+        """
+        totals = OrderedDict()
+        for record in self.records:
+            stage = totals.setdefault(
+                record["stage"], {"calls": 0, "seconds": 0.0, "verts_in": 0, "verts_out": 0}
+            )
+            stage["calls"] += 1
+            stage["seconds"] += record["seconds"]
+            stage["verts_in"] += record["verts_in"] or 0
+            stage["verts_out"] += record["verts_out"] or 0
+        return totals
+
+    def summary_lines(self):
+        """Human-readable per-stage summary, slowest stages first."""
+        totals = self.stage_totals()
+        lines = [f"Total {self.total_seconds:.3f}s"]
+        for stage, data in sorted(totals.items(), key=lambda item: -item[1]["seconds"]):
+            line = f"{stage}: {data['seconds']:.3f}s x{data['calls']}"
+            if data["verts_in"] or data["verts_out"]:
+                line += f" ({data['verts_in']} -> {data['verts_out']} verts)"
+            lines.append(line)
+        return lines
+
+    def to_json(self, filepath=""):
+        """Serialise the run as one JSON line for regression tracking."""
+        return json.dumps({
+            "timestamp": time.time(),
+            "operator": self.operator_name,
+            "file": filepath,
+            "total_seconds": self.total_seconds,
+            "stages": self.stage_totals(),
+            "records": self.records,
+        })
+
+
+class _Stage:
+    """Context manager timing one stage; set verts_out before leaving it."""
+    
+    __slots__ = ("recorder", "name", "verts_in", "verts_out", "_start")
+
+    def __init__(self, recorder, name, verts_in):
+        self.recorder = recorder
+        self.name = name
+        self.verts_in = verts_in
+        self.verts_out = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder.add(
+            self.name, time.perf_counter() - self._start, self.verts_in, self.verts_out
+        )
+        return False
+
+
+class _NullStage:
+    """Shared do-nothing stand-in for _Stage and object scopes."""
+    
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __setattr__(self, name, value):
+        pass  # Ignore verts_out assignments
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _ObjectScope:
+    """Context manager tagging nested records with an object name."""
+    
+    __slots__ = ("recorder", "name")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.recorder._objects.append(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder._objects.pop()
+        return False
+
+
+def stage(name, verts_in=None):
+    """
+    Time a block of code as a named stage.
+    
+    Usage:
+        with stage("hull", verts_in=len(points)) as timed:
+            mesh = ...
+            timed.verts_out = len(mesh.vertices)
+    """
+    if _active is None:
+        return _NULL_STAGE
+    return _Stage(_active, name, verts_in)
+
+
+def object_scope(name):
+    """Attribute every stage recorded inside the block to an object."""
+    if _active is None:
+        return _NULL_STAGE
+    return _ObjectScope(_active, name)
+
+
+def instrumented(name, count_in=None, count_out=None):
+    """
+    Decorate a function so each call is recorded as a stage.
+    
+    Args:
+        name: Stage name
+        count_in: Optional callable (*args, **kwargs) -> input vertex count
+        count_out: Optional callable (result, *args, **kwargs) -> output vertex count
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _active
+            if recorder is None:
+                return func(*args, **kwargs)
+            verts_in = count_in(*args, **kwargs) if count_in else None
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            seconds = time.perf_counter() - start
+            verts_out = count_out(result, *args, **kwargs) if count_out else None
+            recorder.add(name, seconds, verts_in, verts_out)
+            return result
+        return wrapper
+    return decorator
+
+
+def profiled(method):
+    """
+    Decorate an operator's execute/invoke/modal to profile the whole run.
+    
+    Recording starts when the scene's colmod_profile setting is on. A run that
+    goes modal keeps its recorder on the operator until it finishes, then the
+    summary is reported, kept for the panel and optionally appended to a log.
+    """
+    @functools.wraps(method)
+    def wrapper(operator, context, *args):
+        global _active
+        if _active is not None:
+            return method(operator, context, *args)  # Nested call within a profiled run
+        
+        recorder = getattr(operator, "_recorder", None)
+        if recorder is None:
+            if not context.scene.colmod_profile:
+                return method(operator, context, *args)
+            recorder = StageRecorder(operator.bl_idname)
+        
+        _active = recorder
+        try:
+            result = method(operator, context, *args)
+        finally:
+            _active = None
+        
+        if 'FINISHED' in result or 'CANCELLED' in result:
+            operator._recorder = None
+            _finish_run(recorder, operator, context)
+        else:
+            operator._recorder = recorder
+        return result
+    return wrapper
+
+
+def _finish_run(recorder, operator, context):
+    """Report a finished run and append it to the log file if one is set."""
+    global last_summary, last_run
+    recorder.stop()
+    last_run = recorder
+    last_summary = recorder.summary_lines()
+    operator.report({'INFO'}, "Timing: " + "; ".join(last_summary))
+    
+    log_path = context.scene.colmod_profile_log
+    if log_path:
+        with open(bpy.path.abspath(log_path), "a") as log_file:
+            log_file.write(recorder.to_json(context.blend_data.filepath) + "\n")
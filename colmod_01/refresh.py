@@ -0,0 +1,247 @@
+"""
+Stale Collision Refresh.
+Finds generated collisions whose source geometry or generator settings changed and rebuilds only those.
+"""
+import bpy
+
+from .batch import MODE_OPERATORS
+from .utils import ensure_object_mode, restore_mode, is_collision_object
+from .fingerprint import (
+    MODE_PROPERTY,
+    SOURCES_PROPERTY,
+    PARAMS_PROPERTY,
+    FINGERPRINT_PROPERTY,
+    read_source_fingerprints,
+    combine_fingerprints,
+    generator_params,
+)
+from .names import UniqueNameIndex
+from .profiling import profiled
+
+
+# Modes making independent collisions per source, so their sources share one operator run
+PER_OBJECT_MODES = ('individual', 'kdop', 'decompose', 'sphere', 'capsule')
+
+
+def find_generated_collisions(scene):
+    """
+    Group the scene's regenerable collisions by the operator run that made them.
+    
+    Returns:
+        Dict mapping (mode, source_names) to the collision objects of that run
+    """
+    groups = {}
+    for obj in scene.objects:
+        mode = obj.get(MODE_PROPERTY)
+        if mode in MODE_OPERATORS and is_collision_object(obj):
+            key = (mode, tuple(obj.get(SOURCES_PROPERTY, ())))
+            groups.setdefault(key, []).append(obj)
+    return groups
+
+
+def find_stale_groups(scene, groups):
+    """
+    Select the groups whose source fingerprint or generator settings changed.
+    
+    Groups with a deleted or renamed source cannot be rebuilt and are left out.
+    
+    Args:
+        scene: Scene holding the current generator settings
+        groups: Dict from find_generated_collisions
+    
+    Returns:
+        (stale_groups, orphaned_count)
+    """
+    sources = {}
+    orphaned = 0
+    buildable = {}
+    for key, collisions in groups.items():
+        objects = [scene.objects.get(name) for name in key[1]]
+        if not objects or any(obj is None or obj.type != 'MESH' for obj in objects):
+            orphaned += 1
+            continue
+        buildable[key] = collisions
+        sources.update((obj.name, obj) for obj in objects)
+    
+    # Every source is evaluated once, however many collisions it has
+    fingerprints = read_source_fingerprints(list(sources.values()))
+    params = {}
+    stale = {}
+    for key, collisions in buildable.items():
+        mode, source_names = key
+        if mode not in params:
+            params[mode] = generator_params(scene, mode)
+        fingerprint = combine_fingerprints(fingerprints, source_names)
+        if any(
+            obj.get(PARAMS_PROPERTY) != params[mode] or obj.get(FINGERPRINT_PROPERTY) != fingerprint
+            for obj in collisions
+        ):
+            stale[key] = collisions
+    return stale, orphaned
+
+
+def regenerate_collisions(context, groups):
+    """
+    Replace collision groups in place by running their generators again.
+    
+    Per-object modes rebuild all their sources in one operator run, so
+    individual hulls still use the worker pool and the hull cache. Each new
+    collision takes over the name of an old one from the same sources and
+    mode, so exported names stay stable; extra parts get fresh names.
+    The old collisions of a run are only deleted once its generator has
+    finished; a cancelled run leaves them untouched.
+    
+    Args:
+        context: The current context, in Object Mode
+        groups: Dict from find_generated_collisions, limited to the groups to rebuild
+    
+    Returns:
+        Number of groups whose generator failed and whose collisions were kept
+    """
+    scene = context.scene
+    runs = []
+    per_object = {}
+    old_names = {}
+    for key, collisions in groups.items():
+        mode, source_names = key
+        old_names[key] = sorted(obj.name for obj in collisions)
+        sources = [scene.objects[name] for name in source_names]
+        if mode in PER_OBJECT_MODES:
+            run_sources, run_keys = per_object.setdefault(mode, ({}, []))
+            run_sources.update(dict.fromkeys(sources))
+            run_keys.append(key)
+        else:
+            runs.append((mode, sources, [key]))
+    runs.extend((mode, list(sources), keys) for mode, (sources, keys) in per_object.items())
+    
+    view_layer = context.view_layer
+    selected = {obj for obj in view_layer.objects if obj.select_get()}
+    active = view_layer.objects.active
+    created = {}
+    failed = 0
+    try:
+        for mode, sources, keys in runs:
+            for obj in view_layer.objects:
+                obj.select_set(False)
+            for obj in sources:
+                obj.select_set(True)
+            view_layer.objects.active = sources[0]
+            
+            existing = set(bpy.data.objects)
+            result = getattr(bpy.ops.colmod_01, MODE_OPERATORS[mode])()
+            new_objects = [obj for obj in bpy.data.objects if obj not in existing]
+            if 'FINISHED' not in result:
+                # Drop any partial output and keep the collisions that were there
+                _remove_objects(new_objects)
+                failed += len(keys)
+                continue
+            
+            _remove_objects([obj for key in keys for obj in groups[key]])
+            for obj in new_objects:
+                if MODE_PROPERTY in obj:
+                    key = (obj[MODE_PROPERTY], tuple(obj[SOURCES_PROPERTY]))
+                    created.setdefault(key, []).append(obj)
+    finally:
+        for obj in view_layer.objects:
+            obj.select_set(obj in selected)
+        view_layer.objects.active = active
+    
+    _restore_names(created, old_names)
+    return failed
+
+
+def _remove_objects(objects):
+    """Delete objects together with the meshes they leave without users."""
+    for obj in objects:
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def _restore_names(created, old_names):
+    """Rename new collisions to the names of the collisions they replace."""
+    renames = []
+    extras = []
+    for key, objects in created.items():
+        objects.sort(key=lambda obj: obj.name)
+        names = old_names.get(key, [])
+        renames.extend(zip(objects, names))
+        extras.extend((key[1][0], obj.name[:4], obj) for obj in objects[len(names):])
+    
+    # Park every new collision on a temporary name first, so no final name is taken
+    parked = [obj for obj, _name in renames] + [obj for _base, _prefix, obj in extras]
+    for index, obj in enumerate(parked):
+        obj.name = f"COLMOD_RENAME_{index}"
+    
+    for obj, name in renames:
+        obj.name = name
+        if obj.data.users == 1:
+            obj.data.name = name
+    names = UniqueNameIndex(bpy.data.objects.keys())
+    for base_name, prefix, obj in extras:
+        obj.name = names.allocate(base_name, prefix)
+        if obj.data.users == 1:
+            obj.data.name = obj.name
+
+
+def refresh_stale_collisions(context):
+    """
+    Rebuild every generated collision whose sources or settings changed.
+    
+    Returns:
+        (refreshed_groups, total_groups, orphaned_groups, failed_groups)
+    """
+    groups = find_generated_collisions(context.scene)
+    stale, orphaned = find_stale_groups(context.scene, groups)
+    failed = regenerate_collisions(context, stale) if stale else 0
+    return len(stale) - failed, len(groups), orphaned, failed
+
+
+class RefreshStaleCollisionsOperator(bpy.types.Operator):
+    """Rebuild only the collisions whose source geometry or generator settings changed.
+    
+    Every collision made from whole objects records its mode, sources,
+    settings and a fingerprint of the evaluated source geometry. Collisions
+    whose record no longer matches are rebuilt in place and keep their names.
+    """
+    bl_idname = "colmod_01.refresh_stale_collisions"
+    bl_label = "Refresh Stale Collisions"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_description = "Rebuild the collisions whose source geometry or settings changed since they were made"
+
+    @profiled
+    def execute(self, context):
+        previous_mode = ensure_object_mode()
+        
+        try:
+            refreshed, total, orphaned, failed = refresh_stale_collisions(context)
+            
+            if orphaned:
+                self.report({'WARNING'}, f"{orphaned} collision groups have missing sources and were kept.")
+            if failed:
+                self.report({'WARNING'}, f"{failed} collision groups could not be rebuilt and were kept.")
+            self.report({'INFO'}, f"Refreshed {refreshed} of {total} collision groups.")
+            
+            # Restore mode
+            restore_mode(previous_mode)
+            
+            return {'FINISHED'}
+        
+        except Exception as e:
+            # Restore mode on error
+            restore_mode(previous_mode)
+            self.report({'ERROR'}, f"Failed to refresh collisions: {str(e)}")
+            return {'CANCELLED'}
+
+
+def register():
+    bpy.utils.register_class(RefreshStaleCollisionsOperator)
+
+
+def unregister():
+    bpy.utils.unregister_class(RefreshStaleCollisionsOperator)
+
+
+if __name__ == "__main__":
+    register()
@@ -5,12 +5,24 @@ Handles material management, naming conventions, and common operations.
 import bpy
 import os
 
+from .profiling import instrumented
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Unreal Engine collision prefixes produced by the addon
+COLLISION_PREFIXES = ("UCX_", "UBX_", "USP_", "UCP_")
+
 
 def get_addon_path():
     """Get the path to the addon directory."""
     return os.path.dirname(os.path.abspath(__file__))
 
 
+@instrumented("collision_material")
 def get_collision_material():
     """
     Get or create the collision material.
@@ -78,63 +90,21 @@ def assign_material(obj, material):
         obj.data.materials.append(material)
 
 
-def get_unique_name(base_name, prefix):
-    """
-    Generate a unique name for collision objects.
-    
-    Args:
-        base_name: The original object name to base the collision name on
-        prefix: The collision prefix (e.g., 'UCX_' for convex, 'UBX_' for box)
-    
-    Returns:
-        A unique name with incrementing suffix
-    """
-    existing_names = {obj.name for obj in bpy.data.objects}
-    counter = 1
-    
-    while True:
-        name = f"{prefix}{base_name}_{counter:02d}"
-        if name not in existing_names:
-            return name
-        counter += 1
-
-
-def duplicate_object(obj, name_suffix="_copy"):
-    """
-    Create a duplicate of an object without modifying the original.
-    
-    Args:
-        obj: The object to duplicate
-        name_suffix: Suffix to append to the duplicate name
-    
-    Returns:
-        The new duplicated object
-    """
-    mesh = obj.data.copy()
-    new_obj = bpy.data.objects.new(f"{obj.name}{name_suffix}", mesh)
-    new_obj.location = obj.location
-    new_obj.rotation_euler = obj.rotation_euler
-    new_obj.scale = obj.scale
-    new_obj.matrix_world = obj.matrix_world
-    bpy.context.collection.objects.link(new_obj)
-    return new_obj
+def has_numpy():
+    """Return True when NumPy is available for the bulk array code paths."""
+    return np is not None
 
 
-def duplicate_objects(objects):
+def get_auto_fit(scene):
     """
-    Duplicate multiple objects.
-    
-    Args:
-        objects: List of objects to duplicate
+    Return the error bounds of automatic simplification.
     
     Returns:
-        List of duplicated objects
+        (max_deviation, min_volume_ratio), or None when the fixed Decimate ratio is used
     """
-    new_objects = []
-    for obj in objects:
-        new_obj = duplicate_object(obj)
-        new_objects.append(new_obj)
-    return new_objects
+    if scene.colmod_decimate_mode != 'AUTO':
+        return None
+    return (scene.colmod_max_deviation, scene.colmod_min_volume_ratio)
 
 
 def ensure_object_mode():
@@ -148,12 +118,19 @@ def ensure_object_mode():
 def restore_mode(previous_mode):
     """Restore the previous mode if we changed it."""
     if previous_mode != 'OBJECT':
+        # context.mode reports e.g. 'EDIT_MESH', mode_set expects 'EDIT'
+        mode = 'EDIT' if previous_mode.startswith('EDIT') else previous_mode
         try:
-            bpy.ops.object.mode_set(mode=previous_mode)
-        except RuntimeError:
+            bpy.ops.object.mode_set(mode=mode)
+        except (RuntimeError, TypeError):
             pass  # Mode might not be available
 
 
+def is_collision_object(obj):
+    """Return True if an object is a collision mesh generated by COLMOD."""
+    return obj.name.startswith(COLLISION_PREFIXES)
+
+
 def get_selected_mesh_objects():
     """Get all selected mesh objects in the current context."""
     return [obj for obj in bpy.context.selected_objects if obj.type == 'MESH']
@@ -165,18 +142,3 @@ def get_active_mesh_object():
     if active_obj and active_obj.type == 'MESH':
         return active_obj
     return None
-
-
-def select_only_objects(objects):
-    """Select only the specified objects, deselecting everything else."""
-    bpy.ops.object.select_all(action='DESELECT')
-    for obj in objects:
-        obj.select_set(True)
-    if objects:
-        bpy.context.view_layer.objects.active = objects[0]
-
-
-def apply_transforms(obj):
-    """Apply location, rotation, and scale transforms to an object."""
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
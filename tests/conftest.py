@@ -0,0 +1,16 @@
+"""
+Shared setup for the bpy-free tests.
+The add-on package is registered without running its __init__, which imports
+bpy, so modules that never touch bpy can be imported as colmod_01.<module>.
+"""
+import importlib.util
+import sys
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1] / "colmod_01"
+
+if "colmod_01" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "colmod_01", PACKAGE_DIR / "__init__.py", submodule_search_locations=[str(PACKAGE_DIR)]
+    )
+    sys.modules["colmod_01"] = importlib.util.module_from_spec(_spec)
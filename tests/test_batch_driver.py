@@ -0,0 +1,46 @@
+"""
+Tests for the plain-Python parts of colmod_01/batch_driver.py.
+"""
+import json
+
+from colmod_01 import batch_driver
+
+
+def test_split_files_deals_round_robin():
+    files = [f"{index}.blend" for index in range(7)]
+    chunks = batch_driver.split_files(files, 3)
+
+    assert chunks == [["0.blend", "3.blend", "6.blend"], ["1.blend", "4.blend"], ["2.blend", "5.blend"]]
+
+
+def test_split_files_drops_empty_chunks():
+    assert batch_driver.split_files(["a.blend", "b.blend"], 8) == [["a.blend"], ["b.blend"]]
+    assert batch_driver.split_files([], 4) == []
+
+
+def test_find_blend_files_walks_directories(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for name in ("b.blend", "a.blend", "notes.txt", "sub/c.blend"):
+        (tmp_path / name).write_text("")
+
+    found = batch_driver.find_blend_files([str(tmp_path)])
+    assert found == sorted(str(tmp_path / name) for name in ("a.blend", "b.blend", "sub/c.blend"))
+
+
+def test_collect_results_keeps_reported_files(tmp_path):
+    report = tmp_path / "worker_00.json"
+    report.write_text(json.dumps([{"file": "a.blend", "status": "ok"}]))
+
+    results = batch_driver.collect_results(["a.blend", "b.blend"], str(report), 1, "worker_00.log")
+    assert results[0] == {"file": "a.blend", "status": "ok"}
+    assert results[1]["file"] == "b.blend"
+    assert results[1]["status"] == "failed"
+    assert "worker_00.log" in results[1]["error"]
+
+
+def test_collect_results_fails_every_file_without_a_report(tmp_path):
+    results = batch_driver.collect_results(
+        ["a.blend", "b.blend"], str(tmp_path / "missing.json"), -9, "worker_01.log"
+    )
+    assert [result["status"] for result in results] == ["failed", "failed"]
+    assert all("code -9" in result["error"] for result in results)
@@ -0,0 +1,46 @@
+"""
+Tests for the baseline comparison in colmod_01/benchmark_compare.py.
+"""
+from colmod_01.benchmark_compare import compare_results, flatten_metrics
+
+
+def make_results(timings):
+    """Build a results dictionary from {(case, mode): (seconds, {stage: seconds})}."""
+    cases = {}
+    for (case, mode), (seconds, stages) in timings.items():
+        cases.setdefault(case, {"modes": {}})["modes"][mode] = {"seconds": seconds, "stages": stages}
+    return {"cases": cases}
+
+
+def test_flatten_metrics_names_modes_and_stages():
+    results = make_results({("sphere_1000", "mass"): (0.5, {"hull": 0.3, "read_evaluated": 0.1})})
+
+    assert flatten_metrics(results) == {
+        "sphere_1000/mass": 0.5,
+        "sphere_1000/mass/hull": 0.3,
+        "sphere_1000/mass/read_evaluated": 0.1,
+    }
+
+
+def test_compare_results_flags_slowdowns_beyond_threshold_worst_first():
+    baseline = make_results({
+        ("sphere", "mass"): (1.0, {"hull": 0.5}),
+        ("blob", "individual"): (2.0, {}),
+        ("objects", "box"): (1.0, {}),
+    })
+    current = make_results({
+        ("sphere", "mass"): (1.05, {"hull": 1.0}),
+        ("blob", "individual"): (3.0, {}),
+        ("objects", "box"): (0.5, {}),
+    })
+
+    regressions = compare_results(baseline, current, threshold=0.1)
+    assert regressions == [("sphere/mass/hull", 0.5, 1.0), ("blob/individual", 2.0, 3.0)]
+
+
+def test_compare_results_ignores_new_metrics_and_tiny_slowdowns():
+    baseline = make_results({("sphere", "mass"): (0.001, {})})
+    current = make_results({("sphere", "mass"): (0.004, {}), ("sphere", "kdop"): (9.0, {})})
+
+    assert compare_results(baseline, current, threshold=0.1) == [("sphere/mass", 0.001, 0.004)]
+    assert compare_results(baseline, current, threshold=0.1, min_seconds=0.01) == []
@@ -0,0 +1,375 @@
+"""
+Tests for the pure NumPy kernels in colmod_01/geometry.py.
+"""
+import heapq
+
+import numpy as np
+import pytest
+
+from colmod_01 import geometry
+
+
+CUBE_CORNERS = np.array(
+    [(x, y, z) for x in (-1.0, 1.0) for y in (-1.0, 1.0) for z in (-1.0, 1.0)]
+)
+
+
+def sphere_points(count, seed=0):
+    points = np.random.default_rng(seed).normal(size=(count, 3))
+    return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+
+def assert_closed_convex_hull(points, vertices, triangles):
+    """Check that (vertices, triangles) is a closed, outward-wound hull enclosing points."""
+    # Every directed edge is matched by its reverse on exactly one other triangle
+    edges = np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]])
+    directed = {tuple(edge) for edge in edges}
+    assert len(directed) == len(edges)
+    assert all((b, a) in directed for a, b in directed)
+    assert len(vertices) - len(edges) // 2 + len(triangles) == 2
+
+    corners = vertices[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    offsets = np.einsum("ij,ij->i", normals, corners[:, 0])
+    assert (points @ normals.T - offsets <= 1e-9).all()
+
+
+def test_quickhull_cube_ignores_interior_points():
+    interior = np.random.default_rng(1).uniform(-0.9, 0.9, size=(500, 3))
+    points = np.concatenate([interior, CUBE_CORNERS])
+    vertices, triangles = geometry.quickhull(points)
+
+    assert len(vertices) == 8
+    assert len(triangles) == 12
+    assert sorted(map(tuple, vertices)) == sorted(map(tuple, CUBE_CORNERS))
+    assert geometry.hull_volume(vertices, triangles) == pytest.approx(8.0)
+    assert_closed_convex_hull(points, vertices, triangles)
+
+
+def test_quickhull_keeps_every_sphere_point():
+    points = sphere_points(2000)
+    vertices, triangles = geometry.quickhull(points)
+
+    assert len(vertices) == len(points)
+    assert_closed_convex_hull(points, vertices, triangles)
+
+
+def test_quickhull_rejects_flat_points():
+    points = np.random.default_rng(2).uniform(size=(50, 3))
+    points[:, 2] = 0.0
+    with pytest.raises(ValueError):
+        geometry.quickhull(points)
+
+
+def test_filter_interior_points_preserves_hull():
+    rng = np.random.default_rng(3)
+    # Evaluated meshes are read as float32, which the filter keeps
+    points = np.concatenate([rng.uniform(-0.5, 0.5, size=(5000, 3)), sphere_points(300)]).astype(np.float32)
+    filtered, removed = geometry.filter_interior_points(points)
+
+    assert removed > 4000
+    assert len(filtered) + removed == len(points)
+    hull_vertices, _triangles = geometry.quickhull(points)
+    filtered_vertices, _triangles = geometry.quickhull(filtered)
+    assert sorted(map(tuple, hull_vertices)) == sorted(map(tuple, filtered_vertices))
+
+
+def test_filter_interior_sets_drops_buried_sets():
+    rng = np.random.default_rng(4)
+    shell = sphere_points(400) * 10.0
+    buried = rng.uniform(-1.0, 1.0, size=(300, 3))
+    sets, removed = geometry.filter_interior_sets([shell, buried, shell + 25.0])
+
+    assert len(sets) == 2
+    assert removed >= len(buried)
+    merged_vertices, _triangles = geometry.quickhull(np.concatenate(sets))
+    full_vertices, _triangles = geometry.quickhull(np.concatenate([shell, buried, shell + 25.0]))
+    assert sorted(map(tuple, merged_vertices)) == sorted(map(tuple, full_vertices))
+
+
+def test_simplify_hull_stays_within_budget_and_input():
+    points = sphere_points(600, seed=5)
+    vertices, triangles = geometry.quickhull(points)
+    simple_vertices, simple_triangles = geometry.simplify_hull(vertices, triangles, 32)
+
+    assert len(simple_vertices) <= 32
+    assert_closed_convex_hull(simple_vertices, simple_vertices, simple_triangles)
+    # Simplification only drops vertices, so the result is contained in the input hull
+    assert_closed_convex_hull(simple_vertices, vertices, triangles)
+    assert geometry.hull_volume(simple_vertices, simple_triangles) < geometry.hull_volume(vertices, triangles)
+
+
+def test_simplify_hull_rejects_budget_below_tetrahedron():
+    vertices, triangles = geometry.quickhull(CUBE_CORNERS)
+    with pytest.raises(ValueError):
+        geometry.simplify_hull(vertices, triangles, 3)
+
+
+@pytest.mark.parametrize("max_deviation", [0.001, 0.01, 0.05])
+def test_fit_hull_keeps_the_fewest_vertices_within_bound(max_deviation):
+    points = sphere_points(400, seed=8) * [1.0, 2.0, 3.0]
+    vertices, triangles = geometry.quickhull(points)
+    fit_vertices, fit_triangles = geometry.fit_hull(vertices, triangles, max_deviation)
+
+    assert_closed_convex_hull(fit_vertices, fit_vertices, fit_triangles)
+    assert geometry.hull_deviation(vertices, fit_vertices, fit_triangles) <= max_deviation
+    # Dropping one more vertex the way simplify_hull would breaks the bound
+    fewer_vertices, fewer_triangles = geometry.simplify_hull(vertices, triangles, len(fit_vertices) - 1)
+    assert geometry.hull_deviation(vertices, fewer_vertices, fewer_triangles) > max_deviation
+
+
+def random_rotation(seed):
+    """A random right-handed 3x3 rotation matrix."""
+    q, r = np.linalg.qr(np.random.default_rng(seed).normal(size=(3, 3)))
+    q *= np.sign(np.diag(r))
+    return q if np.linalg.det(q) > 0.0 else -q
+
+
+def test_oriented_bounding_box_recovers_a_rotated_box():
+    rng = np.random.default_rng(11)
+    size = np.array([2.0, 1.0, 0.5])
+    local = np.concatenate([CUBE_CORNERS * size / 2, rng.uniform(-size / 2, size / 2, size=(500, 3))])
+    rotation, offset = random_rotation(12), np.array([5.0, -3.0, 2.0])
+    points = local @ rotation.T + offset
+    center, axes, dimensions = geometry.oriented_bounding_box(points)
+
+    assert np.allclose(axes.T @ axes, np.eye(3))
+    assert np.linalg.det(axes) == pytest.approx(1.0)
+    assert sorted(dimensions) == pytest.approx(sorted(size), rel=1e-3)
+    assert center == pytest.approx(offset, abs=1e-3)
+
+
+def test_oriented_bounding_box_contains_points_and_beats_the_world_box():
+    points = sphere_points(3000, seed=13) * [3.0, 1.0, 0.3] @ random_rotation(14).T
+    center, axes, dimensions = geometry.oriented_bounding_box(points)
+
+    local = (points - center) @ axes
+    assert (np.abs(local) <= dimensions / 2 + 1e-9).all()
+    assert np.prod(dimensions) < np.prod(points.max(axis=0) - points.min(axis=0))
+
+
+def test_enclosing_ball_contains_points_and_is_nearly_minimal():
+    points = sphere_points(2000, seed=15) * 2.0 + [1.0, -4.0, 0.5]
+    center, radius = geometry.enclosing_ball(points)
+
+    assert (np.linalg.norm(points - center, axis=1) <= radius + 1e-9).all()
+    assert radius == pytest.approx(2.0, rel=0.02)
+
+
+def test_enclosing_ball_fits_circles_in_2d():
+    angles = np.linspace(0.0, 2.0 * np.pi, 100, endpoint=False)
+    points = np.stack([np.cos(angles), np.sin(angles)], axis=1) * 3.0
+    center, radius = geometry.enclosing_ball(points)
+
+    assert (np.linalg.norm(points - center, axis=1) <= radius + 1e-9).all()
+    assert radius == pytest.approx(3.0, rel=0.02)
+
+
+def capsule_distances(points, center, axis, half_length):
+    """Distance of each point from the capsule's core segment."""
+    along = np.clip((points - center) @ axis, -half_length, half_length)
+    return np.linalg.norm(points - (center + along[:, None] * axis), axis=1)
+
+
+def test_bounding_capsule_recovers_a_capsule():
+    rng = np.random.default_rng(16)
+    # A capsule of radius 0.5 with 2.0 between its cap centres, along a random axis
+    directions = sphere_points(4000, seed=17)
+    heights = rng.uniform(-1.0, 1.0, size=len(directions))
+    on_cylinder = directions * [1.0, 1.0, 0.0]
+    on_cylinder /= np.linalg.norm(on_cylinder, axis=1, keepdims=True)
+    local = np.concatenate([
+        on_cylinder * 0.5 + np.outer(heights, [0.0, 0.0, 1.0]),
+        directions * 0.5 + np.where(directions[:, 2:] > 0.0, 1.0, -1.0) * [0.0, 0.0, 1.0],
+    ])
+    rotation = random_rotation(18)
+    points = local @ rotation.T + [2.0, 0.0, -1.0]
+    center, axis, half_length, radius = geometry.bounding_capsule(points)
+
+    assert (capsule_distances(points, center, axis, half_length) <= radius + 1e-9).all()
+    assert abs(axis @ rotation[:, 2]) == pytest.approx(1.0, abs=1e-3)
+    assert radius == pytest.approx(0.5, rel=0.02)
+    assert half_length == pytest.approx(1.0, rel=0.05)
+
+
+def test_bounding_capsule_of_a_sphere_collapses_to_the_sphere():
+    points = sphere_points(2000, seed=19)
+    center, axis, half_length, radius = geometry.bounding_capsule(points)
+
+    assert (capsule_distances(points, center, axis, half_length) <= radius + 1e-9).all()
+    assert half_length < 0.05
+    assert radius == pytest.approx(1.0, rel=0.05)
+
+
+def test_kdop_vertices_with_six_sides_is_the_world_box():
+    points = np.random.default_rng(20).uniform([-1.0, 0.0, 2.0], [3.0, 1.0, 5.0], size=(300, 3))
+    corners = geometry.kdop_vertices(points, k=6)
+    low, high = points.min(axis=0), points.max(axis=0)
+    box = np.array([(x, y, z) for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])])
+
+    assert sorted(map(tuple, np.round(corners, 9))) == sorted(map(tuple, np.round(box, 9)))
+
+
+@pytest.mark.parametrize("k", [18, 26])
+def test_kdop_vertices_enclose_points_between_hull_and_box(k):
+    points = sphere_points(1000, seed=21) * [2.0, 1.0, 0.5] @ random_rotation(22).T
+    corners = geometry.kdop_vertices(points, k=k)
+    vertices, triangles = geometry.quickhull(corners)
+    assert_closed_convex_hull(points, vertices, triangles)
+
+    hull_volume = geometry.hull_volume(*geometry.quickhull(points))
+    box_volume = np.prod(points.max(axis=0) - points.min(axis=0))
+    assert hull_volume <= geometry.hull_volume(vertices, triangles) < box_volume
+
+
+def test_kdop_vertices_tighten_with_more_sides():
+    points = sphere_points(1000, seed=23)
+    volumes = [geometry.hull_volume(*geometry.quickhull(geometry.kdop_vertices(points, k=k))) for k in (6, 18, 26)]
+
+    assert volumes[0] > volumes[1] > volumes[2]
+
+
+CUBE_FACES = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+
+
+def cube_triangles(center):
+    corners = CUBE_CORNERS + center
+    return np.array([corners[[a, b, c]] for a, b, c, d in CUBE_FACES] + [corners[[a, c, d]] for a, b, c, d in CUBE_FACES])
+
+
+def vector_areas(triangles):
+    return np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]) / 2.0
+
+
+def test_clip_triangles_splits_by_side_and_keeps_area_and_winding():
+    triangles = np.random.default_rng(24).uniform(-1.0, 1.0, size=(400, 3, 3))
+    normal = np.array([1.0, 2.0, -1.0]) / np.sqrt(6.0)
+    below, above = geometry.clip_triangles(triangles, normal, 0.2)
+
+    assert (below @ normal <= 0.2 + 1e-9).all()
+    assert (above @ normal >= 0.2 - 1e-9).all()
+    pieces = np.concatenate([below, above])
+    # Flipped pieces would cancel out of the summed vector area
+    assert vector_areas(pieces).sum(axis=0) == pytest.approx(vector_areas(triangles).sum(axis=0))
+    assert np.linalg.norm(vector_areas(pieces), axis=1).sum() == pytest.approx(
+        np.linalg.norm(vector_areas(triangles), axis=1).sum()
+    )
+
+
+def test_decompose_separates_two_cubes_and_covers_them():
+    triangles = np.concatenate([cube_triangles([0.0, 0.0, 0.0]), cube_triangles([3.0, 0.0, 0.0])])
+    parts = geometry.decompose(triangles, max_parts=4, max_concavity=0.01)
+
+    assert len(parts) == 2
+    centers = sorted(part.mean(axis=0)[0] for part in parts)
+    assert centers == pytest.approx([0.0, 3.0])
+    for part in parts:
+        assert geometry.hull_volume(*geometry.quickhull(part)) == pytest.approx(8.0)
+
+    repeated = geometry.decompose(triangles, max_parts=4, max_concavity=0.01)
+    assert all(np.array_equal(part, again) for part, again in zip(parts, repeated))
+
+
+def test_decompose_leaves_a_convex_part_whole():
+    triangles = cube_triangles([1.0, -2.0, 0.5])
+    parts = geometry.decompose(triangles, max_parts=8, max_concavity=0.01)
+
+    assert len(parts) == 1
+    assert sorted(map(tuple, parts[0])) == sorted(map(tuple, CUBE_CORNERS + [1.0, -2.0, 0.5]))
+
+
+def pairwise_clusters(lows, highs, distance):
+    """Reference single linkage: connect every pair of boxes with a gap of at most `distance`."""
+    gaps = np.maximum(lows[:, None] - highs[None, :], lows[None, :] - highs[:, None]).max(axis=2)
+    unvisited = set(range(len(lows)))
+    clusters = []
+    while unvisited:
+        stack = [min(unvisited)]
+        unvisited.discard(stack[0])
+        members = []
+        while stack:
+            box = stack.pop()
+            members.append(box)
+            neighbours = [other for other in unvisited if gaps[box, other] <= distance]
+            unvisited.difference_update(neighbours)
+            stack.extend(neighbours)
+        clusters.append(sorted(members))
+    return clusters
+
+
+def test_cluster_boxes_joins_boxes_within_distance():
+    lows = np.array([[0.0, 0, 0], [1.5, 0, 0], [10.0, 0, 0], [3.0, 0, 0]])
+    clusters = geometry.cluster_boxes(lows, lows + 1.0, distance=0.6)
+
+    assert [sorted(members.tolist()) for members in clusters] == [[0, 1, 3], [2]]
+
+
+def test_cluster_boxes_splits_large_clusters():
+    lows = np.stack([np.arange(10.0), np.zeros(10), np.zeros(10)], axis=1)
+    clusters = geometry.cluster_boxes(lows, lows + 1.0, distance=0.1, max_size=3)
+
+    assert all(len(members) <= 3 for members in clusters)
+    assert sorted(np.concatenate(clusters).tolist()) == list(range(10))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_cluster_boxes_matches_pairwise_single_linkage(seed):
+    rng = np.random.default_rng(seed)
+    lows = rng.uniform(0.0, 30.0, size=(300, 3))
+    sizes = rng.lognormal(mean=-0.5, sigma=1.0, size=(300, 3))
+    clusters = geometry.cluster_boxes(lows, lows + sizes, distance=0.4)
+
+    assert [sorted(members.tolist()) for members in clusters] == pairwise_clusters(lows, lows + sizes, 0.4)
+
+
+def test_cluster_boxes_joins_small_boxes_through_one_huge_box():
+    # A floor of 100 x 100 units among small props, some of which rest on it
+    props = np.random.default_rng(3).uniform([-200.0, -200.0, 0.0], [200.0, 200.0, 0.2], size=(200, 3))
+    lows = np.concatenate([[[-50.0, -50.0, -1.0]], props])
+    highs = lows + 0.5
+    highs[0] = [50.0, 50.0, 0.0]
+    clusters = geometry.cluster_boxes(lows, highs, distance=0.25)
+
+    assert [sorted(members.tolist()) for members in clusters] == pairwise_clusters(lows, highs, 0.25)
+    assert len(clusters[0]) > 1
+
+
+def test_removal_schedule_prefix_matches_simplify_hull():
+    vertices, triangles = geometry.quickhull(sphere_points(200, seed=6))
+    removals, costs = geometry.removal_schedule(vertices, triangles)
+
+    assert len(removals) == len(vertices) - 4
+    assert (costs >= 0.0).all()
+    keep = np.ones(len(vertices), dtype=bool)
+    keep[removals[:len(vertices) - 20]] = False
+    expected, _triangles = geometry.simplify_hull(vertices, triangles, 20)
+    assert sorted(map(tuple, vertices[keep])) == sorted(map(tuple, expected))
+
+
+def heap_allocation(gains, unit_costs, budget):
+    """Reference allocation: pop the best gain per cost until the budget runs out."""
+    gains = [np.maximum.accumulate(np.asarray(g, dtype=np.float64)[::-1])[::-1] for g in gains]
+    granted = [0] * len(gains)
+    heap = [(-g[0] / cost, hull) for hull, (g, cost) in enumerate(zip(gains, unit_costs)) if len(g)]
+    heapq.heapify(heap)
+    while heap:
+        _ratio, hull = heapq.heappop(heap)
+        if unit_costs[hull] > budget:
+            break
+        budget -= unit_costs[hull]
+        granted[hull] += 1
+        if granted[hull] < len(gains[hull]):
+            heapq.heappush(heap, (-gains[hull][granted[hull]] / unit_costs[hull], hull))
+    return granted
+
+
+def test_allocate_vertex_budget_matches_priority_queue():
+    rng = np.random.default_rng(7)
+    gains = [np.sort(rng.exponential(size=rng.integers(0, 40)))[::-1] for _ in range(60)]
+    unit_costs = rng.integers(1, 4, size=len(gains))
+
+    for budget in (0, 17, 250, 10000):
+        granted = geometry.allocate_vertex_budget(gains, unit_costs, budget)
+        assert granted.tolist() == heap_allocation(gains, unit_costs.tolist(), budget)
+        assert (granted * unit_costs).sum() <= budget
@@ -0,0 +1,61 @@
+"""
+Tests for the on-disk hull cache in colmod_01/hull_cache.py.
+"""
+import os
+
+import numpy as np
+
+from colmod_01 import hull_cache
+
+COORDS = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
+LOOP_TOTALS = np.array([3, 3, 3, 3])
+LOOP_VERTICES = np.array([0, 2, 1, 0, 1, 3, 0, 3, 2, 1, 2, 3])
+
+
+def test_make_key_depends_on_geometry_and_params():
+    key = hull_cache.make_key([COORDS], mode='individual', ratio=0.5)
+
+    assert key == hull_cache.make_key([COORDS.copy()], ratio=0.5, mode='individual')
+    assert key != hull_cache.make_key([COORDS], mode='individual', ratio=0.25)
+    assert key != hull_cache.make_key([COORDS + 1.0], mode='individual', ratio=0.5)
+    assert key != hull_cache.make_key([COORDS.astype(np.float64)], mode='individual', ratio=0.5)
+
+
+def test_put_then_get_round_trips(tmp_path):
+    cache = hull_cache.HullCache(str(tmp_path), max_bytes=1 << 20)
+    key = hull_cache.make_key([COORDS])
+    cache.put(key, COORDS, LOOP_TOTALS, LOOP_VERTICES)
+
+    hull = cache.get(key)
+    assert np.array_equal(hull.coords, COORDS)
+    assert hull.loop_totals.tolist() == LOOP_TOTALS.tolist()
+    assert hull.loop_vertices.tolist() == LOOP_VERTICES.tolist()
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_get_misses_unknown_and_corrupt_entries(tmp_path):
+    cache = hull_cache.HullCache(str(tmp_path), max_bytes=1 << 20)
+    key = hull_cache.make_key([COORDS])
+    assert cache.get(key) is None
+
+    cache.put(key, COORDS, LOOP_TOTALS, LOOP_VERTICES)
+    with open(cache._path(key), "r+b") as cache_file:
+        cache_file.write(b"XXXX")
+    assert cache.get(key) is None
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_evict_removes_least_recently_used_first(tmp_path):
+    cache = hull_cache.HullCache(str(tmp_path), max_bytes=1 << 20)
+    keys = [hull_cache.make_key([COORDS], index=index) for index in range(4)]
+    for age, key in enumerate(keys):
+        cache.put(key, COORDS, LOOP_TOTALS, LOOP_VERTICES)
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get(keys[0]) is not None
+
+    entry_size = os.path.getsize(cache._path(keys[0]))
+    cache.max_bytes = entry_size * 2
+    assert cache.evict() == 2
+    assert [cache.get(key) is not None for key in keys] == [True, False, False, True]
+    assert cache.evict() == 0
@@ -0,0 +1,44 @@
+"""
+Tests for the worker pool in colmod_01/hull_jobs.py.
+"""
+import numpy as np
+
+from colmod_01 import geometry, hull_jobs
+
+
+def test_run_hull_batch_in_worker_processes_matches_compute_hull():
+    rng = np.random.default_rng(0)
+    point_sets = [rng.normal(size=(200, 3)) for _ in range(3)]
+    flat = rng.uniform(size=(20, 3))
+    flat[:, 2] = 0.0
+    point_sets.append(flat)
+
+    results = hull_jobs.run_hull_batch(point_sets, max_workers=2)
+
+    assert len(results) == len(point_sets)
+    for points, result in zip(point_sets, results):
+        expected = hull_jobs.compute_hull(points)
+        assert result.removed == expected.removed
+        np.testing.assert_array_equal(result.points, expected.points)
+        if expected.vertices is None:
+            assert result.vertices is None and result.triangles is None
+        else:
+            np.testing.assert_array_equal(result.vertices, expected.vertices)
+            np.testing.assert_array_equal(result.triangles, expected.triangles)
+
+
+def test_merge_hull_candidates_returns_the_joint_hull_vertices():
+    rng = np.random.default_rng(1)
+    # Neighbouring blobs, one buried inside another, spread over several tree levels
+    point_sets = [
+        (rng.normal(size=(150, 3)) + offset).astype(np.float32)
+        for offset in rng.uniform(-6.0, 6.0, size=(20, 3))
+    ]
+    point_sets.append((rng.uniform(-0.1, 0.1, size=(50, 3)) + point_sets[0].mean(axis=0)).astype(np.float32))
+    total = sum(len(points) for points in point_sets)
+
+    points, removed = hull_jobs.merge_hull_candidates(point_sets, max_workers=2)
+
+    vertices, _triangles = geometry.quickhull(np.concatenate(point_sets))
+    assert sorted(map(tuple, points)) == sorted(map(tuple, vertices))
+    assert removed == total - len(points)
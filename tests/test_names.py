@@ -0,0 +1,27 @@
+"""
+Tests for the collision name allocator in colmod_01/names.py.
+"""
+from colmod_01.names import UniqueNameIndex
+
+
+def test_allocate_counts_up_per_prefix_and_base_name():
+    names = UniqueNameIndex([])
+
+    assert names.allocate("Rock", "UCX_") == "UCX_Rock_01"
+    assert names.allocate("Rock", "UCX_") == "UCX_Rock_02"
+    assert names.allocate("Rock", "UBX_") == "UBX_Rock_01"
+    assert names.allocate("Tree", "UCX_") == "UCX_Tree_01"
+
+
+def test_allocate_skips_names_already_taken():
+    names = UniqueNameIndex(["Rock", "UCX_Rock_01", "UCX_Rock_02", "UCX_Rock_04"])
+
+    assert [names.allocate("Rock", "UCX_") for _ in range(3)] == ["UCX_Rock_03", "UCX_Rock_05", "UCX_Rock_06"]
+
+
+def test_allocate_never_repeats_a_name():
+    names = UniqueNameIndex(f"UCX_Box_{counter:02d}" for counter in range(1, 200, 3))
+    allocated = [names.allocate("Box", "UCX_") for _ in range(300)]
+
+    assert len(set(allocated)) == len(allocated)
+    assert not set(allocated) & {f"UCX_Box_{counter:02d}" for counter in range(1, 200, 3)}